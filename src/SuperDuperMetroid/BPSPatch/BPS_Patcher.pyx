@@ -5,36 +5,7 @@ import zlib
 from libc.stdio cimport FILE, fopen, fclose, fseek, fgetc, SEEK_SET
 from libc.stdio cimport fclose, fputc, ftell
 
-# Converts a hexadecimal string to a base 10 integer.
-def hexToInt(hexToConvert):
-    return int(hexToConvert, 16)
-
-# Converts an integer to a hexadecimal string.
-def intToHex(intToConvert):
-    return (hex(intToConvert)[2:]).upper()
-
-# Converts binary data to a hexadecimal string.
-def dataToHex(dataToConvert):
-    return "".join("{:02x}".format(x) for x in dataToConvert).upper()
-
-# Reverses the endianness of a hexadecimal string.
-def reverseEndianness(hexToReverse):
-    assert (len(hexToReverse) % 2) == 0
-    hexPairs = []
-    for i in range(len(hexToReverse) // 2):
-        hexPairs.append(hexToReverse[2 * i] + hexToReverse[2 * i + 1])
-    reversedHexPairs = hexPairs[::-1]
-    outputString = ""
-    for pair in reversedHexPairs:
-        outputString += pair
-    return outputString
-
-# Pads a hexadecimal string with 0's until it meets the provided length.
-def padHex(hexToPad, numHexCharacters):
-    returnHex = hexToPad
-    while len(returnHex) < numHexCharacters:
-        returnHex = "0" + returnHex
-    return returnHex
+from SuperDuperMetroid.Binary_Utils import le_bytes_to_int
 
 class BPSInfo:
     def __init__(self, sourceSize, targetSize, metadataSize):
@@ -138,8 +109,8 @@ class BPSPatcher:
     # Read the first 4 bytes to verify that this is an BPS file.
     @staticmethod
     def verifyFormat(bpsFile):
-        verificationBytes = dataToHex(bpsFile.read(4))
-        if verificationBytes == "42505331": # Spells out "BPS1
+        verificationBytes = bpsFile.read(4)
+        if verificationBytes == b"BPS1":
             return True
         else:
             return False
@@ -187,10 +158,10 @@ class BPSPatcher:
         value = 0
         shift = 1
         while (True):
-            byte = hexToInt(dataToHex(bpsFile.read(1)))
+            byte = bpsFile.read(1)[0]
             #print(byte)
-            value += (byte & hexToInt("7F")) * shift
-            if byte & hexToInt("80") > 0:
+            value += (byte & 0x7F) * shift
+            if byte & 0x80 > 0:
                 break
             shift <<= 7
             value += shift
@@ -202,9 +173,9 @@ class BPSPatcher:
         # Seek to the beginning of the footer
         bpsFile.seek(-12, 2)
         # Nab the CRCs from the bps file
-        romFooterCRC = hexToInt(reverseEndianness(dataToHex(bpsFile.read(4))))
-        targetFooterCRC = hexToInt(reverseEndianness(dataToHex(bpsFile.read(4))))
-        bpsFooterCRC = hexToInt(reverseEndianness(dataToHex(bpsFile.read(4))))
+        romFooterCRC = le_bytes_to_int(bpsFile.read(4))
+        targetFooterCRC = le_bytes_to_int(bpsFile.read(4))
+        bpsFooterCRC = le_bytes_to_int(bpsFile.read(4))
         # Calculate CRCs on the data
         romFile = open(romPath, 'rb', buffering = 0)
         targetFile = open(targetPath, 'rb', buffering = 0)
@@ -215,11 +186,11 @@ class BPSPatcher:
         # Compare calculated CRCs to those stored within the bps file.
         failedCheck = False
         if romFooterCRC != romCRC:
-            print(f"ERROR: ROM failed CRC check.\n\tExpected CRC: {padHex(intToHex(romFooterCRC), 4)}\n\tCalculated CRC: {padHex(intToHex(romCRC), 4)}")
+            print(f"ERROR: ROM failed CRC check.\n\tExpected CRC: {romFooterCRC:08X}\n\tCalculated CRC: {romCRC:08X}")
         if targetFooterCRC != targetCRC:
-            print(f"ERROR: Target File failed CRC check.\n\tExpected CRC: {padHex(intToHex(targetFooterCRC), 4)}\n\tCalculated CRC: {padHex(intToHex(targetCRC), 4)}")
+            print(f"ERROR: Target File failed CRC check.\n\tExpected CRC: {targetFooterCRC:08X}\n\tCalculated CRC: {targetCRC:08X}")
         if bpsFooterCRC != bpsCRC:
-            print(f"ERROR: BPS Patch failed CRC check.\n\tExpected CRC: {padHex(intToHex(bpsFooterCRC), 4)}\n\tCalculated CRC: {padHex(intToHex(bpsCRC), 4)}")
+            print(f"ERROR: BPS Patch failed CRC check.\n\tExpected CRC: {bpsFooterCRC:08X}\n\tCalculated CRC: {bpsCRC:08X}")
 
     # numBytesToExclude is the number of bytes at the end of the file which are not counted for computing the crc.
     # the bpsCRC included does not hash itself, for obvious reasons, so it is necessary for that.
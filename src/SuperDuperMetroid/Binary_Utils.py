@@ -0,0 +1,87 @@
+# Binary helpers shared by the patchers and the interface.
+#
+# The SNES is little endian, so unless stated otherwise, multi-byte values are read and written little endian.
+# Addresses and other values are handled as ints everywhere; hex strings are only used for
+# the ASM templates in the patcher and for formatting SNI operands.
+
+import struct
+
+U16LE = struct.Struct("<H")
+U32LE = struct.Struct("<I")
+
+
+# Converts little-endian binary data to an integer.
+def le_bytes_to_int(data):
+    return int.from_bytes(data, "little")
+
+
+# Converts big-endian binary data to an integer.
+def be_bytes_to_int(data):
+    return int.from_bytes(data, "big")
+
+
+# Converts an integer to little-endian binary data of the given length.
+def int_to_le_bytes(value, num_bytes):
+    return value.to_bytes(num_bytes, "little")
+
+
+# Reads one byte from binary data.
+def read_u8(data, offset=0):
+    return data[offset]
+
+
+# Reads a little-endian word from binary data.
+def read_u16le(data, offset=0):
+    return U16LE.unpack_from(data, offset)[0]
+
+
+# Reads a little-endian long (three byte) address from binary data.
+def read_u24le(data, offset=0):
+    return int.from_bytes(data[offset : offset + 3], "little")
+
+
+# Reads a little-endian double word from binary data.
+def read_u32le(data, offset=0):
+    return U32LE.unpack_from(data, offset)[0]
+
+
+# Converts an integer to a little-endian word.
+def pack_u16le(value):
+    return U16LE.pack(value)
+
+
+# Converts a hexadecimal string to a base 10 integer.
+def hex_to_int(hex_to_convert):
+    return int(hex_to_convert, 16)
+
+
+# Converts an integer to a hexadecimal string.
+def int_to_hex(int_to_convert):
+    return f"{int_to_convert:X}"
+
+
+# Converts a hexadecimal string to binary data.
+def hex_to_data(hex_to_convert):
+    return bytes.fromhex(hex_to_convert)
+
+
+# Converts binary data to a hexadecimal string.
+def data_to_hex(data_to_convert):
+    return bytes(data_to_convert).hex().upper()
+
+
+# Reverses the endianness of a hexadecimal string.
+def reverse_endianness(hex_to_reverse):
+    assert (len(hex_to_reverse) % 2) == 0
+    return bytes.fromhex(hex_to_reverse)[::-1].hex().upper()
+
+
+# Pads a hexadecimal string with 0's until it meets the provided length.
+def pad_hex(hex_to_pad, num_hex_characters):
+    return hex_to_pad.rjust(num_hex_characters, "0")
+
+
+# Converts an integer to a little-endian hexadecimal string, num_hex_digits long.
+# Used to fill in addresses and values in ASM templates.
+def int_to_le_hex(number, num_hex_digits=4):
+    return number.to_bytes(num_hex_digits // 2, "little").hex().upper()
@@ -0,0 +1,187 @@
+# Event Scheduler
+#
+# Runs queued in-game events one at a time, whenever the game is ready for one.
+# A single worker task runs for as long as the scheduler does, and sleeps while there is nothing to do.
+# While the game isn't ready, the worker checks again every retry_interval seconds.
+# Given a limiter, the wait is stretched instead to suit how fast the device is answering, and how often it fails,
+# Rather than growing with every check, so a long burst of events still drains promptly once the player is back in game.
+# Given a frame clock, the wait is counted in frames instead: the worker checks again retry_frames frames after
+# The last check saw the game, and only backs off, from retry_interval, while the game isn't running frames at all.
+#
+# Events with a coalesce key are merged with a queued event which has the same key,
+# So eight silent Missile Expansions become a single grant of 40 missiles.
+
+import asyncio
+import collections
+import time
+
+# Frames between readiness checks, when the scheduler has a frame clock.
+RETRY_FRAMES = 6
+
+
+class ScheduledEvent:
+    # function is a coroutine function, called as function(*args, **kwargs) when the event runs.
+    # If coalesce_key is given, function is called as function(*args, amount, **kwargs) instead,
+    # And amount is summed over every event merged into this one.
+    # deadline is a time.monotonic time, after which the event is dropped if it hasn't run yet.
+    # If is_ready is given, it is used instead of the scheduler's own check.
+    def __init__(self, function, args=(), kwargs=None, deadline=None, coalesce_key=None, amount=None, is_ready=None):
+        self.function = function
+        self.args = list(args)
+        self.kwargs = {} if kwargs is None else dict(kwargs)
+        self.deadline = deadline
+        self.coalesce_key = coalesce_key
+        self.amount = amount
+        self.is_ready = is_ready
+        self.cancelled = False
+        # Resolved with the result of function once the event has run.
+        self.future = asyncio.get_running_loop().create_future()
+
+    # Stops the event from running if it hasn't started yet.
+    def cancel(self):
+        self.cancelled = True
+
+    def is_expired(self, now):
+        return self.deadline is not None and now >= self.deadline
+
+    # Resolves the future of an event which won't be run, because it was cancelled or has expired.
+    def drop(self):
+        if self.future.done():
+            return
+        if self.cancelled:
+            self.future.cancel()
+        else:
+            self.future.set_exception(TimeoutError("ERROR: The game was not ready for the event in time."))
+            # Already reported, so don't complain again if nobody waits for it.
+            self.future.exception()
+
+    async def run(self):
+        if self.coalesce_key is None:
+            return await self.function(*self.args, **self.kwargs)
+        return await self.function(*self.args, self.amount, **self.kwargs)
+
+
+class EventScheduler:
+    # is_ready is a coroutine function which returns true if the game is ready for an event.
+    # If lock is given, it is held while checking readiness and running an event.
+    # limiter is an AdaptiveLimiter, whose get_retry_delay decides how long to wait between readiness checks.
+    # frame_clock is a FrameClock which is kept up to date by is_ready, see get_retry_delay.
+    def __init__(
+        self, is_ready, lock=None, retry_interval=0.3, limiter=None, frame_clock=None, retry_frames=RETRY_FRAMES
+    ):
+        self.is_ready = is_ready
+        self.lock = asyncio.Lock() if lock is None else lock
+        self.retry_interval = retry_interval
+        self.limiter = limiter
+        self.frame_clock = frame_clock
+        self.retry_frames = retry_frames
+        self.queue = collections.deque()
+        # Coalesce key to the queued event which new events with that key are merged into.
+        self.coalescing_events = {}
+        # Set whenever an event is queued, so the worker doesn't have to poll an empty queue.
+        self.wake_event = asyncio.Event()
+        self.worker_task = None
+
+    def __len__(self):
+        return len(self.queue)
+
+    def is_running(self):
+        return self.worker_task is not None and not self.worker_task.done()
+
+    def start(self):
+        if not self.is_running():
+            self.worker_task = asyncio.ensure_future(self.__run_events())
+
+    # Stops the worker. Events still queued are cancelled.
+    def stop(self):
+        if self.worker_task is not None:
+            self.worker_task.cancel()
+        self.worker_task = None
+        while self.queue:
+            self.queue.popleft().future.cancel()
+        self.coalescing_events.clear()
+
+    # Queues an event, starting the worker if it isn't running yet.
+    # timeout is the number of seconds the event may wait before it is dropped, or None to wait forever.
+    # Returns the ScheduledEvent, which is the queued event it was merged into if it was coalesced.
+    def schedule(self, function, args=(), kwargs=None, timeout=None, coalesce_key=None, amount=None, is_ready=None):
+        deadline = None if timeout is None else time.monotonic() + timeout
+        if coalesce_key is not None:
+            queued_event = self.coalescing_events.get(coalesce_key)
+            if queued_event is not None and not queued_event.cancelled:
+                queued_event.amount += amount
+                # The merged event has to wait for the latest of the deadlines.
+                if queued_event.deadline is not None:
+                    queued_event.deadline = None if deadline is None else max(queued_event.deadline, deadline)
+                return queued_event
+        event = ScheduledEvent(function, args, kwargs, deadline, coalesce_key, amount, is_ready)
+        self.queue.append(event)
+        if coalesce_key is not None:
+            self.coalescing_events[coalesce_key] = event
+        self.wake_event.set()
+        self.start()
+        return event
+
+    def __remove_from_coalescing(self, event):
+        if event.coalesce_key is not None and self.coalescing_events.get(event.coalesce_key) is event:
+            del self.coalescing_events[event.coalesce_key]
+
+    # Drops cancelled and expired events from the queue.
+    def __drop_stale_events(self):
+        now = time.monotonic()
+        for event in [event for event in self.queue if event.cancelled or event.is_expired(now)]:
+            self.queue.remove(event)
+            self.__remove_from_coalescing(event)
+            if not event.cancelled and not event.future.done():
+                print(f"WARNING: Dropping event {event.function.__name__}, as it could not be run before its deadline.")
+            event.drop()
+
+    async def __is_ready(self, event):
+        is_ready = self.is_ready if event.is_ready is None else event.is_ready
+        try:
+            return await is_ready()
+        except (ConnectionError, ValueError) as e:
+            print(f"WARNING: Could not check whether the game is ready for an event: {e}")
+            return False
+
+    # Returns how long to wait before checking whether the game is ready again.
+    def get_retry_delay(self):
+        if self.frame_clock is None or not self.frame_clock.is_synced():
+            if self.limiter is None:
+                return self.retry_interval
+            return self.limiter.get_retry_delay(self.retry_interval)
+        rtt = None if self.limiter is None else self.limiter.smoothed_rtt
+        if self.frame_clock.stalled_reads:
+            # The game isn't running frames, so there are none to wait for.
+            retry_delay = self.retry_interval * self.frame_clock.get_stall_backoff()
+        else:
+            retry_delay = self.frame_clock.get_delay_until_frame(self.retry_frames, rtt)
+        if self.limiter is not None:
+            # Don't ask a slow or failing device more often than it can answer.
+            retry_delay = max(retry_delay, self.limiter.get_retry_delay(0.0))
+        return retry_delay
+
+    async def __run_events(self):
+        while True:
+            self.__drop_stale_events()
+            if not self.queue:
+                self.wake_event.clear()
+                await self.wake_event.wait()
+                continue
+            async with self.lock:
+                if await self.__is_ready(self.queue[0]):
+                    event = self.queue.popleft()
+                    self.__remove_from_coalescing(event)
+                    try:
+                        result = await event.run()
+                        if not event.future.done():
+                            event.future.set_result(result)
+                    except Exception as e:
+                        print(f"WARNING: Event {event.function.__name__} failed: {e}")
+                        if not event.future.done():
+                            event.future.set_exception(e)
+                            event.future.exception()
+                    continue
+            retry_delay = self.get_retry_delay()
+            print(f"Player is not ready for event, waiting {retry_delay:.2f} seconds...")
+            await asyncio.sleep(retry_delay)
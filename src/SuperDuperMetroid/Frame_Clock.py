@@ -0,0 +1,110 @@
+# Frame Clock
+#
+# Works out when the SNES starts each frame, from the frame counter at $7E:05B6 and the times it was read.
+# A read which saw frame n was answered after frame n started, and before frame n + 1 did,
+# So every read narrows down when frames start. Reads are taken to be answered halfway through their round trip.
+#
+# This lets writes be timed to land early in a frame, rather than anywhere in it,
+# And lets waits be counted in frames the game actually ran, rather than in seconds,
+# Which say little while an emulator is paused or a device has stopped answering.
+
+import math
+import time
+
+# NTSC SNES frame rate.
+FRAMES_PER_SECOND = 60.0988
+FRAME_DURATION = 1 / FRAMES_PER_SECOND
+
+# Writes are aimed this far into a frame, so they still land after it has started if our estimate is a little off.
+WRITE_MARGIN = FRAME_DURATION / 8
+
+# Each read in a row which finds the frame counter hasn't moved doubles the wait, up to this many times.
+MAX_STALL_DOUBLINGS = 3
+
+
+class FrameClock:
+    def __init__(self):
+        # Frame counter at the last read, and the frames counted so far, which keeps counting past $FFFF.
+        self.frame_counter = None
+        self.frame_count = None
+        # time.monotonic time at which the last read was answered.
+        self.read_time = None
+        # Earliest and latest time at which frame_count 0 could have started.
+        # Frame n started at frame_origin + n * FRAME_DURATION, for some frame_origin between the two.
+        self.earliest_frame_origin = None
+        self.latest_frame_origin = None
+        # Frames the game ran between the last two reads.
+        self.frames_elapsed = None
+        # Number of reads in a row which found the game had stopped running frames.
+        self.stalled_reads = 0
+
+    # Forgets every read, for example when attaching to another device.
+    def clear(self):
+        self.frame_counter = None
+        self.frame_count = None
+        self.read_time = None
+        self.earliest_frame_origin = None
+        self.latest_frame_origin = None
+        self.frames_elapsed = None
+        self.stalled_reads = 0
+
+    # True once the frame counter has been read.
+    def is_synced(self):
+        return self.latest_frame_origin is not None
+
+    # Records a read of the frame counter.
+    # received_time is the time.monotonic time the reply came in, rtt the round trip time in seconds if known.
+    def observe(self, frame_counter, received_time, rtt=None):
+        read_time = received_time - (rtt or 0.0) / 2
+        if self.read_time is not None and read_time <= self.read_time:
+            # Older than what we already know, such as the same copy from the RAM mirror.
+            return
+        if self.frame_counter is None:
+            self.frames_elapsed = None
+            self.frame_count = frame_counter
+        else:
+            self.frames_elapsed = (frame_counter - self.frame_counter) & 0xFFFF
+            self.frame_count += self.frames_elapsed
+            if self.frames_elapsed > 0:
+                self.stalled_reads = 0
+            elif read_time - self.read_time > 2 * FRAME_DURATION:
+                self.stalled_reads += 1
+        earliest = read_time - (self.frame_count + 1) * FRAME_DURATION
+        latest = read_time - self.frame_count * FRAME_DURATION
+        if self.is_synced() and max(earliest, self.earliest_frame_origin) <= min(latest, self.latest_frame_origin):
+            self.earliest_frame_origin = max(earliest, self.earliest_frame_origin)
+            self.latest_frame_origin = min(latest, self.latest_frame_origin)
+        else:
+            # The first read, or one which doesn't fit with the others,
+            # Because the game was paused, reset, or runs at a slightly different rate than we thought.
+            self.earliest_frame_origin = earliest
+            self.latest_frame_origin = latest
+        self.frame_counter = frame_counter
+        self.read_time = read_time
+
+    # Latest time at which the given frame could start, so anything aimed at it doesn't arrive too soon.
+    def get_frame_start(self, frame_count):
+        return self.latest_frame_origin + frame_count * FRAME_DURATION
+
+    # Returns how many seconds to wait before sending a write, so it lands early in the next frame.
+    # rtt is the round trip time in seconds, half of which it takes the write to reach the device.
+    def get_write_delay(self, rtt=None, now=None):
+        if not self.is_synced():
+            return 0.0
+        if now is None:
+            now = time.monotonic()
+        arrival_time = now + (rtt or 0.0) / 2
+        frame_count = math.ceil((arrival_time - WRITE_MARGIN - self.latest_frame_origin) / FRAME_DURATION)
+        return max(0.0, self.get_frame_start(frame_count) + WRITE_MARGIN - arrival_time)
+
+    # Returns how many seconds to wait before reading again, so the read lands frames frames after the last one.
+    # Always at least a frame, since nothing can have changed sooner.
+    def get_delay_until_frame(self, frames, rtt=None, now=None):
+        if now is None:
+            now = time.monotonic()
+        arrival_time = now + (rtt or 0.0) / 2
+        return max(FRAME_DURATION, self.get_frame_start(self.frame_count + frames) + WRITE_MARGIN - arrival_time)
+
+    # How many times longer to wait, given how many reads in a row found the game had stopped running frames.
+    def get_stall_backoff(self):
+        return 2 ** min(self.stalled_reads, MAX_STALL_DOUBLINGS)
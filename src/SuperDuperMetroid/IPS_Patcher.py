@@ -1,32 +1,4 @@
-# Converts a hexadecimal string to a base 10 integer.
-def hex_to_int(hex_to_convert):
-    return int(hex_to_convert, 16)
-
-
-# Converts binary data to a hexadecimal string.
-def data_to_hex(data_to_convert):
-    return "".join("{:02x}".format(x) for x in data_to_convert).upper()
-
-
-# Reverses the endianness of a hexadecimal string.
-def reverse_endianness(hex_to_reverse):
-    assert (len(hex_to_reverse) % 2) == 0
-    hex_pairs = []
-    for i in range(len(hex_to_reverse) // 2):
-        hex_pairs.append(hex_to_reverse[2 * i] + hex_to_reverse[2 * i + 1])
-    reversed_hex_pairs = hex_pairs[::-1]
-    output_string = ""
-    for pair in reversed_hex_pairs:
-        output_string += pair
-    return output_string
-
-
-# Pads a hexadecimal string with 0's until it meets the provided length.
-def pad_hex(hex_to_pad, num_hex_characters):
-    return_hex = hex_to_pad
-    while len(return_hex) < num_hex_characters:
-        return_hex = "0" + return_hex
-    return return_hex
+from SuperDuperMetroid.Binary_Utils import be_bytes_to_int
 
 
 class IPSPatcher:
@@ -34,24 +6,23 @@ class IPSPatcher:
     @staticmethod
     def read_and_apply_hunk(ips_file, rom_file):
         # Get the offset field
-        offset_field = data_to_hex(ips_file.read(3))
-        # print(offset_field)
+        offset_field = ips_file.read(3)
         # If EOF, return False
-        if offset_field == "454F46":  # Spells out "EOF"
+        if offset_field == b"EOF":
             print("Reached EOF successfully, finishing IPS patch...")
             return False
         # Get the length field
-        length_field = data_to_hex(ips_file.read(2))
-        # Convert fields to integer
-        patch_offset = hex_to_int(offset_field)
-        patch_length = hex_to_int(length_field)
+        length_field = ips_file.read(2)
+        # Convert fields to integer.
+        # Unlike everything on the SNES, IPS fields are big endian.
+        patch_offset = be_bytes_to_int(offset_field)
+        patch_length = be_bytes_to_int(length_field)
         # Apply hunk.
         rom_file.seek(patch_offset)
         if patch_length == 0:
-            num_repeats = hex_to_int(data_to_hex(ips_file.read(2)))
+            num_repeats = be_bytes_to_int(ips_file.read(2))
             byte = ips_file.read(1)
-            for i in range(num_repeats):
-                rom_file.write(byte)
+            rom_file.write(byte * num_repeats)
         else:
             # Patches tend to be short - format enforced - so this shouldn't(?) raise any errors.
             bytes = ips_file.read(patch_length)
@@ -61,8 +32,8 @@ class IPSPatcher:
     # Read the first 5 bytes to verify that this is an IPS file.
     @staticmethod
     def verify_format(ips_file):
-        verification_bytes = data_to_hex(ips_file.read(5))
-        if verification_bytes == "5041544348":  # Spells out "PATCH"
+        verification_bytes = ips_file.read(5)
+        if verification_bytes == b"PATCH":
             return True
         else:
             return False
@@ -0,0 +1,136 @@
+# RAM Mirror
+#
+# Keeps a copy of a fixed set of memory regions, read in bulk at a fixed cadence.
+# Questions about the game can then be answered from the copy instead of from the device,
+# So the device sees the same bounded request rate no matter how many consumers there are.
+#
+# If a frame counter region is given, the copy is only treated as new data once the counter moves,
+# Since nothing in RAM changes while the game isn't running frames.
+
+import asyncio
+import inspect
+import time
+
+from SuperDuperMetroid.Binary_Utils import read_u16le
+
+
+# A callback for changes to a range of mirrored memory.
+class RamWatch:
+    __slots__ = ("address", "num_bytes", "callback")
+
+    def __init__(self, address, num_bytes, callback):
+        self.address = address
+        self.num_bytes = num_bytes
+        self.callback = callback
+
+
+class RamMirror:
+    # regions is a dict of region name to (address, number of bytes).
+    # interval is the time between refreshes, in seconds.
+    def __init__(self, client, regions, interval=0.1, frame_counter_region=None):
+        self.client = client
+        self.regions = dict(regions)
+        self.interval = interval
+        self.frame_counter_region = frame_counter_region
+        # Region name to the last copy of its data, as bytes.
+        self.data = {}
+        # time.monotonic time at which the last copy was read.
+        self.refresh_time = None
+        # Frame counter value at the last refresh.
+        self.frame_counter = None
+        self.watches = []
+        self.refresh_task = None
+
+    def is_running(self):
+        return self.refresh_task is not None and not self.refresh_task.done()
+
+    def start(self):
+        if not self.is_running():
+            self.refresh_task = asyncio.ensure_future(self.__refresh_periodically())
+
+    def stop(self):
+        if self.refresh_task is not None:
+            self.refresh_task.cancel()
+        self.refresh_task = None
+
+    async def __refresh_periodically(self):
+        while True:
+            # Slow or failing devices are refreshed less often.
+            await asyncio.sleep(self.client.limiter.get_retry_delay(self.interval))
+            try:
+                await self.refresh()
+            except ConnectionError as e:
+                # Keep the last copy, and try again at the next refresh.
+                print(f"WARNING: Could not refresh RAM mirror: {e}")
+
+    # Reads every region in a single exchange, and notifies watchers of anything which changed.
+    async def refresh(self):
+        region_names = list(self.regions)
+        region_data = await self.client.read_many([self.regions[region_name] for region_name in region_names])
+        new_data = dict(zip(region_names, region_data))
+        if self.frame_counter_region is not None:
+            frame_counter = read_u16le(new_data[self.frame_counter_region])
+            if frame_counter == self.frame_counter and self.data:
+                return False
+            self.frame_counter = frame_counter
+        old_data = self.data
+        self.data = new_data
+        self.refresh_time = time.monotonic()
+        if old_data:
+            for region_name in region_names:
+                if old_data[region_name] != new_data[region_name]:
+                    await self.__notify_watches(region_name, old_data[region_name], new_data[region_name])
+        return True
+
+    async def __notify_watches(self, region_name, old_region_data, new_region_data):
+        region_address, region_num_bytes = self.regions[region_name]
+        for watch in list(self.watches):
+            offset = watch.address - region_address
+            if 0 <= offset and offset + watch.num_bytes <= region_num_bytes:
+                old_value = old_region_data[offset : offset + watch.num_bytes]
+                new_value = new_region_data[offset : offset + watch.num_bytes]
+                if old_value != new_value:
+                    result = watch.callback(old_value, new_value)
+                    if inspect.isawaitable(result):
+                        await result
+
+    # Calls callback(old_bytes, new_bytes) whenever the given range changes.
+    # The range has to lie within one region. Callbacks may be coroutine functions.
+    # Returns a RamWatch which can be passed to unwatch.
+    def watch(self, address, num_bytes, callback):
+        if self.__find_region(address, num_bytes) is None:
+            raise ValueError(f"ERROR: Range {address:X}-{address + num_bytes - 1:X} is not covered by the RAM mirror.")
+        ram_watch = RamWatch(address, num_bytes, callback)
+        self.watches.append(ram_watch)
+        return ram_watch
+
+    def unwatch(self, ram_watch):
+        self.watches.remove(ram_watch)
+
+    # Returns the name of the region containing the given range, or None if there is none.
+    def __find_region(self, address, num_bytes):
+        for region_name, (region_address, region_num_bytes) in self.regions.items():
+            if region_address <= address and address + num_bytes <= region_address + region_num_bytes:
+                return region_name
+        return None
+
+    # Returns the mirrored bytes for a range, or None if the range isn't mirrored or hasn't been read yet.
+    def read(self, address, num_bytes):
+        region_name = self.__find_region(address, num_bytes)
+        if region_name is None or region_name not in self.data:
+            return None
+        offset = address - self.regions[region_name][0]
+        return self.data[region_name][offset : offset + num_bytes]
+
+    # Applies a write we made ourselves to the copy, so it doesn't go stale until the next refresh.
+    # Watchers aren't notified, since the change didn't come from the game.
+    def apply_write(self, address, data):
+        for region_name, (region_address, region_num_bytes) in self.regions.items():
+            if region_name not in self.data:
+                continue
+            start = max(address, region_address)
+            end = min(address + len(data), region_address + region_num_bytes)
+            if start < end:
+                region_data = bytearray(self.data[region_name])
+                region_data[start - region_address : end - region_address] = data[start - address : end - address]
+                self.data[region_name] = bytes(region_data)
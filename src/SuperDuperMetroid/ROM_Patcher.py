@@ -42,25 +42,54 @@
 #
 # Item PLM References are overwritten with the appropriate new type in bank $8F
 #
+# RAM addresses $7FFF00-$7FFF4F are a ring buffer of 8 multiworld items waiting to be shown,
+# 10 bytes each. Each entry holds the 5 values copied to $7FFF76-$7FFF7F when the item is shown.
+# RAM address $7FFF50-$7FFF51 is the ring buffer's head, advanced by the interface after writing entries.
+# RAM address $7FFF52-$7FFF53 is the ring buffer's tail, advanced by the game after showing an entry.
+# Both count up forever, the entry used is the count modulo 8.
+# RAM address $7FFF54-$7FFF55 counts the locations checked, and is never reset.
+# RAM addresses $7FFF56-$7FFF65 are a journal of the last 16 pickup indices checked, one byte each,
+# Written to entry (count modulo 16) before the count is advanced.
+#
+# All of these live at the end of bank $7F, which the game only uses for level data of the current room.
+# Rooms are at most $3200 blocks, so their tiles, BTS and layer 2 data never reach $7F:FF00,
+# Which is why the records from $7FFF72 on were put here in the first place.
+# The ring buffer and journal take the unused space below them, and $7FFF66-$7FFF71 is still free.
+#
 # RAM address $7FFF72-$7FFF73 is the routine in bank 83 to jump to.
 # RAM address $7FFF74-$7FFF75 is nonzero when we haven't been sent an item.
 # RAM address $7FFF76-$7FFF7F are occupied by values for a multiworld item we've been
 # Given. Same as the 5 values we have tables for.
+# RAM address $7FFF80-$7FFF81 is the routine which was in the event slot at $7E0A42,
+# Restored once the ring buffer is empty.
 #
 # RAM addresses $7FFF8E-$7FFFFF are occupied by a copy of the game's item bitflags,
 # Which are used to determine which item a player has picked up.
 #
 # Kazuto's More Efficient PLMs patch is applied, and changes are present
 # in banks $84 and $89.
+#
+# The checksum in the internal ROM header is recalculated for the patched ROM,
+# And a symbol map is written next to it for the interface, see Symbol_Map.
 
 import json
 import os
 import random
+from functools import lru_cache
 from pathlib import Path
+from types import MappingProxyType
 
+from SuperDuperMetroid.Binary_Utils import hex_to_data, int_to_le_hex, read_u16le
 from SuperDuperMetroid.IPS_Patcher import IPSPatcher
 from SuperDuperMetroid.SM_Constants import SuperMetroidConstants
-from SuperDuperMetroid.SM_Room_Header_Data import DoorData, SMRooms
+from SuperDuperMetroid.SM_Room_Header_Data import DoorData, load_room_index
+from SuperDuperMetroid.Symbol_Map import (
+    ROM_READABLE_ITEM_TABLES,
+    SymbolMap,
+    get_rom_identity,
+    get_symbol_map_path,
+    lorom_to_rom_offset,
+)
 from enum import Enum
 from io import BytesIO
 
@@ -177,7 +206,7 @@ class MessageBoxGenerator:
 
     # Create the message box generator.
     # TODO: Place initial method *after* appended messagebox routines.
-    def __init__(self, rom_file, initial_address="029643"):
+    def __init__(self, rom_file, initial_address=0x029643):
         self.currentAddress = initial_address
         self.messageBoxList = {}
         self.file = rom_file
@@ -269,15 +298,11 @@ class MessageBoxGenerator:
                 self.largeMessagePointerTable[message_text] = message_text
 
         # Write hex to ROM
-        self.file.seek(int(self.currentAddress, 16))
-        self.file.write(bytes.fromhex(format(message_hex, "x")))
+        self.file.seek(self.currentAddress)
+        self.file.write(bytes.fromhex(message_hex))
 
         # Update address for next message box write.
-        self.currentAddress = (hex(int(self.currentAddress, 16) + 64)[2:]).upper()
-        # Prepend a 0 to make it look more presentable.
-        # Not important, I'm just a perfectionist.
-        if len(self.currentAddress) == 5:
-            self.currentAddress = "0" + self.currentAddress
+        self.currentAddress += 64
 
 
 class ItemType:
@@ -293,6 +318,30 @@ class ItemType:
             self.paletteBytes = palette_bytes
 
 
+# File-like object which records writes instead of performing them,
+# So that planned ROM changes can be reused and replayed onto several ROMs.
+class RecordedWrites:
+    def __init__(self):
+        self.writes = []
+        self.position = 0
+
+    def seek(self, position):
+        self.position = position
+
+    def write(self, data):
+        # Merge writes to consecutive addresses.
+        if self.writes and self.writes[-1][0] + len(self.writes[-1][1]) == self.position:
+            self.writes[-1][1].extend(data)
+        else:
+            self.writes.append((self.position, bytearray(data)))
+        self.position += len(data)
+
+    def replay(self, rom_file):
+        for position, data in self.writes:
+            rom_file.seek(position)
+            rom_file.write(data)
+
+
 # Class which represents items being passed to the game from the generator
 # TODO: Implement this more fully
 class PickupPlacementData:
@@ -320,46 +369,9 @@ class PickupPlacementData:
 # class PickupEffect(Enum):
 
 
-# Converts a hexadecimal string to a base 10 integer.
-def hex_to_int(hex_to_convert):
-    return int(hex_to_convert, 16)
-
-
-# Converts an integer to a hexadecimal string.
-def int_to_hex(int_to_convert):
-    return (hex(int_to_convert)[2:]).upper()
-
-
-# Converts a hexadecimal string to binary data.
-def hex_to_data(hex_to_convert):
-    return bytes.fromhex(hex_to_convert)
-
-
-# Reverses the endianness of a hexadecimal string.
-def reverse_endianness(hex_to_reverse):
-    assert (len(hex_to_reverse) % 2) == 0
-    hex_pairs = []
-    for i in range(len(hex_to_reverse) // 2):
-        hex_pairs.append(hex_to_reverse[2 * i] + hex_to_reverse[2 * i + 1])
-    reversed_hex_pairs = hex_pairs[::-1]
-    output_string = ""
-    for pair in reversed_hex_pairs:
-        output_string += pair
-    return output_string
-
-
-# Pads a hexadecimal string with 0's until it meets the provided length.
-def pad_hex(hex_to_pad, num_hex_characters):
-    return_hex = hex_to_pad
-    while len(return_hex) < num_hex_characters:
-        return_hex = "0" + return_hex
-    return return_hex
-
-
 # Substitutes every incidence of a keyword in a string with a hex version of the passed number.
 def replace_with_hex(original_string, keyword, number, num_hex_digits=4):
-    num_hex_string = reverse_endianness(pad_hex(int_to_hex(number), num_hex_digits))
-    return original_string.replace(keyword, num_hex_string)
+    return original_string.replace(keyword, int_to_le_hex(number, num_hex_digits))
 
 
 def raw_randomized_example_item_pickup_data():
@@ -467,28 +479,58 @@ def raw_randomized_example_item_pickup_data():
     ]
 
 
+# Describes a list of pickups independently of where they are placed.
+# Each distinct pickup is kept once, in the order it first appears in the list,
+# Since item types, and so PLM IDs and pickup routines, are handed out in that order.
+# Seeds which contain the same items, quantities and effects in that order share one key,
+# So everything planned from it can be reused no matter where the items ended up.
+# The native sprite is part of each entry as well, since the item graphics planned from the key depend on it.
+def get_pickup_key(pickup_data_list, player_name=None):
+    return tuple(
+        dict.fromkeys(
+            (
+                pickup.item_name,
+                pickup.quantity_given,
+                pickup.pickup_effect,
+                pickup.owner_name is None or pickup.owner_name == player_name,
+                (pickup.native_sprite_name or "") if pickup.native_graphics else "",
+            )
+            for pickup in pickup_data_list
+        )
+    )
+
+
 def create_item_types(pickup_data_list):
+    item_types = {}
+    for item_type in plan_item_types(get_pickup_key(pickup_data_list)):
+        item_types[item_type.itemName] = item_type
+    return item_types
+
+
+# Item types only depend on which items are in the seed, so they are planned once per pickup key.
+@lru_cache(maxsize=32)
+def plan_item_types(pickup_key):
     item_types = {}
     # TODO: Add a placeholder-type sprite to available native graphics sprites
     # REMINDER: After doing so increment the initial GFXDataLocation address
-    next_pickup_gfx_data_location = "0095"
+    next_pickup_gfx_data_location = 0x0095
     item_gfx_added = {}
-    for pickup in pickup_data_list:
-        if pickup.item_name == "No Item":
+    for item_name, quantity, effect, owner_is_me, native_sprite_name in pickup_key:
+        if item_name == "No Item":
             continue
-        if not pickup.item_name in item_types:
-            if pickup.native_graphics:
-                item_types[pickup.item_name] = ItemType(
-                    pickup.item_name,
-                    SuperMetroidConstants.nativeItemSpriteLocations[pickup.native_sprite_name],
-                    SuperMetroidConstants.nativeItemPalettes[pickup.native_sprite_name],
+        if not item_name in item_types:
+            if native_sprite_name:
+                item_types[item_name] = ItemType(
+                    item_name,
+                    SuperMetroidConstants.nativeItemSpriteLocations[native_sprite_name],
+                    SuperMetroidConstants.nativeItemPalettes[native_sprite_name],
                 )
             else:
                 # TODO: Patch pickup graphics into ROM from file
                 # TODO: Add message box generation
-                item_gfx_added[pickup.item_name] = pickup.graphics_file_name
-                next_pickup_gfx_data_location = pad_hex(int_to_hex(hex_to_int(next_pickup_gfx_data_location) + 1), 4)
-    return item_types
+                item_gfx_added[item_name] = None
+                next_pickup_gfx_data_location += 1
+    return tuple(item_types.values())
 
 
 def get_patch_dict():
@@ -562,6 +604,23 @@ def get_equipment_routines():
 
 
 def get_all_necessary_pickup_routines(item_list, item_get_routines_dict, starting_items, player_name):
+    # patch_rom passes None for starting items when it generates a vanilla placement itself.
+    if starting_items is None:
+        starting_items = []
+    pickup_key = get_pickup_key(list(item_list) + list(starting_items), player_name)
+    for routine_name, routine in plan_pickup_routines(pickup_key):
+        item_get_routines_dict.setdefault(routine_name, routine)
+
+    # This is a command that will do nothing, used for items that are meant to go to other players.
+    # 60 is hex for the RTS instruction. In other words when called it will immediately return.
+    item_get_routines_dict["No Effect"] = (0x60).to_bytes(1, "little")
+    return item_get_routines_dict
+
+
+# Pickup routines only depend on which items are in the seed, so they are planned once per pickup key.
+# Returns (routine name, routine bytes) pairs, in the order they should be written to the ROM.
+@lru_cache(maxsize=32)
+def plan_pickup_routines(pickup_key):
     ammo_get_templates = {
         "Get Energy Tank": "ADC4091869-qty8DC4098DC20960",
         "Get Reserve Tank": "ADD4091869-qty8DD409ADC009D003EEC00960",
@@ -571,6 +630,7 @@ def get_all_necessary_pickup_routines(item_list, item_get_routines_dict, startin
     }
 
     equipment_gets = get_equipment_routines()
+    item_get_routines_dict = {}
 
     # For non-vanilla ammo get routines.
     custom_ammo_get_templates = {}
@@ -578,38 +638,30 @@ def get_all_necessary_pickup_routines(item_list, item_get_routines_dict, startin
     # Create individual routines from ASM templates.
     # Note that the exact effect is hardcoded in, so ex. wave beam and ice beam are two different routines.
     # This is because I'm lazy and we absolutely have room for it.
-    all_items_list = item_list.copy()
-    all_items_list += starting_items
-    for pickup in all_items_list:
-        if pickup.owner_name is None or pickup.owner_name == player_name:
-            if pickup.item_name == "No Item":
+    for item_name, quantity, effect, owner_is_me, native_sprite_name in pickup_key:
+        if owner_is_me:
+            if item_name == "No Item":
                 continue
-            if pickup.item_name in SuperMetroidConstants.ammoItemList:
-                item_effect_name = f"Get {pickup.item_name} {pickup.quantity_given}"
+            if item_name in SuperMetroidConstants.ammoItemList:
+                item_effect_name = f"Get {item_name} {quantity}"
                 if not item_effect_name in item_get_routines_dict:
-                    pickup_hex = replace_with_hex(
-                        ammo_get_templates[pickup.pickup_effect], "-qty", pickup.quantity_given
-                    )
+                    pickup_hex = replace_with_hex(ammo_get_templates[effect], "-qty", quantity)
                     item_get_routines_dict[item_effect_name] = bytes.fromhex(pickup_hex)
-            elif pickup.item_name in SuperMetroidConstants.toggleItemList:
+            elif item_name in SuperMetroidConstants.toggleItemList:
                 # Overwrite vanilla behavior for this item if vanilla.
                 # Otherwise add new item effect for the item type.
-                if not "Get " + pickup.item_name in item_get_routines_dict:
-                    if pickup.pickup_effect in equipment_gets:
-                        item_get_routines_dict[pickup.item_name] = equipment_gets[pickup.pickup_effect]
+                if not "Get " + item_name in equipment_gets:
+                    if effect in equipment_gets:
+                        item_get_routines_dict[item_name] = equipment_gets[effect]
                 # Otherwise add new effect
             else:
                 raise NotImplementedError("ERROR: Custom item pickup behaviors are not yet implemented.")
+    return tuple(item_get_routines_dict.items())
 
-    # This is a command that will do nothing, used for items that are meant to go to other players.
-    # 60 is hex for the RTS instruction. In other words when called it will immediately return.
-    item_get_routines_dict["No Effect"] = (0x60).to_bytes(1, "little")
-    return item_get_routines_dict
 
-
-def get_door_data():
+def get_door_data(room_index):
     door_data_dict = {}
-    for room_address, door_hex_list in SMRooms.addr_to_door_data_dict.items():
+    for room_address, door_hex_list in room_index.addr_to_door_data_dict.items():
         door_data_dict[room_address] = [DoorData(door_hex) for door_hex in door_hex_list]
     return door_data_dict
 
@@ -705,22 +757,29 @@ def write_messagebox_routines(rom_file, base_in_game_address):
     # get_message_header_data_routine  = -bta
     # get_message_header_routine = -gma
     # get_message_content_routine = -dlt
+    # append_location_journal_routine = -jnl
 
-    on_pickup_found_routine = "8D1F1CC91C00F00AC914009006C91900B00160AF74FF7FC90100D01CAF7CFF7F8D1F1CA500DA48AF7EFF7F850068A20000FC0000FA8500605ADAA22000BF6ED87E9FCEFF7FCACAE00000D0F1A22000A00000BFCEFF7F385FAEFF7FC90000F0028004EAEA801C8F8EFF7FA90100CF8EFF7FF008C90080080A288003C88004D0EDC8C8CACAE00000D0C9C00100F043AF52097EAAA9DE00E00000F00A18695C06CAE00000D0F6AAA02000BF000070DA5AFA7A9FAEFF7FDA5AFA7ACACA8888C00000D0E7A22000A900009F8EFF7FCACAE00000D0F5A22000BFCEFF7F38FFAEFF7F9F8EFF7FCACAE00000D0ECA0F000A22000BF8EFF7FC90000D00A9838E91000A8CACA80EDBFCEFF7F9FAEFF7FBF8EFF7FC90100F004C84A80F7A900009F8EFF7F980A8F8EFF7FAABD00A08D1F1CFC00A2FA7A60"
+    on_pickup_found_routine = "8D1F1CC91C00F00AC914009006C91900B00160AF74FF7FC90100D01CAF7CFF7F8D1F1CA500DA48AF7EFF7F850068A20000FC0000FA8500605ADAA22000BF6ED87E9FCEFF7FCACAE00000D0F1A22000A00000BFCEFF7F385FAEFF7FC90000F0028004EAEA801C8F8EFF7FA90100CF8EFF7FF008C90080080A288003C88004D0EDC8C8CACAE00000D0C9C00100F043AF52097EAAA9DE00E00000F00A18695C06CAE00000D0F6AAA02000BF000070DA5AFA7A9FAEFF7FDA5AFA7ACACA8888C00000D0E7A22000A900009F8EFF7FCACAE00000D0F5A22000BFCEFF7F38FFAEFF7F9F8EFF7FCACAE00000D0ECA0F000A22000BF8EFF7FC90000D00A9838E91000A8CACA80EDBFCEFF7F9FAEFF7FBF8EFF7FC90100F004C84A80F7A900009F8EFF7F20-jnlEAEAEAEABD00A08D1F1CFC00A2FA7A60"
     get_message_header_data_routine = "20-gmaA920008516B900009F00327EC8C8E8E8C616D0F160"
     get_message_header_routine = (
         "AD1F1CC91C00F00AC914009009C91900B004A0408060AF74FF7FC90100D006AF76FF7FA860DAAF8EFF7FAABF009A85A8FA60"
     )
     get_message_content_routine = "AD1F1CC91C00F00AC91400902AC91900B025AD1F1C3A0A85340A186534AABD9F868500BDA58638E50085094A8516A50918698000850960AF74FF7FC90100D016AF78FF7FA88400AF7AFF7F4A85160A18698000850960DAAF8EFF7FAABF009C85A88400BF009E854A85160A186980008509FA60"
+    # Called by on_pickup_found_routine once it has found the pickup index of the item collected, which is in Y.
+    # Appends the pickup index to the location journal, so the interface can read checks in the order they happened.
+    #   Entry = (counter & F), $7FFF56 + entry = Y (one byte), counter += 1
+    #   Then does what it replaced: $7FFF8E = Y * 2, X = Y * 2.
+    append_location_journal_routine = "AF54FF7F290F00AA98E2209F56FF7FC220AF54FF7F1A8F54FF7F980A8F8EFF7FAA60"
     # KEY NOTE: WRITE ROUTINE ADDRESSES LITTLE ENDIAN!!!
     routines = [
         on_pickup_found_routine,
         get_message_header_data_routine,
         get_message_header_routine,
         get_message_content_routine,
+        append_location_journal_routine,
     ]
     routine_addresses = []
-    routine_address_refs = ["-alp", "-bta", "-gma", "-dlt"]
+    routine_address_refs = ["-alp", "-bta", "-gma", "-dlt", "-jnl"]
     in_game_address = base_in_game_address
     rom_file.seek(0x020000 + in_game_address)
     # Calculate routine addresses
@@ -745,10 +804,10 @@ def write_messagebox_routines(rom_file, base_in_game_address):
     overwrite_jsr_to_get_header_routine = "205A82"
 
     # Addresses to write routines to in Headerless ROM file.
-    overwrite_jsr_to_pickup_routine_address = "028086"
-    overwrite_get_message_header_routine_address = "02825A"
-    overwrite_jsr_to_get_message_routine_address = "0282E5"
-    overwrite_jsr_to_get_header_routine_address = "028250"
+    overwrite_jsr_to_pickup_routine_address = 0x028086
+    overwrite_get_message_header_routine_address = 0x02825A
+    overwrite_jsr_to_get_message_routine_address = 0x0282E5
+    overwrite_jsr_to_get_header_routine_address = 0x028250
 
     overwrite_routines = []
     overwrite_routine_addresses = []
@@ -780,7 +839,7 @@ def write_messagebox_routines(rom_file, base_in_game_address):
 
     # Write to file
     for i, routine in enumerate(overwrite_routines):
-        rom_file.seek(hex_to_int(overwrite_routine_addresses[i]))
+        rom_file.seek(overwrite_routine_addresses[i])
         rom_file.write(hex_to_data(routine))
 
     # Seek back to where we expect to be.
@@ -809,12 +868,11 @@ def write_save_initialization_routines(rom_file, skip_intro, custom_save_start=N
     if custom_save_start is not None:
         # Custom save start should be a list/tuple with two values:
         # Region name and save station index
-        region_hex = SuperMetroidConstants.regionToHexDict[custom_save_start[0]]
-        save_hex = reverse_endianness(pad_hex(int_to_hex(custom_save_start[1]), 4))
-        intro_routine = intro_routine.replace("-rgn", region_hex)
-        intro_routine = intro_routine.replace("-sav", save_hex)
+        region_index = SuperMetroidConstants.regionToIndexDict[custom_save_start[0]]
+        intro_routine = replace_with_hex(intro_routine, "-rgn", region_index)
+        intro_routine = replace_with_hex(intro_routine, "-sav", custom_save_start[1])
 
-        if region_hex == "0600":
+        if region_index == SuperMetroidConstants.regionToIndexDict["Ceres Station"]:
             intro_routine = intro_routine.replace("-sta", "1F00")
         else:
             intro_routine = intro_routine.replace("-sta", "0600")
@@ -840,8 +898,23 @@ def write_multiworld_routines(rom_file):
     # Routines to append to bank $83.
     # More than one are planned, for things like sending messages &c.
 
-    multiworld_item_get_routine = "AD1F1C22808085A900008F74FF7FAF80FF7F8D420A6B"
-    multiworld_routine_address_start = 0x01AD66
+    # Shows the item at the ring buffer's tail, then advances the tail.
+    # The event slot is only restored once the tail catches up with the head,
+    # So the routine runs again on the next frame while items are left.
+    #   PHP : REP #$30
+    #   Entry offset = (tail & 7) * 10, copy the entry to $7FFF76-$7FFF7F.
+    #   $7FFF74 = 1 : $1C1F = $0010 : JSL $858080 (Show message box, award item)
+    #   $7FFF74 = 0 : tail += 1
+    #   If tail == head, $0A42 = $7FFF80.
+    #   PLP : RTL
+    multiworld_item_get_routine = (
+        "08C230AF52FF7F2907000A480A0A186301AA68"
+        "BF00FF7F8F76FF7FBF02FF7F8F78FF7FBF04FF7F8F7AFF7FBF06FF7F8F7CFF7FBF08FF7F8F7EFF7F"
+        "A901008F74FF7FA910008D1F1C22808085C230A900008F74FF7F"
+        "AF52FF7F1A8F52FF7FCF50FF7FD007AF80FF7F8D420A286B"
+    )
+    # Starts after $83:ADA0-$83:ADC3, which the animal patches use.
+    multiworld_routine_address_start = 0x01AE00
 
     multiworld_routines = [multiworld_item_get_routine]
 
@@ -861,13 +934,17 @@ def write_crateria_wakeup_routine(rom_file):
 # Generate a game with vanilla item placements
 def gen_vanilla_game():
     pickups_list = []
-    for item_index, item_name in zip(SuperMetroidConstants.itemIndexList, SuperMetroidConstants.vanillaPickupList):
+    for location in SuperMetroidConstants.locationTable:
+        item_name = location.vanilla_item
         if item_name in SuperMetroidConstants.ammoItemList:
-            pickups_list.append(
-                PickupPlacementData(SuperMetroidConstants.defaultAmmoItemToQuantity[item_name], item_index, item_name)
-            )
+            quantity = SuperMetroidConstants.defaultAmmoItemToQuantity[item_name]
         else:
-            pickups_list.append(PickupPlacementData(1, item_index, item_name))
+            quantity = 1
+        pickups_list.append(
+            PickupPlacementData(
+                quantity, location.pickup_index, item_name, "Get " + item_name, native_sprite_name=item_name
+            )
+        )
     return pickups_list
 
 
@@ -1098,13 +1175,14 @@ def write_kazuto_more_efficient_items_hack(rom_file, item_types_list):
 
 
 # Perform actions based on altering door database
-def do_doors(rom_file):
-    door_data_dict = get_door_data()
+# room_index should be read from the ROM before it is patched.
+def do_doors(rom_file, room_index):
+    door_data_dict = get_door_data(room_index)
 
     # Test Modification
     # door_to_modify = ((door_data_dict[0x91F8])[0])
     # door_to_modify.to_string()
-    # door_to_modify.change_destination(0x96BA, 0)
+    # door_to_modify.change_destination(0x96BA, 0, room_index)
     # door_to_modify.to_string()
 
     door_data_list = []
@@ -1155,16 +1233,13 @@ def write_controls(controls_dict):
             rom_file.write(buttons[button][1])
 
 
-# Places the items into the game.
-def place_items(rom_file, item_get_routine_addresses_dict, pickup_data_list, player_name=None):
-    # Initialize MessageBoxGenerator
-    message_box_generator = MessageBoxGenerator(rom_file)
-
-    # Necessary for applying the Kazuto More Efficient Items Patch
-    item_types = create_item_types(pickup_data_list)
-
-    item_type_list = item_types.values()
-    plm_header_offset = write_kazuto_more_efficient_items_hack(rom_file, item_type_list)
+# Plans the Kazuto More Efficient Items Patch and the PLM IDs of each item type once per pickup key.
+# Returns the recorded patch writes and a dict of item PLM IDs.
+@lru_cache(maxsize=32)
+def plan_item_layout(pickup_key):
+    item_type_list = plan_item_types(pickup_key)
+    kazuto_hack_writes = RecordedWrites()
+    plm_header_offset = write_kazuto_more_efficient_items_hack(kazuto_hack_writes, item_type_list)
     # Generate dict of item PLMIDs. Since there's no more guarantee of ordering here, we create this
     # at patch time.
     item_plm_ids = {}
@@ -1173,6 +1248,30 @@ def place_items(rom_file, item_get_routine_addresses_dict, pickup_data_list, pla
         item_plm_ids[itemType.itemName] = plm_header_offset
         plm_header_offset += 4
     item_plm_ids["No Item"] = 0xB62F
+    return kazuto_hack_writes, MappingProxyType(item_plm_ids)
+
+
+# Offsets of the item tables from the first, in bank 85. See place_items.
+ITEM_TABLE_ADDRESS = 0x859A00
+ITEM_TABLE_OFFSETS = {
+    "Message Header": 0x000,
+    "Message Content": 0x200,
+    "Message Size": 0x400,
+    "Message ID": 0x600,
+    "Item Routine": 0x800,
+}
+
+
+# Places the items into the game.
+# Returns a dict of item PLM IDs.
+def place_items(rom_file, item_get_routine_addresses_dict, pickup_data_list, player_name=None):
+    # Initialize MessageBoxGenerator
+    message_box_generator = MessageBoxGenerator(rom_file)
+
+    # Apply the Kazuto More Efficient Items Patch.
+    # Its layout only depends on which items are in the seed, not where they are.
+    kazuto_hack_writes, item_plm_ids = plan_item_layout(get_pickup_key(pickup_data_list, player_name))
+    kazuto_hack_writes.replay(rom_file)
 
     # How much an increment for each slot above increases the value of the PLM ID.
     # We will calculate this on the fly depending on how many new items are added to this ROM.
@@ -1182,19 +1281,18 @@ def place_items(rom_file, item_get_routine_addresses_dict, pickup_data_list, pla
     # Patch ROM.
     # This part of the code is ugly as sin, I apologize.
     for i, item in enumerate(pickup_data_list):
-        patcher_index = SuperMetroidConstants.itemIndexList.index(item.pickup_index)
+        location = SuperMetroidConstants.locationByPickupIndex[item.pickup_index]
         # Write PLM Data.
-        rom_file.seek(SuperMetroidConstants.itemPLMLocationList[patcher_index])
+        rom_file.seek(location.plm_location)
         # If there is no item in this location, we should NOT try to calculate a PLM-type offset,
         # As this could give us an incorrect PLM ID.
         if item.item_name == "No Item":
             rom_file.write(item_plm_ids[item.item_name].to_bytes(2, "little"))
             continue
         rom_file.write(
-            (
-                item_plm_ids[item.item_name]
-                + item_plm_block_type_multiplier * SuperMetroidConstants.itemPLMBlockTypeList[patcher_index]
-            ).to_bytes(2, "little")
+            (item_plm_ids[item.item_name] + item_plm_block_type_multiplier * location.plm_block_type).to_bytes(
+                2, "little"
+            )
         )
         # Write Message Box Data.
         # ITEM TABLE FORMAT
@@ -1208,7 +1306,7 @@ def place_items(rom_file, item_get_routine_addresses_dict, pickup_data_list, pla
         # See documentation on memory alterations at the top of this document.
 
         # Each table entry is two bytes wide, hence the doubling.
-        memory_base_location = 0x029A00 + SuperMetroidConstants.itemLocationList[patcher_index] * 2
+        memory_base_location = 0x029A00 + location.pickup_index * 2
 
         rom_file.seek(memory_base_location)
         # TODO: Handle width and height separately.
@@ -1232,15 +1330,82 @@ def place_items(rom_file, item_get_routine_addresses_dict, pickup_data_list, pla
         # This is not the same as there not being an item in this position -
         # The item will be there, it will just have no effect for the SM player.
         if player_name is not None and not item.owner_name == player_name:
-            rom_file.write(item_get_routine_addresses_dict["No Item"].to_bytes(2, "little"))
+            rom_file.write(item_get_routine_addresses_dict["No Effect"].to_bytes(2, "little"))
         else:
             item_effect_name = "Get " + item.item_name
             if item.item_name in SuperMetroidConstants.ammoItemList:
                 item_effect_name = f"Get {item.item_name} {item.quantity_given}"
             rom_file.write(item_get_routine_addresses_dict[item_effect_name].to_bytes(2, "little"))
+    return item_plm_ids
+
+
+# Calculates the checksum for the internal ROM header, as the SNES does.
+# ROMs whose size isn't a power of two have their last part repeated until it is.
+def calculate_rom_checksum(rom_data):
+    base_size = 1 << (len(rom_data).bit_length() - 1)
+    checksum = sum(rom_data[:base_size])
+    remainder = rom_data[base_size:]
+    if remainder:
+        checksum += sum(remainder) * (base_size // len(remainder))
+    return checksum & 0xFFFF
+
+
+# Writes the checksum of the patched ROM and its complement to the internal ROM header.
+# Returns the checksum.
+def write_rom_checksum(rom_file):
+    complement_address = SuperMetroidConstants.romHeaderAddress + SuperMetroidConstants.romChecksumOffset - 2
+    # The checksum and its complement always add up to the same bytes, so fill them in with any valid pair first.
+    rom_file.seek(complement_address)
+    rom_file.write(bytes([0xFF, 0xFF, 0x00, 0x00]))
+    with rom_file.getbuffer() as rom_data:
+        checksum = calculate_rom_checksum(rom_data)
+    rom_file.seek(complement_address)
+    rom_file.write((checksum ^ 0xFFFF).to_bytes(2, "little") + checksum.to_bytes(2, "little"))
+    return checksum
+
+
+# Builds the symbol map for a patched ROM, which tells the interface where things ended up in it.
+def build_symbol_map(rom_data, item_get_routine_addresses_dict, item_plm_ids, item_list):
+    header_address = SuperMetroidConstants.romHeaderAddress
+    rom_title, rom_checksum = get_rom_identity(
+        rom_data[header_address : header_address + SuperMetroidConstants.romHeaderSize]
+    )
+    locations = {
+        item.pickup_index: {
+            "item_name": item.item_name,
+            "owner_name": item.owner_name,
+            "quantity_given": item.quantity_given,
+        }
+        for item in item_list
+    }
+    # The item table entries place_items wrote, so devices which can't read ROM can be told them.
+    # Nothing is written for empty locations.
+    item_table_entries = {}
+    for table_name in ROM_READABLE_ITEM_TABLES:
+        table_offset = lorom_to_rom_offset(ITEM_TABLE_ADDRESS + ITEM_TABLE_OFFSETS[table_name])
+        item_table_entries[table_name] = {
+            item.pickup_index: read_u16le(rom_data, table_offset + item.pickup_index * 2)
+            for item in item_list
+            if item.item_name != "No Item"
+        }
+    return SymbolMap(
+        rom_title,
+        rom_checksum,
+        item_get_routine_addresses_dict,
+        item_plm_ids,
+        {table_name: ITEM_TABLE_ADDRESS + offset for table_name, offset in ITEM_TABLE_OFFSETS.items()},
+        SuperMetroidConstants.itemMessageAddresses,
+        locations,
+        [
+            item_name
+            for item_name in item_plm_ids
+            if item_name != "No Item" and item_name not in SuperMetroidConstants.itemList
+        ],
+        item_table_entries,
+    )
 
 
-def patch_rom_json(rom_file, output_path, patch_data):
+def patch_rom_json(rom_file, output_path, patch_data, room_index_cache_dir=None):
     if "seed" in patch_data:
         seed = patch_data["seed"]
     else:
@@ -1287,6 +1452,8 @@ def patch_rom_json(rom_file, output_path, patch_data):
     if "controls" in patch_data:
         keyword_arguments["controls"] = patch_data["controls"]
 
+    keyword_arguments["room_index_cache_dir"] = room_index_cache_dir
+
     patch_rom(rom_file, output_path, item_list, None, None, seed, **keyword_arguments)
 
 
@@ -1299,7 +1466,7 @@ def patch_rom(rom_file, output_path, item_list=None, player_name=None, recipient
     # This will give a warning message, as this is only appropriate for debugging patcher features.
     if item_list is None:
         item_list = gen_vanilla_game()
-        starting_items = None
+        starting_items = []
         print(
             "WARNING: Item list was not supplied to ROM patcher. Generating Vanilla placement with no starting items."
         )
@@ -1309,6 +1476,10 @@ def patch_rom(rom_file, output_path, item_list=None, player_name=None, recipient
         except:
             raise ValueError("ERROR: Non-Empty item list didn't meet length requirement. Aborting ROM Patch.")
 
+    # Read room headers and door data from the unmodified ROM.
+    # The index is only cached on disk if a room_index_cache_dir was given.
+    room_index = load_room_index(rom_file.getvalue(), kwargs.get("room_index_cache_dir"))
+
     # Now write our new routines to memory.
     # First we append new routines to free space
     # At the end of bank 85.
@@ -1321,7 +1492,7 @@ def patch_rom(rom_file, output_path, item_list=None, player_name=None, recipient
     item_get_routine_addresses_dict = write_item_get_routines(rom_file, item_get_routines_dict, in_game_address)
 
     # Patch Item Placements into the ROM.
-    place_items(rom_file, item_get_routine_addresses_dict, item_list)
+    item_plm_ids = place_items(rom_file, item_get_routine_addresses_dict, item_list, player_name)
 
     # Add starting items patch
     add_starting_inventory(rom_file, starting_items, item_get_routine_addresses_dict)
@@ -1367,11 +1538,18 @@ def patch_rom(rom_file, output_path, item_list=None, player_name=None, recipient
     if "controls" in kwargs:
         write_controls(kwargs["controls"])
 
-    do_doors(rom_file)
+    do_doors(rom_file, room_index)
+
+    write_rom_checksum(rom_file)
 
     with open(output_path, "wb") as output_file:
         output_file.write(rom_file.getbuffer())
 
+    # Tell the interface where everything ended up.
+    with rom_file.getbuffer() as rom_data:
+        symbol_map = build_symbol_map(rom_data, item_get_routine_addresses_dict, item_plm_ids, item_list)
+    symbol_map.save(get_symbol_map_path(output_path))
+
     rom_file.close()
     print("ROM modified successfully.")
 
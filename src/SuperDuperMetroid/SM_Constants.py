@@ -2,110 +2,152 @@
 # This file only holds constants - any data specific to a given patch or version is not present.
 
 
+# One item location.
+# Records are read-only once created, so the location table can be shared freely.
+class ItemLocation:
+    __slots__ = ("pickup_index", "name", "plm_location", "plm_block_type", "vanilla_item")
+
+    def __init__(self, pickup_index, name, plm_location, plm_block_type, vanilla_item):
+        # Index of this location in the game's item bitflags, and in the patcher's item tables.
+        object.__setattr__(self, "pickup_index", pickup_index)
+        object.__setattr__(self, "name", name)
+        # Where this location's item PLM is in ROM.
+        # This is where we place each item's entity so that it will show up in the room.
+        # Doing so overwrites the item that would have been there previously (i.e. in an unpatched ROM).
+        object.__setattr__(self, "plm_location", plm_location)
+        # PLM type offset.
+        # Used to set items as shot block (2) or chozo orbs (1) when necessary.
+        object.__setattr__(self, "plm_block_type", plm_block_type)
+        object.__setattr__(self, "vanilla_item", vanilla_item)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"ERROR: Item locations are read-only, cannot set '{name}'.")
+
+    def __repr__(self):
+        return f"ItemLocation({self.pickup_index:#04x}, {self.name!r})"
+
+
 class SuperMetroidConstants:
-    # Dictionary of locations by their in-game bitflag index
-    bitflagIndexToLocationNameDict = {
-        0: "Crateria Landing Site Power Bombs",
-        1: "Crateria Ocean Underwater Missiles",
-        2: "Crateria Ocean Cliff Missiles",
-        3: "Crateria Ocean Morph Maze Missiles",
-        4: "Crateria Moat Missiles",
-        5: "Crateria Gauntlet Energy Tank",
-        6: "Crateria Mother Brain Missiles",
-        7: "Crateria Morph Ball Bombs",
-        8: "Crateria Terminator Energy Tank",
-        9: "Crateria Gauntlet Right Missiles",
-        10: "Crateria Gauntlet Left Missiles",
-        11: "Crateria Shinespark Shaft Super Missiles",
-        12: "Crateria Final Missiles",
-        13: "Green Brinstar Etecoons Power Bombs",
-        14: "Pink Brinstar Spore Spawn Super Missiles",
-        15: "Green Brinstar Early Supers Crumble Bridge Missiles",
-        16: "Green Brinstar Early Supers Super Missiles",
-        17: "Green Brinstar Reserve Tank",
-        18: "Green Brinstar Reserve Tank Missiles 2",
-        19: "Green Brinstar Reserve Tank Missiles",
-        21: "Pink Brinstar Big Pink Grapple Missiles",
-        22: "Pink Brinstar Big Pink Bottom Missiles",
-        23: "Pink Brinstar Charge Beam",
-        24: "Pink Brinstar Big Pink Grapple Power Bombs",
-        25: "Green Brinstar Green Hill Zone Missiles",
-        26: "Blue Brinstar Morph Ball",
-        27: "Blue Brinstar Power Bombs",
-        28: "Blue Brinstar Energy Tank Room Missiles",
-        29: "Blue Brinstar Energy Tank",
-        30: "Green Brinstar Etecoons Energy Tank",
-        31: "Green Brinstar Etecoons Super Missiles",
-        33: "Pink Brinstar Waterway Energy Tank",
-        34: "Blue Brinstar First Missiles",
-        35: "Pink Brinstar Wavegate Energy Tank",
-        36: "Blue Brinstar Billy Mayes Missiles",
-        37: "Blue Brinstar Billy Mayes' Double Offer Missiles",
-        38: "Red Brinstar X-Ray Scope",
-        39: "Red Brinstar Samus Eater Power Bombs",
-        40: "Red Brinstar Alpha Power Bombs",
-        41: "Red Brinstar Behind Alpha Power Bombs Missiles",
-        42: "Red Brinstar Spazer",
-        43: "Warehouse Brinstar Energy Tank",
-        44: "Warehouse Brinstar Missiles",
-        48: "Warehouse Brinstar Varia Suit",
-        49: "Norfair Cathedral Missiles",
-        50: "Norfair Ice Beam",
-        51: "Norfair Crumble Shaft Missiles",
-        52: "Norfair Crocomire Energy Tank",
-        53: "Norfair Hi-Jump Boots",
-        54: "Norfair Crocomire Escape Missiles",
-        55: "Norfair Hi-Jump Missiles",
-        56: "Norfair Hi-Jump Energy Tank",
-        57: "Norfair Crocomire Power Bombs",
-        58: "Norfair Crocomire Cosine Missiles",
-        59: "Norfair Grapple Missiles",
-        60: "Norfair Grapple Beam",
-        61: "Norfair Bubble Mountain Reserve Tank",
-        62: "Norfair Bubble Mountain Reserve Missiles",
-        63: "Norfair Bubble Mountain Grapple Missiles",
-        64: "Norfair Bubble Mountain Missiles",
-        65: "Norfair Speedboost Missiles",
-        66: "Norfair Speed Booster",
-        67: "Norfair Wave Beam Missiles",
-        68: "Norfair Wave Beam",
-        70: "Norfair Golden Torizo Missiles",
-        71: "Norfair Golden Torizo Super Missiles",
-        73: "Norfair Mickey Mouse Missiles",
-        74: "Norfair Springball Maze Missiles",
-        75: "Norfair Lower Escape Power Bombs",
-        76: "Norfair Power Bombs of Shame",
-        77: "Norfair FrankerZ Missiles",
-        78: "Norfair Ridley Energy Tank",
-        79: "Norfair Screw Attack",
-        80: "Norfair Dark Room Energy Tank",
-        128: "Wrecked Ship Spooky Missiles",
-        129: "Wrecked Ship Reserve Tank",
-        130: "Wrecked Ship Bowling Missiles",
-        131: "Wrecked Ship Robot Missiles",
-        132: "Wrecked Ship Energy Tank",
-        133: "Wrecked Ship West Super Missiles",
-        134: "Wrecked Ship East Super Missiles",
-        135: "Wrecked Ship Gravity Suit",
-        136: "Maridia Main Street Missiles",
-        137: "Maridia Main Street Super Missiles",
-        138: "Maridia Turtle Energy Tank",
-        139: "Maridia Turtle Missiles",
-        140: "Maridia Watering Hole Super Missiles",
-        141: "Maridia Watering Hole Missiles",
-        142: "Maridia Pseudo-Spark Missiles",
-        143: "Maridia Plasma Beam",
-        144: "Maridia West Sandtrap Missiles",
-        145: "Maridia Reserve Tank",
-        146: "Maridia East Sandtrap Missiles",
-        147: "Maridia East Sandtrap Power Bombs",
-        148: "Maridia Aqueduct Missiles",
-        149: "Maridia Aqeuduct Super Misiles",
-        150: "Maridia Springball",
-        151: "Maridia Precious Missiles",
-        152: "Maridia Botwoon Energy Tank",
-        154: "Maridia Space Jump",
-    }
+    # Every item location, in the order they're stored in memory.
+    # Columns: pickup (bitflag) index, name, PLM location in ROM, PLM block type, vanilla item.
+    locationTable = (
+        ItemLocation(0x00, "Crateria Landing Site Power Bombs", 0x781CC, 0, "Power Bomb Expansion"),
+        ItemLocation(0x01, "Crateria Ocean Underwater Missiles", 0x781E8, 0, "Missile Expansion"),
+        ItemLocation(0x02, "Crateria Ocean Cliff Missiles", 0x781EE, 2, "Missile Expansion"),
+        ItemLocation(0x03, "Crateria Ocean Morph Maze Missiles", 0x781F4, 0, "Missile Expansion"),
+        ItemLocation(0x04, "Crateria Moat Missiles", 0x78248, 0, "Missile Expansion"),
+        ItemLocation(0x05, "Crateria Gauntlet Energy Tank", 0x78264, 0, "Energy Tank"),
+        ItemLocation(0x06, "Crateria Mother Brain Missiles", 0x783EE, 0, "Missile Expansion"),
+        ItemLocation(0x07, "Crateria Morph Ball Bombs", 0x78404, 1, "Morph Ball Bombs"),
+        ItemLocation(0x08, "Crateria Terminator Energy Tank", 0x78432, 0, "Energy Tank"),
+        ItemLocation(0x09, "Crateria Gauntlet Right Missiles", 0x78464, 0, "Missile Expansion"),
+        ItemLocation(0x0A, "Crateria Gauntlet Left Missiles", 0x7846A, 0, "Missile Expansion"),
+        ItemLocation(0x0B, "Crateria Shinespark Shaft Super Missiles", 0x78478, 0, "Super Missile Expansion"),
+        ItemLocation(0x0C, "Crateria Final Missiles", 0x78486, 0, "Missile Expansion"),
+        ItemLocation(0x0D, "Green Brinstar Etecoons Power Bombs", 0x784AC, 1, "Power Bomb Expansion"),
+        ItemLocation(0x0E, "Pink Brinstar Spore Spawn Super Missiles", 0x784E4, 1, "Super Missile Expansion"),
+        ItemLocation(0x0F, "Green Brinstar Early Supers Crumble Bridge Missiles", 0x78518, 0, "Missile Expansion"),
+        ItemLocation(0x10, "Green Brinstar Early Supers Super Missiles", 0x7851E, 0, "Super Missile Expansion"),
+        ItemLocation(0x11, "Green Brinstar Reserve Tank", 0x7852C, 1, "Reserve Tank"),
+        ItemLocation(0x12, "Green Brinstar Reserve Tank Missiles 2", 0x78532, 2, "Missile Expansion"),
+        ItemLocation(0x13, "Green Brinstar Reserve Tank Missiles", 0x78538, 0, "Missile Expansion"),
+        ItemLocation(0x15, "Pink Brinstar Big Pink Grapple Missiles", 0x78608, 0, "Missile Expansion"),
+        ItemLocation(0x16, "Pink Brinstar Big Pink Bottom Missiles", 0x7860E, 0, "Missile Expansion"),
+        ItemLocation(0x17, "Pink Brinstar Charge Beam", 0x78614, 1, "Charge Beam"),
+        ItemLocation(0x18, "Pink Brinstar Big Pink Grapple Power Bombs", 0x7865C, 0, "Power Bomb Expansion"),
+        ItemLocation(0x19, "Green Brinstar Green Hill Zone Missiles", 0x78676, 0, "Missile Expansion"),
+        ItemLocation(0x1A, "Blue Brinstar Morph Ball", 0x786DE, 0, "Morph Ball"),
+        ItemLocation(0x1B, "Blue Brinstar Power Bombs", 0x7874C, 0, "Power Bomb Expansion"),
+        ItemLocation(0x1C, "Blue Brinstar Energy Tank Room Missiles", 0x78798, 0, "Missile Expansion"),
+        ItemLocation(0x1D, "Blue Brinstar Energy Tank", 0x7879E, 2, "Energy Tank"),
+        ItemLocation(0x1E, "Green Brinstar Etecoons Energy Tank", 0x787C2, 0, "Energy Tank"),
+        ItemLocation(0x1F, "Green Brinstar Etecoons Super Missiles", 0x787D0, 0, "Super Missile Expansion"),
+        ItemLocation(0x21, "Pink Brinstar Waterway Energy Tank", 0x787FA, 0, "Energy Tank"),
+        ItemLocation(0x22, "Blue Brinstar First Missiles", 0x78802, 1, "Missile Expansion"),
+        ItemLocation(0x23, "Pink Brinstar Wavegate Energy Tank", 0x78824, 0, "Energy Tank"),
+        ItemLocation(0x24, "Blue Brinstar Billy Mayes Missiles", 0x78836, 0, "Missile Expansion"),
+        ItemLocation(0x25, "Blue Brinstar Billy Mayes' Double Offer Missiles", 0x7883C, 2, "Missile Expansion"),
+        ItemLocation(0x26, "Red Brinstar X-Ray Scope", 0x78876, 1, "X-Ray Scope"),
+        ItemLocation(0x27, "Red Brinstar Samus Eater Power Bombs", 0x788CA, 0, "Power Bomb Expansion"),
+        ItemLocation(0x28, "Red Brinstar Alpha Power Bombs", 0x7890E, 1, "Power Bomb Expansion"),
+        ItemLocation(0x29, "Red Brinstar Behind Alpha Power Bombs Missiles", 0x78914, 0, "Missile Expansion"),
+        ItemLocation(0x2A, "Red Brinstar Spazer", 0x7896E, 1, "Spazer Beam"),
+        ItemLocation(0x2B, "Warehouse Brinstar Energy Tank", 0x7899C, 2, "Energy Tank"),
+        ItemLocation(0x2C, "Warehouse Brinstar Missiles", 0x789EC, 2, "Missile Expansion"),
+        ItemLocation(0x30, "Warehouse Brinstar Varia Suit", 0x78ACA, 1, "Varia Suit"),
+        ItemLocation(0x31, "Norfair Cathedral Missiles", 0x78AE4, 2, "Missile Expansion"),
+        ItemLocation(0x32, "Norfair Ice Beam", 0x78B24, 1, "Ice Beam"),
+        ItemLocation(0x33, "Norfair Crumble Shaft Missiles", 0x78B46, 2, "Missile Expansion"),
+        ItemLocation(0x34, "Norfair Crocomire Energy Tank", 0x78BA4, 0, "Energy Tank"),
+        ItemLocation(0x35, "Norfair Hi-Jump Boots", 0x78BAC, 1, "Hi-Jump Boots"),
+        ItemLocation(0x36, "Norfair Crocomire Escape Missiles", 0x78BC0, 0, "Missile Expansion"),
+        ItemLocation(0x37, "Norfair Hi-Jump Missiles", 0x78BE6, 0, "Missile Expansion"),
+        ItemLocation(0x38, "Norfair Hi-Jump Energy Tank", 0x78BEC, 0, "Energy Tank"),
+        ItemLocation(0x39, "Norfair Crocomire Power Bombs", 0x78C04, 0, "Power Bomb Expansion"),
+        ItemLocation(0x3A, "Norfair Crocomire Cosine Missiles", 0x78C14, 0, "Missile Expansion"),
+        ItemLocation(0x3B, "Norfair Grapple Missiles", 0x78C2A, 0, "Missile Expansion"),
+        ItemLocation(0x3C, "Norfair Grapple Beam", 0x78C36, 1, "Grapple Beam"),
+        ItemLocation(0x3D, "Norfair Bubble Mountain Reserve Tank", 0x78C3E, 1, "Reserve Tank"),
+        ItemLocation(0x3E, "Norfair Bubble Mountain Reserve Missiles", 0x78C44, 2, "Missile Expansion"),
+        ItemLocation(0x3F, "Norfair Bubble Mountain Grapple Missiles", 0x78C52, 0, "Missile Expansion"),
+        ItemLocation(0x40, "Norfair Bubble Mountain Missiles", 0x78C66, 0, "Missile Expansion"),
+        ItemLocation(0x41, "Norfair Speedboost Missiles", 0x78C74, 2, "Missile Expansion"),
+        ItemLocation(0x42, "Norfair Speed Booster", 0x78C82, 1, "Speed Booster"),
+        ItemLocation(0x43, "Norfair Wave Beam Missiles", 0x78CBC, 0, "Missile Expansion"),
+        ItemLocation(0x44, "Norfair Wave Beam", 0x78CCA, 1, "Wave Beam"),
+        ItemLocation(0x46, "Norfair Golden Torizo Missiles", 0x78E6E, 0, "Missile Expansion"),
+        ItemLocation(0x47, "Norfair Golden Torizo Super Missiles", 0x78E74, 2, "Super Missile Expansion"),
+        ItemLocation(0x49, "Norfair Mickey Mouse Missiles", 0x78F30, 0, "Missile Expansion"),
+        ItemLocation(0x4A, "Norfair Springball Maze Missiles", 0x78FCA, 0, "Missile Expansion"),
+        ItemLocation(0x4B, "Norfair Lower Escape Power Bombs", 0x78FD2, 0, "Power Bomb Expansion"),
+        ItemLocation(0x4C, "Norfair Power Bombs of Shame", 0x790C0, 0, "Power Bomb Expansion"),
+        ItemLocation(0x4D, "Norfair FrankerZ Missiles", 0x79100, 0, "Missile Expansion"),
+        ItemLocation(0x4E, "Norfair Ridley Energy Tank", 0x79108, 2, "Energy Tank"),
+        ItemLocation(0x4F, "Norfair Screw Attack", 0x79110, 1, "Screw Attack"),
+        ItemLocation(0x50, "Norfair Dark Room Energy Tank", 0x79184, 0, "Energy Tank"),
+        ItemLocation(0x80, "Wrecked Ship Spooky Missiles", 0x7C265, 0, "Missile Expansion"),
+        ItemLocation(0x81, "Wrecked Ship Reserve Tank", 0x7C2E9, 1, "Reserve Tank"),
+        ItemLocation(0x82, "Wrecked Ship Bowling Missiles", 0x7C2EF, 0, "Missile Expansion"),
+        ItemLocation(0x83, "Wrecked Ship Robot Missiles", 0x7C319, 0, "Missile Expansion"),
+        ItemLocation(0x84, "Wrecked Ship Energy Tank", 0x7C337, 0, "Energy Tank"),
+        ItemLocation(0x85, "Wrecked Ship West Super Missiles", 0x7C357, 0, "Super Missile Expansion"),
+        ItemLocation(0x86, "Wrecked Ship East Super Missiles", 0x7C365, 0, "Super Missile Expansion"),
+        ItemLocation(0x87, "Wrecked Ship Gravity Suit", 0x7C36D, 1, "Gravity Suit"),
+        ItemLocation(0x88, "Maridia Main Street Missiles", 0x7C437, 0, "Missile Expansion"),
+        ItemLocation(0x89, "Maridia Main Street Super Missiles", 0x7C43D, 0, "Super Missile Expansion"),
+        ItemLocation(0x8A, "Maridia Turtle Energy Tank", 0x7C47D, 0, "Energy Tank"),
+        ItemLocation(0x8B, "Maridia Turtle Missiles", 0x7C483, 2, "Missile Expansion"),
+        ItemLocation(0x8C, "Maridia Watering Hole Super Missiles", 0x7C4AF, 0, "Super Missile Expansion"),
+        ItemLocation(0x8D, "Maridia Watering Hole Missiles", 0x7C4B5, 0, "Missile Expansion"),
+        ItemLocation(0x8E, "Maridia Pseudo-Spark Missiles", 0x7C533, 0, "Missile Expansion"),
+        ItemLocation(0x8F, "Maridia Plasma Beam", 0x7C559, 1, "Plasma Beam"),
+        ItemLocation(0x90, "Maridia West Sandtrap Missiles", 0x7C5DD, 0, "Missile Expansion"),
+        ItemLocation(0x91, "Maridia Reserve Tank", 0x7C5E3, 1, "Reserve Tank"),
+        ItemLocation(0x92, "Maridia East Sandtrap Missiles", 0x7C5EB, 0, "Missile Expansion"),
+        ItemLocation(0x93, "Maridia East Sandtrap Power Bombs", 0x7C5F1, 0, "Power Bomb Expansion"),
+        ItemLocation(0x94, "Maridia Aqueduct Missiles", 0x7C603, 0, "Missile Expansion"),
+        ItemLocation(0x95, "Maridia Aqeuduct Super Misiles", 0x7C609, 0, "Super Missile Expansion"),
+        ItemLocation(0x96, "Maridia Springball", 0x7C6E5, 1, "Spring Ball"),
+        ItemLocation(0x97, "Maridia Precious Missiles", 0x7C74D, 2, "Missile Expansion"),
+        ItemLocation(0x98, "Maridia Botwoon Energy Tank", 0x7C755, 0, "Energy Tank"),
+        ItemLocation(0x9A, "Maridia Space Jump", 0x7C7A7, 1, "Space Jump"),
+    )
+
+    # Lookups into the location table, built once.
+    locationByPickupIndex = {location.pickup_index: location for location in locationTable}
+    locationByName = {location.name: location for location in locationTable}
+    # The pickup index doubles as the bitflag index, so this is indexed directly by bit number.
+    # Bits with no location are None.
+    locationByBitflagIndex = tuple(map(locationByPickupIndex.get, range(256)))
+
+    # Views of the location table kept for existing callers.
+    bitflagIndexToLocationNameDict = {location.pickup_index: location.name for location in locationTable}
+    itemIndexList = [location.pickup_index for location in locationTable]
+    itemLocationList = itemIndexList
+    itemPLMLocationList = [location.plm_location for location in locationTable]
+    itemPLMBlockTypeList = [location.plm_block_type for location in locationTable]
+    locationNamesList = [location.name for location in locationTable]
+    vanillaPickupList = [location.vanilla_item for location in locationTable]
 
     # List of ammo items, ordered by ascending Message ID
     ammoItemList = [
@@ -306,438 +348,20 @@ class SuperMetroidConstants:
         "Reserve Tank": None,
     }
 
-    # List of all possible item locations as they are ordered in memory.
-    itemLocationList = [
-        0x00,
-        0x01,
-        0x02,
-        0x03,
-        0x04,
-        0x05,
-        0x06,
-        0x07,
-        0x08,
-        0x09,
-        0x0A,
-        0x0B,
-        0x0C,
-        0x0D,
-        0x0E,
-        0x0F,
-        0x10,
-        0x11,
-        0x12,
-        0x13,
-        0x15,
-        0x16,
-        0x17,
-        0x18,
-        0x19,
-        0x1A,
-        0x1B,
-        0x1C,
-        0x1D,
-        0x1E,
-        0x1F,
-        0x21,
-        0x22,
-        0x23,
-        0x24,
-        0x25,
-        0x26,
-        0x27,
-        0x28,
-        0x29,
-        0x2A,
-        0x2B,
-        0x2C,
-        0x30,
-        0x31,
-        0x32,
-        0x33,
-        0x34,
-        0x35,
-        0x36,
-        0x37,
-        0x38,
-        0x39,
-        0x3A,
-        0x3B,
-        0x3C,
-        0x3D,
-        0x3E,
-        0x3F,
-        0x40,
-        0x41,
-        0x42,
-        0x43,
-        0x44,
-        0x46,
-        0x47,
-        0x49,
-        0x4A,
-        0x4B,
-        0x4C,
-        0x4D,
-        0x4E,
-        0x4F,
-        0x50,
-        0x80,
-        0x81,
-        0x82,
-        0x83,
-        0x84,
-        0x85,
-        0x86,
-        0x87,
-        0x88,
-        0x89,
-        0x8A,
-        0x8B,
-        0x8C,
-        0x8D,
-        0x8E,
-        0x8F,
-        0x90,
-        0x91,
-        0x92,
-        0x93,
-        0x94,
-        0x95,
-        0x96,
-        0x97,
-        0x98,
-        0x9A,
-    ]
-
-    # List of item PLM type offsets.
-    # Used to set items as shot block or chozo orbs when necessary,
-    # Depending upon which location an item is placed into.
-    itemPLMBlockTypeList = [
-        0,
-        0,
-        2,
-        0,
-        0,
-        0,
-        0,
-        1,
-        0,
-        0,
-        0,
-        0,
-        0,
-        1,
-        1,
-        0,
-        0,
-        1,
-        2,
-        0,
-        0,
-        0,
-        1,
-        0,
-        0,
-        0,
-        0,
-        0,
-        2,
-        0,
-        0,
-        0,
-        1,
-        0,
-        0,
-        2,
-        1,
-        0,
-        1,
-        0,
-        1,
-        2,
-        2,
-        1,
-        2,
-        1,
-        2,
-        0,
-        1,
-        0,
-        0,
-        0,
-        0,
-        0,
-        0,
-        1,
-        1,
-        2,
-        0,
-        0,
-        2,
-        1,
-        0,
-        1,
-        0,
-        2,
-        0,
-        0,
-        0,
-        0,
-        0,
-        2,
-        1,
-        0,
-        0,
-        1,
-        0,
-        0,
-        0,
-        0,
-        0,
-        1,
-        0,
-        0,
-        0,
-        2,
-        0,
-        0,
-        0,
-        1,
-        0,
-        1,
-        0,
-        0,
-        0,
-        0,
-        1,
-        2,
-        0,
-        1,
-    ]
-
-    # Item index list
-    # A list of all valid item indices, in order
-    itemIndexList = sorted(bitflagIndexToLocationNameDict)
-    # List of item PLM Locations in ROM.
-    # This is where we place each item's entity so that it will show up in the room.
-    # Doing so overwrites the item that would have been there previously (i.e. in an unpatched ROM).
-    itemPLMLocationList = [
-        0x781CC,
-        0x781E8,
-        0x781EE,
-        0x781F4,
-        0x78248,
-        0x78264,
-        0x783EE,
-        0x78404,
-        0x78432,
-        0x78464,
-        0x7846A,
-        0x78478,
-        0x78486,
-        0x784AC,
-        0x784E4,
-        0x78518,
-        0x7851E,
-        0x7852C,
-        0x78532,
-        0x78538,
-        0x78608,
-        0x7860E,
-        0x78614,
-        0x7865C,
-        0x78676,
-        0x786DE,
-        0x7874C,
-        0x78798,
-        0x7879E,
-        0x787C2,
-        0x787D0,
-        0x787FA,
-        0x78802,
-        0x78824,
-        0x78836,
-        0x7883C,
-        0x78876,
-        0x788CA,
-        0x7890E,
-        0x78914,
-        0x7896E,
-        0x7899C,
-        0x789EC,
-        0x78ACA,
-        0x78AE4,
-        0x78B24,
-        0x78B46,
-        0x78BA4,
-        0x78BAC,
-        0x78BC0,
-        0x78BE6,
-        0x78BEC,
-        0x78C04,
-        0x78C14,
-        0x78C2A,
-        0x78C36,
-        0x78C3E,
-        0x78C44,
-        0x78C52,
-        0x78C66,
-        0x78C74,
-        0x78C82,
-        0x78CBC,
-        0x78CCA,
-        0x78E6E,
-        0x78E74,
-        0x78F30,
-        0x78FCA,
-        0x78FD2,
-        0x790C0,
-        0x79100,
-        0x79108,
-        0x79110,
-        0x79184,
-        0x7C265,
-        0x7C2E9,
-        0x7C2EF,
-        0x7C319,
-        0x7C337,
-        0x7C357,
-        0x7C365,
-        0x7C36D,
-        0x7C437,
-        0x7C43D,
-        0x7C47D,
-        0x7C483,
-        0x7C4AF,
-        0x7C4B5,
-        0x7C533,
-        0x7C559,
-        0x7C5DD,
-        0x7C5E3,
-        0x7C5EB,
-        0x7C5F1,
-        0x7C603,
-        0x7C609,
-        0x7C6E5,
-        0x7C74D,
-        0x7C755,
-        0x7C7A7,
-    ]
-
-    locationNamesList = [
-        "Crateria Landing Site Power Bombs",
-        "Crateria Ocean Underwater Missiles",
-        "Crateria Ocean Cliff Missiles",
-        "Crateria Ocean Morph Maze Missiles",
-        "Crateria Moat Missiles",
-        "Crateria Gauntlet Energy Tank",
-        "Crateria Mother Brain Missiles",
-        "Crateria Morph Ball Bombs",
-        "Crateria Terminator Energy Tank",
-        "Crateria Gauntlet Right Missiles",
-        "Crateria Gauntlet Left Missiles",
-        "Crateria Shinespark Shaft Super Missiles",
-        "Crateria Final Missiles",
-        "Green Brinstar Etecoons Power Bombs",
-        "Pink Brinstar Spore Spawn Super Missiles",
-        "Green Brinstar Early Supers Crumble Bridge Missiles",
-        "Green Brinstar Early Supers Super Missiles",
-        "Green Brinstar Reserve Tank",
-        "Green Brinstar Reserve Tank Missiles 2",
-        "Green Brinstar Reserve Tank Missiles",
-        "Pink Brinstar Big Pink Grapple Missiles",
-        "Pink Brinstar Big Pink Bottom Missiles",
-        "Pink Brinstar Charge Beam",
-        "Pink Brinstar Big Pink Grapple Power Bombs",
-        "Green Brinstar Green Hill Zone Missiles",
-        "Blue Brinstar Morph Ball",
-        "Blue Brinstar Power Bombs",
-        "Blue Brinstar Energy Tank Room Missiles",
-        "Blue Brinstar Energy Tank",
-        "Green Brinstar Etecoons Energy Tank",
-        "Green Brinstar Etecoons Super Missiles",
-        "Pink Brinstar Waterway Energy Tank",
-        "Blue Brinstar First Missiles",
-        "Pink Brinstar Wavegate Energy Tank",
-        "Blue Brinstar Billy Mayes Missiles",
-        "Blue Brinstar Billy Mayes' Double Offer Missiles",
-        "Red Brinstar X-Ray Scope",
-        "Red Brinstar Samus Eater Power Bombs",
-        "Red Brinstar Alpha Power Bombs",
-        "Red Brinstar Behind Alpha Power Bombs Missiles",
-        "Red Brinstar Spazer",
-        "Warehouse Brinstar Energy Tank",
-        "Warehouse Brinstar Missiles",
-        "Warehouse Brinstar Varia Suit",
-        "Norfair Cathedral Missiles",
-        "Norfair Ice Beam",
-        "Norfair Crumble Shaft Missiles",
-        "Norfair Crocomire Energy Tank",
-        "Norfair Hi-Jump Boots",
-        "Norfair Crocomire Escape Missiles",
-        "Norfair Hi-Jump Missiles",
-        "Norfair Hi-Jump Energy Tank",
-        "Norfair Crocomire Power Bombs",
-        "Norfair Crocomire Cosine Missiles",
-        "Norfair Grapple Missiles",
-        "Norfair Grapple Beam",
-        "Norfair Bubble Mountain Reserve Tank",
-        "Norfair Bubble Mountain Reserve Missiles",
-        "Norfair Bubble Mountain Grapple Missiles",
-        "Norfair Bubble Mountain Missiles",
-        "Norfair Speedboost Missiles",
-        "Norfair Speed Booster",
-        "Norfair Wave Beam Missiles",
-        "Norfair Wave Beam",
-        "Norfair Golden Torizo Missiles",
-        "Norfair Golden Torizo Super Missiles",
-        "Norfair Mickey Mouse Missiles",
-        "Norfair Springball Maze Missiles",
-        "Norfair Lower Escape Power Bombs",
-        "Norfair Power Bombs of Shame",
-        "Norfair FrankerZ Missiles",
-        "Norfair Ridley Energy Tank",
-        "Norfair Screw Attack",
-        "Norfair Dark Room Energy Tank",
-        "Wrecked Ship Spooky Missiles",
-        "Wrecked Ship Reserve Tank",
-        "Wrecked Ship Bowling Missiles",
-        "Wrecked Ship Robot Missiles",
-        "Wrecked Ship Energy Tank",
-        "Wrecked Ship West Super Missiles",
-        "Wrecked Ship East Super Missiles",
-        "Wrecked Ship Gravity Suit",
-        "Maridia Main Street Missiles",
-        "Maridia Main Street Super Missiles",
-        "Maridia Turtle Energy Tank",
-        "Maridia Turtle Missiles",
-        "Maridia Watering Hole Super Missiles",
-        "Maridia Watering Hole Missiles",
-        "Maridia Pseudo-Spark Missiles",
-        "Maridia Plasma Beam",
-        "Maridia West Sandtrap Missiles",
-        "Maridia Reserve Tank",
-        "Maridia East Sandtrap Missiles",
-        "Maridia East Sandtrap Power Bombs",
-        "Maridia Aqueduct Missiles",
-        "Maridia Aqeuduct Super Misiles",
-        "Maridia Springball",
-        "Maridia Precious Missiles",
-        "Maridia Botwoon Energy Tank",
-        "Maridia Space Jump",
-    ]
-
-    regionToHexDict = {
-        "Crateria": "0000",
-        "Brinstar": "0100",
-        "Norfair": "0200",
-        "Wrecked Ship": "0300",
-        "Maridia": "0400",
-        "Tourian": "0500",
-        "Ceres Station": "0600",
+    # Region (area) index used by the game for each region.
+    regionToIndexDict = {
+        "Crateria": 0x0000,
+        "Brinstar": 0x0001,
+        "Norfair": 0x0002,
+        "Wrecked Ship": 0x0003,
+        "Maridia": 0x0004,
+        "Tourian": 0x0005,
+        "Ceres Station": 0x0006,
     }
 
+    # View of regionToIndexDict kept for existing callers, as the little endian hex of each region index.
+    regionToHexDict = {region: index.to_bytes(2, "little").hex().upper() for region, index in regionToIndexDict.items()}
+
     itemNameToQuantityName = {
         "Energy Tank": "Energy",
         "Missile Expansion": "Missiles",
@@ -757,15 +381,59 @@ class SuperMetroidConstants:
     # Address to current quantity of indicated type.
     # Max quantity is stored 2 bytes after current quantity in all cases.
     ammoItemAddresses = {
-        "Energy Tank": "F509C2",
-        "Missile Expansion": "F509C6",
-        "Super Missile Expansion": "F509CA",
-        "Power Bomb Expansion": "F509CE",
-        "Reserve Tank": "F509D4",
+        "Energy Tank": 0xF509C2,
+        "Missile Expansion": 0xF509C6,
+        "Super Missile Expansion": 0xF509CA,
+        "Power Bomb Expansion": 0xF509CE,
+        "Reserve Tank": 0xF509D4,
     }
 
     # What address we should look at to find equipment (from SNI's perspective, it's complicated)
-    toggleItemBaseAddress = "F509A2"
+    toggleItemBaseAddress = 0xF509A2
+    # Equipment, beams and ammo are stored together, from the equipment up to the end of reserve energy.
+    inventoryBaseAddress = 0xF509A2
+    inventorySize = 0x36
+
+    # Other addresses which are polled while the game is running.
+    # Frame counter, one word. Counts up once per frame the game runs.
+    frameCounterAddress = 0xF505B6
+    # Pointer to the header of the room Samus is in, one word. Changes on every room transition.
+    roomPointerAddress = 0xF5079B
+    # Map tiles explored in the current area, one bit per tile.
+    mapExploredAddress = 0xF507F7
+    mapExploredSize = 0x100
+    # Game state, one byte.
+    gameStateAddress = 0xF50998
+    # Function slot used to run our own routines in game, one word.
+    eventSlotAddress = 0xF50A42
+    # Copy of the location bitflags kept by our routines, one bit per pickup index.
+    locationBitflagsAddress = 0xF6FFD0
+    locationBitflagsSize = 32
+    # Record describing an item sent to this player by another player in the multiworld session.
+    # Read by our routine in bank 83, see the top of ROM_Patcher for its layout.
+    multiworldRecordAddress = 0xF6FF72
+    multiworldRecordSize = 0x10
+    # Ring buffer of items waiting to be shown to the player, see the top of ROM_Patcher for its layout.
+    # We advance the head after writing entries, and our routine in bank 83 advances the tail as it shows them.
+    multiworldItemRingAddress = 0xF6FF00
+    multiworldItemRingCapacity = 8
+    multiworldItemRingEntrySize = 10
+    multiworldItemRingHeadAddress = 0xF6FF50
+    multiworldItemRingTailAddress = 0xF6FF52
+    # Journal of locations checked, written by our pickup routine in bank 85. See the top of ROM_Patcher for its layout.
+    # The counter is one word, and each entry is the pickup index of a location checked, one byte.
+    locationJournalCounterAddress = 0xF6FF54
+    locationJournalAddress = 0xF6FF56
+    locationJournalCapacity = 16
+    # Address minus one of our routine in bank 83 which shows the items in the ring buffer.
+    multiworldItemRoutinePointer = 0xADFF
+
+    # Internal ROM header, as SNI addresses ROM (offsets into a headerless LoROM file).
+    # The title is 21 bytes at the start, and the checksum is the word at romChecksumOffset.
+    romHeaderAddress = 0x7FC0
+    romHeaderSize = 0x20
+    romTitleSize = 21
+    romChecksumOffset = 0x1E
 
     # Formatted offsets for where to read/write toggleable items.
     # Stored as a tuple.
@@ -793,106 +461,3 @@ class SuperMetroidConstants:
         "Morph Ball Bombs": (1, 4),
         "Gravity Suit": (0, 5),
     }
-
-    vanillaPickupList = [
-        "Power Bomb Expansion",
-        "Missile Expansion",
-        "Missile Expansion",
-        "Missile Expansion",
-        "Missile Expansion",
-        "Energy Tank",
-        "Missile Expansion",
-        "Morph Ball Bombs",
-        "Energy Tank",
-        "Missile Expansion",
-        "Missile Expansion",
-        "Super Missile Expansion",
-        "Missile Expansion",
-        "Power Bomb Expansion",
-        "Super Missile Expansion",
-        "Missile Expansion",
-        "Super Missile Expansion",
-        "Reserve Tank",
-        "Missile Expansion",
-        "Missile Expansion",
-        "Missile Expansion",
-        "Missile Expansion",
-        "Charge Beam",
-        "Power Bomb Expansion",
-        "Missile Expansion",
-        "Morph Ball",
-        "Power Bomb Expansion",
-        "Missile Expansion",
-        "Energy Tank",
-        "Energy Tank",
-        "Super Missile Expansion",
-        "Energy Tank",
-        "Missile Expansion",
-        "Energy Tank",
-        "Missile Expansion",
-        "Missile Expansion",
-        "X-Ray Scope",
-        "Power Bomb Expansion",
-        "Power Bomb Expansion",
-        "Missile Expansion",
-        "Spazer Beam",
-        "Energy Tank",
-        "Missile Expansion",
-        "Varia Suit",
-        "Missile Expansion",
-        "Ice Beam",
-        "Missile Expansion",
-        "Energy Tank",
-        "Hi-Jump Boots",
-        "Missile Expansion",
-        "Missile Expansion",
-        "Energy Tank",
-        "Power Bomb Expansion",
-        "Missile Expansion",
-        "Missile Expansion",
-        "Grapple Beam",
-        "Reserve Tank",
-        "Missile Expansion",
-        "Missile Expansion",
-        "Missile Expansion",
-        "Missile Expansion",
-        "Speed Booster",
-        "Missile Expansion",
-        "Wave Beam",
-        "Missile Expansion",
-        "Super Missile Expansion",
-        "Missile Expansion",
-        "Missile Expansion",
-        "Power Bomb Expansion",
-        "Power Bomb Expansion",
-        "Missile Expansion",
-        "Energy Tank",
-        "Screw Attack",
-        "Energy Tank",
-        "Missile Expansion",
-        "Reserve Tank",
-        "Missile Expansion",
-        "Missile Expansion",
-        "Energy Tank",
-        "Super Missile Expansion",
-        "Super Missile Expansion",
-        "Gravity Suit",
-        "Missile Expansion",
-        "Super Missile Expansion",
-        "Energy Tank",
-        "Missile Expansion",
-        "Super Missile Expansion",
-        "Missile Expansion",
-        "Missile Expansion",
-        "Plasma Beam",
-        "Missile Expansion",
-        "Reserve Tank",
-        "Missile Expansion",
-        "Power Bomb Expansion",
-        "Missile Expansion",
-        "Super Missile Expansion",
-        "Spring Ball",
-        "Missile Expansion",
-        "Energy Tank",
-        "Space Jump",
-    ]
@@ -23,168 +23,491 @@
 # Is significantly faster than the framerate of an SNES (and obviously blows the speed of a human's actions out of the water).
 # If interfacing is slower with physical devices there may be a need for further investigation.
 
-# TODO: Implement data sharing with this.
-# Some data from the launcher needs to be sent to the interface for it to function fully.
+# Some data from the patcher needs to be sent to the interface for it to function fully.
 # This includes:
 #   -Message Box Address Dict
 #   -Item Routine Address Dict
 #   -List of non-vanilla items in game
+# The patcher writes these to a symbol map next to the patched ROM, which is loaded with load_symbol_map.
 
-import json
-import os
+import asyncio
+import bisect
+import collections
+import struct
 import sys
 import threading
 import time
-
+from enum import Enum
+
+from SuperDuperMetroid.Binary_Utils import (
+    hex_to_data,
+    hex_to_int,
+    le_bytes_to_int,
+    pack_u16le,
+    read_u16le,
+)
+from SuperDuperMetroid.Event_Scheduler import EventScheduler, ScheduledEvent
+from SuperDuperMetroid.Frame_Clock import FrameClock
+from SuperDuperMetroid.RAM_Mirror import RamMirror
 from SuperDuperMetroid.SM_Constants import SuperMetroidConstants
-from websocket import create_connection
-
-
-# Converts a hexadecimal string to a base 10 integer.
-def hex_to_int(hex_to_convert):
-    return int(hex_to_convert, 16)
-
-
-# Converts an integer to a hexadecimal string.
-def int_to_hex(int_to_convert):
-    return (hex(int_to_convert)[2:]).upper()
-
-
-# Converts a hexadecimal string to binary data.
-def hex_to_data(hex_to_convert):
-    return bytes.fromhex(hex_to_convert)
-
-
-# Converts binary data to a hexadecimal string.
-def data_to_hex(data_to_convert):
-    return "".join("{:02x}".format(x) for x in data_to_convert).upper()
-
-
-# Reverses the endianness of a hexadecimal string.
-def reverse_endianness(hex_to_reverse):
-    assert (len(hex_to_reverse) % 2) == 0
-    hex_pairs = []
-    for i in range(len(hex_to_reverse) // 2):
-        hex_pairs.append(hex_to_reverse[2 * i] + hex_to_reverse[2 * i + 1])
-    reversed_hex_pairs = hex_pairs[::-1]
-    output_string = ""
-    for pair in reversed_hex_pairs:
-        output_string += pair
-    return output_string
+from SuperDuperMetroid.SNI_Metrics import SNIMetrics, measure_as
+from SuperDuperMetroid.Symbol_Map import SymbolMap, get_rom_identity
+from SuperDuperMetroid.SNI_Client import DEFAULT_SNI_ADDRESS, ROM_END_ADDRESS, SNIClient
+
+# Layout of the multiworld item record, eight little-endian words.
+MULTIWORLD_ITEM_RECORD_STRUCT = struct.Struct("<8H")
+# Layout of an entry in the multiworld item ring buffer, five little-endian words.
+MULTIWORLD_ITEM_ENTRY_STRUCT = struct.Struct("<5H")
+# Entries, head and tail of the multiworld item ring buffer, which are read together.
+MULTIWORLD_ITEM_RING_SIZE = (
+    SuperMetroidConstants.multiworldItemRingCapacity * SuperMetroidConstants.multiworldItemRingEntrySize + 4
+)
+
+# Regions of RAM kept by the RAM mirror.
+RAM_MIRROR_REGIONS = {
+    "Frame Counter": (SuperMetroidConstants.frameCounterAddress, 2),
+    "Current Room": (SuperMetroidConstants.roomPointerAddress, 2),
+    "Map Explored": (SuperMetroidConstants.mapExploredAddress, SuperMetroidConstants.mapExploredSize),
+    "Game State": (SuperMetroidConstants.gameStateAddress, 1),
+    "Inventory": (SuperMetroidConstants.inventoryBaseAddress, SuperMetroidConstants.inventorySize),
+    "Event Slot": (SuperMetroidConstants.eventSlotAddress, 2),
+    "Location Bitflags": (SuperMetroidConstants.locationBitflagsAddress, SuperMetroidConstants.locationBitflagsSize),
+    "Location Journal": (
+        SuperMetroidConstants.locationJournalCounterAddress,
+        2 + SuperMetroidConstants.locationJournalCapacity,
+    ),
+}
+
+# The location poller polls this often (in seconds) right after a check or a room change,
+# And backs off by LOCATION_POLL_BACKOFF each time nothing happens, up to LOCATION_POLL_MAX_INTERVAL.
+# The client's limiter stretches these on devices which are slow to answer or failing.
+LOCATION_POLL_MIN_INTERVAL = 0.25
+LOCATION_POLL_MAX_INTERVAL = 2.0
+LOCATION_POLL_BACKOFF = 1.5
+
+
+# Converts location bitflags to an integer, in which bit N is set if the location with pickup index N was checked.
+def location_bitflags_to_int(location_bitflags):
+    return le_bytes_to_int(location_bitflags)
+
+
+# Returns the (address, number of bytes) ranges holding location journal entries first_count up to count.
+# Entries wrap around the end of the journal, so there may be two ranges.
+def get_location_journal_ranges(first_count, count):
+    capacity = SuperMetroidConstants.locationJournalCapacity
+    start = first_count % capacity
+    num_entries = (count - first_count) & 0xFFFF
+    if start + num_entries <= capacity:
+        return [(SuperMetroidConstants.locationJournalAddress + start, num_entries)]
+    return [
+        (SuperMetroidConstants.locationJournalAddress + start, capacity - start),
+        (SuperMetroidConstants.locationJournalAddress, start + num_entries - capacity),
+    ]
+
+
+# Returns the indices of bits which are set in new_bitflags but not in old_bitflags, lowest first.
+def get_newly_set_bits(old_bitflags, new_bitflags):
+    newly_set = new_bitflags & ~old_bitflags
+    indices = []
+    while newly_set:
+        lowest_bit = newly_set & -newly_set
+        indices.append(lowest_bit.bit_length() - 1)
+        newly_set ^= lowest_bit
+    return indices
+
+
+class GameState(Enum):
+    TITLE_SCREEN = "Title Screen"
+    IN_MENU = "In Menu"
+    LOADING_AREA = "Loading a Area"
+    LOADING_SAVE = "Loading a Save Game"
+    INITIALIZING_FROM_SAVE = "Initializing from a Save Game"
+    IN_GAME = "In Game"
+    IN_ROOM_TRANSITION = "In Room Transition"
+    ON_ELEVATOR = "On Elevator"
+    PAUSING = "Pausing"
+    PAUSED = "Paused"
+    UNPAUSING = "Unpausing"
+    DEAD = "Dead"
+    IN_CUTSCENE = "In Cutscene"
+    WATCHING_DEMO = "Watching Demo"
+    STATUS_NOT_KNOWN = "Status Not Known"
+
+
+# Builds the table of game states, indexed by the game state value at $7E:0998.
+def build_game_state_table():
+    table = [GameState.STATUS_NOT_KNOWN] * 256
+    table[1] = GameState.TITLE_SCREEN
+    table[4] = GameState.IN_MENU
+    table[5] = GameState.LOADING_AREA
+    table[6] = GameState.LOADING_SAVE
+    table[7] = GameState.INITIALIZING_FROM_SAVE
+    table[8] = GameState.IN_GAME
+    table[9] = GameState.IN_ROOM_TRANSITION
+    table[10:12] = [GameState.ON_ELEVATOR] * 2
+    table[12:15] = [GameState.PAUSING] * 3
+    table[15] = GameState.PAUSED
+    table[16:21] = [GameState.UNPAUSING] * 5
+    table[21:27] = [GameState.DEAD] * 6
+    table[30:37] = [GameState.IN_CUTSCENE] * 7
+    table[42] = GameState.WATCHING_DEMO
+    return tuple(table)
+
+
+GAME_STATE_TABLE = build_game_state_table()
+
+# States in which the save is fully loaded, so RAM such as item counts can be trusted.
+# We could technically give players items while pausing,
+# But this causes the pickup box to show up on a pitch black screen once
+# The player unpauses.
+# This may be confusing as players will not be able to see it.
+LOADED_GAME_STATES = frozenset([GameState.IN_GAME, GameState.IN_ROOM_TRANSITION])
+
+# How long a PlayerState is trusted for, in seconds.
+# Predicates asked about the player within this long of each other all answer from the same read.
+PLAYER_STATE_MAX_AGE = 0.1
+
+
+# Converts the game state value at $7E:0998 to a string.
+def get_game_state_name(status):
+    return GAME_STATE_TABLE[status].value
+
+
+# What the player is doing, computed from a single read of the game state, the event slot and the frame counter.
+class PlayerState:
+    def __init__(self, game_state_value, event_slot, frame_counter=None):
+        self.game_state_value = game_state_value
+        self.game_state = GAME_STATE_TABLE[game_state_value]
+        self.event_slot = event_slot
+        # Frame counter at $7E:05B6, which tells us which frame the state was read in.
+        self.frame_counter = frame_counter
+        # Time (from time.monotonic) at which the state was read.
+        self.timestamp = time.monotonic()
+
+    def is_fresh(self):
+        return time.monotonic() - self.timestamp < PLAYER_STATE_MAX_AGE
 
-
-# Pads a hexadecimal string with 0's until it meets the provided length.
-def pad_hex(hex_to_pad, num_hex_characters):
-    return_hex = hex_to_pad
-    while len(return_hex) < num_hex_characters:
-        return_hex = "0" + return_hex
-    return return_hex
-
-
-class SuperMetroidInterface:
-    # These get imported dynamically from a JSON file created by the patcher.
-    # This is necessary because these may not always be in the same place every game.
-    itemRoutineDict = {
-        "Energy Tank": None,
-        "Missile Expansion": None,
-        "Super Missile Expansion": None,
-        "Power Bomb Expansion": None,
-        "Grapple Beam": None,
-        "X-Ray Scope": None,
-        "Varia Suit": None,
-        "Spring Ball": None,
-        "Morph Ball": None,
-        "Screw Attack": None,
-        "Hi-Jump Boots": None,
-        "Space Jump": None,
-        "Speed Booster": None,
-        "Charge Beam": None,
-        "Ice Beam": None,
-        "Wave Beam": None,
-        "Spazer Beam": None,
-        "Plasma Beam": None,
-        "Morph Ball Bombs": None,
-        "Reserve Tank": None,
-        "Gravity Suit": None,
-        "No Item": None,
-    }
-
-    # TODO: Find a clean way to send dynamically generated item list to interface from patcher, as multiworld will later involve dynamically adding items to the game, and these may be ordered differently for different players.
-    # TODO: Import ammo per item from the patcher
-
-    obtainedToggleItems = []
-    equippedToggleItems = []
-
-    ammoItemsHeldList = []
-    ammoItemCurrentCount = []
-    ammoItemMaximumCount = []
-
-    webSocket = None
-    # If true, player has booted game and connection has been initialized.
-    connectionInitialized = False
-    # True if SNI has successfully connected to an SNES-Like device.
-    connectedToDevice = False
-    # True if player's device has the game Super Metroid loaded,
-    # Or if we can't verify for sure that this is the case.
-    # Note that the SNES Classic can't tell us what game it's playing.
-    inSuperMetroid = False
     # True if player has started a save file. If this is false we can't expect to reliably read RAM.
-    gameLoaded = False
-    # True if player is playing Super Metroid and is in the standard gamestate.
-    # Player cannot be in a transition, the pause menu, a cutscene, the title screen, a demo, or anything else.
-    playingGame = False
-    # List of things about the device, such as device type, last known game, and system capabilities.
-    deviceInfo = None
+    def is_game_loaded(self):
+        return self.game_state in LOADED_GAME_STATES
 
-    lastLocationsCheckedBitflags = None
+    # True if player is in the standard gamestate.
+    # Player cannot be in a transition, the pause menu, a cutscene, the title screen, a demo, or anything else.
+    def is_in_gameplay(self):
+        return self.game_state == GameState.IN_GAME
+
+    # $FFF0 is the value used to redirect control flow to arbitrary functions.
+    # If this is the function slot's current value, we'd be writing over our own request.
+    def is_ready_for_event(self):
+        return self.is_in_gameplay() and self.event_slot != 0xFFF0
+
+
+# Reads current and maximum ammo counts out of the inventory block.
+# Returns a dict of item name to (current, maximum).
+def parse_ammo_counts(inventory_data):
+    ammo_counts = {}
+    for item_name, address in SuperMetroidConstants.ammoItemAddresses.items():
+        offset = address - SuperMetroidConstants.inventoryBaseAddress
+        current_ammo = read_u16le(inventory_data, offset)
+        maximum_ammo = read_u16le(inventory_data, offset + 2)
+        # Reserve energy is backwards, for some reason.
+        if item_name == "Reserve Tank":
+            current_ammo, maximum_ammo = maximum_ammo, current_ammo
+        ammo_counts[item_name] = (current_ammo, maximum_ammo)
+    return ammo_counts
+
+
+# Reads which toggle items have been obtained and equipped out of the inventory block.
+# Returns a list of obtained items and a list of equipped items.
+def parse_toggle_items(inventory_data):
+    obtained_items = []
+    equipped_items = []
+    for item_name, byte_bit_offset_pair in SuperMetroidConstants.toggleItemBitflagOffsets.items():
+        equipped_val = inventory_data[byte_bit_offset_pair[0]]
+        obtained_val = inventory_data[byte_bit_offset_pair[0] + 2]
+        bit_to_check = 1 << byte_bit_offset_pair[1]
+        if (obtained_val & bit_to_check) != 0:
+            obtained_items.append(item_name)
+        if (equipped_val & bit_to_check) != 0:
+            equipped_items.append(item_name)
+    return obtained_items, equipped_items
+
+
+# Builds a multiworld item ring buffer entry, the values our routine in bank 83 copies to $7F:FF76-$7F:FF7F
+# To show the item's message box and award it.
+def build_multiworld_item_entry(item_name, item_routine_address):
+    if item_routine_address is None:
+        raise ValueError(f"ERROR: The address of the pickup routine for item '{item_name}' is not known.")
+    # Header/footer.
+    # This is a standard item, so give the pointer to
+    # An empty header/footer of correct width.
+    # TODO: Import these dynamically from patcher.
+    width = "Small"
+    if item_name in SuperMetroidConstants.itemMessageWidths:
+        width = SuperMetroidConstants.itemMessageWidths[item_name]
+    header_footer = 0x8040 if width == "Small" else 0x8000
+
+    # Message box size, in bytes.
+    # Dictates height.
+    size = 0x0040
+    if item_name in SuperMetroidConstants.itemMessageNonstandardSizes:
+        size = SuperMetroidConstants.itemMessageNonstandardSizes[item_name]
+
+    entry = MULTIWORLD_ITEM_ENTRY_STRUCT.pack(
+        header_footer,
+        # Content.
+        # Different for each item - main message for an item pickup.
+        SuperMetroidConstants.itemMessageAddresses[item_name],
+        size,
+        # Message ID. Should be accurate if it can be helped.
+        SuperMetroidConstants.itemMessageIDs[item_name],
+        # Item Collection Routine.
+        # What we actually call on pickup.
+        item_routine_address,
+    )
+    assert len(entry) == SuperMetroidConstants.multiworldItemRingEntrySize
+    return entry
+
+
+# Builds the multiworld item record written to $7F:FF72-$7F:FF81 before our routine in bank 83 is started.
+# The item values are left empty, as the routine fills them in from the ring buffer.
+def build_multiworld_item_record(original_jump_destination):
+    record = MULTIWORLD_ITEM_RECORD_STRUCT.pack(
+        # The function to be called.
+        SuperMetroidConstants.multiworldItemRoutinePointer,
+        # The "Item Picked Up" word, set by the routine while it shows an item.
+        0x0000,
+        0x0000,
+        0x0000,
+        0x0000,
+        0x0000,
+        0x0000,
+        # The routine which was in the event slot, to jump to once we're done.
+        original_jump_destination,
+    )
+    assert len(record) == SuperMetroidConstants.multiworldRecordSize
+    return record
+
+
+# Returns the number of items in the ring buffer which the game hasn't shown yet.
+# Returns None if head and tail don't make sense together, as is the case before the ring buffer is first used.
+def get_item_ring_pending_count(head, tail):
+    pending_count = (head - tail) & 0xFFFF
+    if pending_count > SuperMetroidConstants.multiworldItemRingCapacity:
+        return None
+    return pending_count
+
+
+# Everything a tracker needs to know about the game, read in a single exchange with SNI.
+class GameSnapshot:
+    def __init__(self, game_state_value, event_slot, location_bitflags, inventory_data):
+        self.game_state_value = game_state_value
+        self.game_state = get_game_state_name(game_state_value)
+        self.event_slot = event_slot
+        # One bit per pickup index, least significant bit first.
+        self.location_bitflags = location_bitflags
+        self.inventory_data = inventory_data
+        self.ammo_counts = parse_ammo_counts(inventory_data)
+        self.obtained_toggle_items, self.equipped_toggle_items = parse_toggle_items(inventory_data)
+
+    # Returns true if the location with the given pickup index has been checked.
+    def is_location_checked(self, pickup_index):
+        return (self.location_bitflags[pickup_index // 8] >> (pickup_index % 8)) & 1 == 1
+
+
+# Copy of ROM contents already read, which don't change while the same ROM is running.
+# Ranges read are merged with any they overlap or touch, so later reads inside them are answered from here.
+class RomCache:
+    def __init__(self):
+        # (address, data) for each cached range, sorted by address, never overlapping or touching.
+        self.blocks = []
+        # Address of each block, for searching.
+        self.block_addresses = []
+        # (title, checksum) of the ROM the cached data belongs to, see get_rom_identity.
+        self.identity = None
+
+    def clear(self):
+        self.blocks = []
+        self.block_addresses = []
+        self.identity = None
+
+    # Returns the cached bytes, or None if any of them aren't cached.
+    def read(self, address, num_bytes):
+        index = bisect.bisect_right(self.block_addresses, address) - 1
+        if index < 0:
+            return None
+        block_address, block_data = self.blocks[index]
+        if address + num_bytes > block_address + len(block_data):
+            return None
+        return block_data[address - block_address : address - block_address + num_bytes]
+
+    def store(self, address, data):
+        new_data = bytearray(data)
+        end = address + len(new_data)
+        kept_blocks = []
+        for block_address, block_data in self.blocks:
+            block_end = block_address + len(block_data)
+            if block_end < address or block_address > end:
+                kept_blocks.append((block_address, block_data))
+                continue
+            # Merge with this block, keeping the data just read where they overlap.
+            if block_address < address:
+                new_data[0:0] = block_data[: address - block_address]
+                address = block_address
+            if block_end > end:
+                new_data += block_data[end - block_address :]
+                end = block_end
+        kept_blocks.append((address, bytes(new_data)))
+        kept_blocks.sort(key=lambda block: block[0])
+        self.blocks = kept_blocks
+        self.block_addresses = [block_address for block_address, block_data in kept_blocks]
+
+
+# Asynchronous interface to the game.
+# All reads and writes go through one SNIClient, and location polling and
+# In-game events run as tasks on the event loop this interface was created in.
+class AsyncSuperMetroidInterface:
+    def __init__(self, client=None):
+        # These get imported dynamically from the symbol map created by the patcher, see load_symbol_map.
+        # This is necessary because these may not always be in the same place every game.
+        self.itemRoutineDict = {
+            "Energy Tank": None,
+            "Missile Expansion": None,
+            "Super Missile Expansion": None,
+            "Power Bomb Expansion": None,
+            "Grapple Beam": None,
+            "X-Ray Scope": None,
+            "Varia Suit": None,
+            "Spring Ball": None,
+            "Morph Ball": None,
+            "Screw Attack": None,
+            "Hi-Jump Boots": None,
+            "Space Jump": None,
+            "Speed Booster": None,
+            "Charge Beam": None,
+            "Ice Beam": None,
+            "Wave Beam": None,
+            "Spazer Beam": None,
+            "Plasma Beam": None,
+            "Morph Ball Bombs": None,
+            "Reserve Tank": None,
+            "Gravity Suit": None,
+            "No Item": None,
+        }
+
+        # TODO: Find a clean way to send dynamically generated item list to interface from patcher, as multiworld will later involve dynamically adding items to the game, and these may be ordered differently for different players.
+        # TODO: Import ammo per item from the patcher
+
+        self.obtainedToggleItems = []
+        self.equippedToggleItems = []
+
+        self.ammoItemsHeldList = []
+        self.ammoItemCurrentCount = []
+        self.ammoItemMaximumCount = []
+
+        if client is None:
+            client = SNIClient()
+        self.client = client
+        # Name of the device attached to, as SNI lists it.
+        self.deviceName = None
+        # True if player's device has the game Super Metroid loaded,
+        # Or if we can't verify for sure that this is the case.
+        # Note that the SNES Classic can't tell us what game it's playing.
+        self.inSuperMetroid = False
+        # True if player has started a save file. If this is false we can't expect to reliably read RAM.
+        self.gameLoaded = False
+        # True if player is playing Super Metroid and is in the standard gamestate.
+        # Player cannot be in a transition, the pause menu, a cutscene, the title screen, a demo, or anything else.
+        self.playingGame = False
+        # The last PlayerState read, reused by every question about the player while it's fresh.
+        self.playerState = None
+
+        self.lastLocationsCheckedBitflags = None
+        # Location journal counter at the last poll.
+        self.lastLocationJournalCount = None
+        # Current time between location polls, in seconds.
+        self.locationPollInterval = LOCATION_POLL_MIN_INTERVAL
+
+        # When running, queries about the game are answered from this instead of the device.
+        self.ramMirror = RamMirror(self.client, RAM_MIRROR_REGIONS, frame_counter_region="Frame Counter")
+
+        # When the game starts each frame, learned from every read of the frame counter.
+        self.frameClock = FrameClock()
+
+        # Held while an in-game event is being run.
+        self.lock = asyncio.Lock()
+        # Runs in-game events once the player is ready for them.
+        # Readiness checks read the frame counter, so retries are counted in frames.
+        self.eventScheduler = EventScheduler(
+            self.is_player_ready_for_event, self.lock, limiter=self.client.limiter, frame_clock=self.frameClock
+        )
+        # (item name, ScheduledEvent) for each item to be shown to the player, waiting for room in the ring buffer.
+        # Each item has an event of its own, so it can be cancelled or expire without holding up the others.
+        self.queuedItemDeliveries = collections.deque()
+        self.pollLocationChecksTask = None
+
+        # Symbol map of the ROM being played, if one has been loaded.
+        self.symbolMap = None
+
+        # ROM contents read so far. Cleared when attaching to a device, or when the ROM's header changes.
+        self.romCache = RomCache()
+        # device_info_timestamp of the client when the ROM header was last checked against the cache.
+        self.romCacheCheckTimestamp = None
 
-    lock = threading.Lock()
-    inGameInvokeEventThread = None
-    pollLocationChecksThread = None
-    # Format of a queued event:
-    # Will check to see if args or kwargs are not present, will omit them if this is the case.
-    # Note that you should still have three elements in the base list, as it will naiively index it.
-    # Just set unused things to be either empty or None
-    # [function, [arg1, arg2, ...], {kw1 : kwarg1, kw2 : kwarg2, ...}]
-    queued_events = []
+    # True if SNI has successfully connected to an SNES-Like device.
+    @property
+    def connectedToDevice(self):
+        return self.client.is_device_info_fresh()
 
-    # Small routines used to wrap simple operations for readability.
+    # List of things about the device, such as device type, last known game, and system capabilities.
+    @property
+    def deviceInfo(self):
+        return self.client.device_info
 
     # These methods are used to directly interface with the game.
     # They will be called by higher-level code.
-    def initialize_connection(self):
+    async def initialize_connection(self, address=DEFAULT_SNI_ADDRESS):
         try:
-            self.webSocket = create_connection("ws://localhost:8080")
+            await self.client.connect(address)
             print("Connection made with SNI successfully.")
-            self.connectionInitialized = True
         except Exception:
             print("ERROR: Could not connect to SNI.")
 
-    # After connecting to SNI, get list of devices and connect to the first.
-    def connect_to_device(self):
-        if self.connectionInitialized:
+    # After connecting to SNI, get list of devices and connect to one of them.
+    # device is the name of a device, or its index in SNI's device list. If None, connect to the first.
+    # Returns the name of the device connected to.
+    # If symbol_map_path is given, the patcher's symbol map for the ROM being played is loaded from it.
+    async def connect_to_device(self, device=None, symbol_map_path=None):
+        if self.client.is_connected():
             # Get devices.
-            json_get_devices_command = {"Opcode": "DeviceList", "Space": "SNES"}
-
-            self.webSocket.send(json.dumps(json_get_devices_command))
-            result = self.webSocket.recv()
-            result = (json.loads(result))["Results"]
+            result = await self.client.device_list()
             if len(result) == 0:
                 raise ConnectionError("ERROR: No devices were found by SNI. Could not link to any device.")
-            if len(result) > 1:
-                print("WARNING: More than one devices have been listed by SNI. Device list is as follows:")
-                for i, device in enumerate(result):
-                    print(f"\tDevice {str(i)}: {device}")
-                print("The Super Metroid interface will default to connecting to the first device listed.\n")
-
-            # Connect to first device.
-            device_to_connect_to = [result[0]]
-            json_attach_to_device_command = {"Opcode": "Attach", "Space": "SNES", "Operands": device_to_connect_to}
-            self.webSocket.send(json.dumps(json_attach_to_device_command))
-            self.verify_connected_to_device()
+            if device is None:
+                if len(result) > 1:
+                    print("WARNING: More than one devices have been listed by SNI. Device list is as follows:")
+                    for i, listed_device in enumerate(result):
+                        print(f"\tDevice {str(i)}: {listed_device}")
+                    print("The Super Metroid interface will default to connecting to the first device listed.\n")
+                device = result[0]
+            elif isinstance(device, int):
+                if not 0 <= device < len(result):
+                    raise ValueError(f"ERROR: There is no device {device}, as SNI has listed {len(result)} devices.")
+                device = result[device]
+            elif device not in result:
+                raise ValueError(f"ERROR: Device '{device}' was not found by SNI.")
+
+            await self.client.attach(device)
+            self.deviceName = device
+            self.romCache.clear()
+            self.romCacheCheckTimestamp = None
+            self.frameClock.clear()
+            if symbol_map_path is not None:
+                self.load_symbol_map(symbol_map_path)
             self.print_device_info()
             if self.connectedToDevice:
                 print("Successfully connected to device.")
+            return device
         else:
             raise ConnectionError(
                 "ERROR: An attempt was made to connect to a device, but no connection has been made with SNI."
@@ -195,78 +518,189 @@ class SuperMetroidInterface:
         for info in self.deviceInfo:
             print("\t" + info)
 
-    # Get data at the specified address.
+    # Get data at the specified address, as bytes.
     # If checkRomRead = True, check whether the read being requested would read from ROM.
     # If it would, check to see whether the system being used allows it.
     # If it doesn't, refuse to read it, throw error.
-    def get_data(self, address, num_bytes, check_rom_read=True):
-        self.verify_connected_to_device()
-        if self.connectedToDevice:
-            if hex_to_int(address) < hex_to_int("F50000") and check_rom_read:
-                if "NO_ROM_READ" in self.deviceInfo:
-                    raise PermissionError(
-                        f"ERROR: An attempt was made to read from ROM, but this operation is not supported for device of type '{self.deviceInfo[0]}'."
-                    )
-            json_read_data_from_address_command = {
-                "Opcode": "GetAddress",
-                "Space": "SNES",
-                "Operands": [address, int_to_hex(num_bytes)],
-            }
-            self.webSocket.send(json.dumps(json_read_data_from_address_command))
-            result = self.webSocket.recv()
-            result = data_to_hex(result)
-            # print(f"Read from address {address} was successful.")
-            return result
+    # Addresses are ints, hex strings (ex. "F50998") are accepted for backwards compatibility.
+    # Reads from ROM are answered from the ROM cache when possible, see read_rom.
+    async def get_data(self, address, num_bytes, check_rom_read=True):
+        if isinstance(address, str):
+            address = hex_to_int(address)
+        if check_rom_read and address + num_bytes <= ROM_END_ADDRESS:
+            return await self.read_rom(address, num_bytes)
+        return await self.client.read(address, num_bytes, check_rom_read)
+
+    # Get data at several addresses at once.
+    # Takes a list of (address, number of bytes) pairs, and returns a list with the bytes read from each.
+    async def read_many(self, ranges, check_rom_read=True):
+        return await self.client.read_many(ranges, check_rom_read)
+
+    async def read(self, address, num_bytes, check_rom_read=True):
+        return await self.client.read(address, num_bytes, check_rom_read)
+
+    # Read from ROM, only going to the device for bytes which haven't been read before.
+    # Whenever device info has been refreshed, the ROM header is read again to make sure the ROM is the same one,
+    # And the cache is cleared if it isn't.
+    # Devices which can't read ROM are answered from a ROM file loaded with load_rom_file, if there is one,
+    # Or else from the loaded symbol map, which can work out the item tables the patcher fills in.
+    async def read_rom(self, address, num_bytes):
+        if address + num_bytes > ROM_END_ADDRESS:
+            raise ValueError(
+                f"ERROR: Cannot read {num_bytes} bytes at {address:X} from ROM, as they are not all in ROM."
+            )
+        device_info = await self.client.info()
+        if "NO_ROM_READ" in device_info:
+            data = self.romCache.read(address, num_bytes)
+            if data is None and self.symbolMap is not None:
+                data = self.symbolMap.read_rom(address, num_bytes)
+            if data is None:
+                raise PermissionError(
+                    f"ERROR: An attempt was made to read from ROM, but this operation is not supported for device of type '{device_info[0]}', and neither a ROM file nor a symbol map which covers the read has been loaded to read from instead."
+                )
+            return data
+        await self.__check_rom_cache()
+        data = self.romCache.read(address, num_bytes)
+        if data is None:
+            data = await self.read(address, num_bytes)
+            self.romCache.store(address, data)
+        return data
+
+    async def __check_rom_cache(self):
+        device_info_timestamp = self.client.device_info_timestamp
+        if device_info_timestamp is not None and device_info_timestamp == self.romCacheCheckTimestamp:
+            return
+        header_data = await self.read(SuperMetroidConstants.romHeaderAddress, SuperMetroidConstants.romHeaderSize)
+        identity = get_rom_identity(header_data)
+        if self.symbolMap is not None and identity != self.symbolMap.rom_identity:
+            print(
+                f"WARNING: The ROM being played ('{identity[0]}', checksum {identity[1]:04X}) is not the one the loaded symbol map was written for ('{self.symbolMap.rom_title}', checksum {self.symbolMap.rom_checksum:04X})."
+            )
+        if identity != self.romCache.identity:
+            if self.romCache.identity is not None:
+                print("ROM has changed since it was last read from. Clearing cached ROM data...")
+            self.romCache.clear()
+            self.romCache.identity = identity
+            self.romCache.store(SuperMetroidConstants.romHeaderAddress, header_data)
+        self.romCacheCheckTimestamp = device_info_timestamp
+
+    # Load the symbol map written by the patcher next to the patched ROM, see Symbol_Map.
+    # Item routine addresses are taken from it, so items can be sent without reading anything from the device.
+    # Returns the SymbolMap.
+    def load_symbol_map(self, path):
+        symbol_map = SymbolMap.load(path)
+        for item_name in self.itemRoutineDict:
+            self.itemRoutineDict[item_name] = symbol_map.get_item_routine_address(item_name)
+        self.symbolMap = symbol_map
+        return symbol_map
+
+    # Fill the ROM cache from a headerless ROM file, such as the one written by the patcher.
+    # ROM reads are then answered from it, as long as the device is running the same ROM.
+    # Devices which can't read ROM use it without checking.
+    def load_rom_file(self, path):
+        with open(path, "rb") as rom_file:
+            rom_data = rom_file.read()
+        header_data = rom_data[
+            SuperMetroidConstants.romHeaderAddress : SuperMetroidConstants.romHeaderAddress
+            + SuperMetroidConstants.romHeaderSize
+        ]
+        self.romCache.clear()
+        self.romCache.identity = get_rom_identity(header_data)
+        self.romCache.store(0, rom_data)
+
+    # Reads from the RAM mirror if it is running and covers the range, otherwise from the device.
+    # Only for questions about the game. Anything we're about to write back should be read from the device.
+    async def read_mirrored(self, address, num_bytes):
+        if self.ramMirror.is_running():
+            data = self.ramMirror.read(address, num_bytes)
+            if data is not None:
+                return data
+        return await self.read(address, num_bytes)
+
+    # Reads the frame counter, from the RAM mirror if it is running, and tells the frame clock when it was read.
+    # Meant to be gathered with other reads, so the frame they were read in is known.
+    async def __read_frame_counter(self):
+        mirrored_data = None
+        if self.ramMirror.is_running():
+            mirrored_data = self.ramMirror.read(SuperMetroidConstants.frameCounterAddress, 2)
+        if mirrored_data is not None:
+            frame_counter = read_u16le(mirrored_data)
+            received_time = self.ramMirror.refresh_time
         else:
-            raise ConnectionError("ERROR: Connection was not initialized properly before attempting to get data.")
-
-    # Write data to the specified address.
+            frame_counter = await self.read_u16le(SuperMetroidConstants.frameCounterAddress)
+            received_time = time.monotonic()
+        self.frameClock.observe(frame_counter, received_time, self.client.limiter.smoothed_rtt)
+        return frame_counter
+
+    # Keep a copy of the RAM regions we ask questions about, refreshed every interval seconds.
+    # Watchers can be added with ramMirror.watch.
+    async def start_ram_mirror(self, interval=0.1):
+        self.ramMirror.interval = interval
+        with measure_as("RAM Mirror"):
+            await self.ramMirror.refresh()
+            self.ramMirror.start()
+
+    async def stop_ram_mirror(self):
+        self.ramMirror.stop()
+
+    async def write(self, address, data, check_rom_write=True):
+        await self.client.write(address, data, check_rom_write)
+        self.ramMirror.apply_write(address, data)
+        # We may have just changed the event slot.
+        self.playerState = None
+
+    # Typed reads and writes of single values, little endian like the SNES.
+    async def read_u8(self, address):
+        return (await self.read(address, 1))[0]
+
+    async def read_u16le(self, address):
+        return read_u16le(await self.read(address, 2))
+
+    async def write_u8(self, address, value):
+        await self.write(address, bytes((value,)))
+
+    async def write_u16le(self, address, value):
+        await self.write(address, pack_u16le(value))
+
+    # Read game state, the event slot, location bitflags and inventory in a single exchange,
+    # Or from the RAM mirror if it is running.
+    # Returns a GameSnapshot.
+    async def snapshot(self):
+        game_state, event_slot, location_bitflags, inventory_data = await asyncio.gather(
+            self.read_mirrored(SuperMetroidConstants.gameStateAddress, 1),
+            self.read_mirrored(SuperMetroidConstants.eventSlotAddress, 2),
+            self.read_mirrored(
+                SuperMetroidConstants.locationBitflagsAddress, SuperMetroidConstants.locationBitflagsSize
+            ),
+            self.read_mirrored(SuperMetroidConstants.inventoryBaseAddress, SuperMetroidConstants.inventorySize),
+        )
+        return GameSnapshot(game_state[0], read_u16le(event_slot), location_bitflags, inventory_data)
+
+    # Write data, given as bytes, to the specified address.
+    # Hexadecimal strings are accepted for backwards compatibility.
     # If checkRomWrite = True, check whether the write being requested would write to ROM.
     # If it would, check to see whether the system being used allows it.
     # If it doesn't, refuse to write it, throw error.
-    def set_data(self, address, hex_data, check_rom_write=True):
-        self.verify_connected_to_device()
-        if self.connectedToDevice:
-            if hex_to_int(address) < hex_to_int("F50000") and check_rom_write:
-                if "NO_ROM_WRITE" in self.deviceInfo:
-                    raise PermissionError(
-                        f"ERROR: An attempt was made to write to ROM, but this operation is not supported for device of type '{self.deviceInfo[0]}'."
-                    )
-                    return None
-            # Send Put Data Opcode
-            num_bytes = len(hex_data) // 2
-            json_read_data_from_address_command = {
-                "Opcode": "PutAddress",
-                "Space": "SNES",
-                "Operands": [address, int_to_hex(num_bytes)],
-            }
-            self.webSocket.send(json.dumps(json_read_data_from_address_command))
-            # Send Data
-            self.webSocket.send(hex_to_data(hex_data))
-            # print(f"Write to address {address} was successful.")
-        else:
-            raise ConnectionError(
-                "ERROR: Connection was not initialized properly before attempting to set data. Ignoring request..."
-            )
+    async def set_data(self, address, data, check_rom_write=True):
+        if isinstance(data, str):
+            data = hex_to_data(data)
+        await self.write(address, data, check_rom_write)
 
     # Checks for an overflow, and corrects it if one has occurred.
     # Used to check values before we alter them.
+    # Returns the amount which can be added without going below 0 or above the largest num_bytes value.
     @staticmethod
     def check_value_overflow(current_value, amount_to_add, num_bytes=2):
-        corrected_amount_to_add = amount_to_add
-        if current_value + amount_to_add < 0:
-            corrected_amount_to_add += current_value + amount_to_add
-        elif current_value + amount_to_add > ((2 ^ (num_bytes * 8)) - 1):
-            corrected_amount_to_add = ((2 ^ (num_bytes * 8)) - 1) - current_value
-        return corrected_amount_to_add
+        max_value = (1 << (num_bytes * 8)) - 1
+        return min(max(current_value + amount_to_add, 0), max_value) - current_value
 
     # Checks memory at a specific address to see if item value has overflown, corrects it if it has.
     # Used to check values after we rely on a game routine to change them.
     # This is really more of a failsafe in case people set absurd values for expansion amounts, but it won't work in singleplayer.
     # if bigToSmall is true, we're looking to see if a value has ended up smaller than it was initially. Otherwise, we're looking for the opposite.
     # Run after a small delay to allow the SNES to perform the operation.
-    def __check_value_at_address_overflow(self, address, last_value, item_name, big_to_small=True, num_bytes=2):
-        current_value = HexToInt(self.get_data(address))
+    async def __check_value_at_address_overflow(self, address, last_value, item_name, big_to_small=True, num_bytes=2):
+        current_value = le_bytes_to_int(await self.read(address, num_bytes))
         if current_value == last_value:
             print(
                 f"CAUTION: Value of '{item_name}' has not updated by the time it could be checked - it is possible the CPU hasn't had time to change it, or the game state may have changed."
@@ -276,12 +710,12 @@ class SuperMetroidInterface:
             print(
                 f"WARNING: Value of '{item_name}' has overflowed because it became too big. This may be due to very large values being used for this item's reward amount. Setting its value to the maximum possible..."
             )
-            self.set_data("FF" * num_bytes, address)
+            await self.write(address, b"\xff" * num_bytes)
         elif not big_to_small and current_value > last_value:
             print(
                 f"WARNING: Value of '{item_name}' has overflowed because it became too small. This may be due to negative values being used for this item's reward amount. Setting its value to 0..."
             )
-            self.set_data("00" * num_bytes, address)
+            await self.write(address, bytes(num_bytes))
 
     # Receive an item and display a message.
     # Works for all item types.
@@ -290,159 +724,235 @@ class SuperMetroidInterface:
     # If showMessage is false, this will be done without displaying a message for player.
     # Note that this will automatically equip equipment items (will not equip Spazer and Plasma simultaneously)
     # Also note that this does not error out if player is not in game. We record entries to our queue even in menus.
-    # It is the job of the inGameInvokeEventThread to check whether the state is correct before giving out the items.
-    def receive_item(self, item_name, sender, show_message=True):
+    # It is the job of the eventScheduler to check whether the state is correct before giving out the items.
+    # Items shown with a message are written to the ring buffer in batches, and the game shows them one after another.
+    # Silent ammo grants still waiting to be run are merged, so several expansions are given in one go.
+    # If timeout is given, the item is dropped if it can't be given within that many seconds.
+    # Returns the ScheduledEvent, which can be cancelled, or awaited through its future.
+    # For items shown with a message, the future is resolved once the item is in the ring buffer.
+    async def receive_item(self, item_name, sender, show_message=True, timeout=None):
         if item_name in SuperMetroidConstants.itemList:
-            # Lock this part to prevent overlapping with the event handling thread.
             print("Trying to queue Receive Item Event...")
-            self.lock.acquire()
-            try:
-                self.queued_events.append((self.__receive_item_internal, [item_name, sender, show_message], {}))
-                if self.inGameInvokeEventThread is None or not self.inGameInvokeEventThread.is_alive():
-                    self.inGameInvokeEventThread = threading.Thread(target=self.__invoke_in_game_events)
-                    self.inGameInvokeEventThread.daemon = True
-                    self.inGameInvokeEventThread.start()
-                print("Receive Item Event queued successfully!")
-            finally:
-                self.lock.release()
+            with measure_as("Delivery"):
+                event = self.__schedule_item_delivery(item_name, show_message, timeout)
+            if event is None:
+                # Nothing to give.
+                return None
+            print("Receive Item Event queued successfully!")
+            return event
         else:
             raise ValueError(
                 f"ERROR: Super Metroid player was sent item '{item_name}', which is not known to be a valid Super Metroid item."
             )
 
-    def start_polling_game_for_checks(self):
-        if self.pollLocationChecksThread is None or not self.pollLocationChecksThread.is_alive():
+    # The event scheduler's worker is started by the first event scheduled,
+    # So requests made while running events are counted as item delivery in metrics.
+    def __schedule_item_delivery(self, item_name, show_message, timeout):
+        if show_message:
+            deadline = None if timeout is None else time.monotonic() + timeout
+            event = ScheduledEvent(self.__deliver_queued_items, deadline=deadline)
+            self.queuedItemDeliveries.append((item_name, event))
+            # Shared by every queued item, so it has no deadline of its own.
+            self.eventScheduler.schedule(
+                self.__deliver_queued_items,
+                coalesce_key="Deliver Items",
+                amount=1,
+                is_ready=self.__is_ready_for_item_delivery,
+            )
+            return event
+        if item_name in SuperMetroidConstants.ammoItemList:
+            return self.eventScheduler.schedule(
+                self.increment_item,
+                [item_name],
+                timeout=timeout,
+                coalesce_key=("Increment Item", item_name),
+                amount=SuperMetroidConstants.defaultAmmoItemToQuantity[item_name],
+            )
+        if item_name in SuperMetroidConstants.toggleItemList:
+            return self.eventScheduler.schedule(self.give_toggle_item, [item_name], timeout=timeout)
+        return None
+
+    async def start_polling_game_for_checks(self):
+        if self.pollLocationChecksTask is None or self.pollLocationChecksTask.done():
             # This data can be junk so we take care to set this before we start polling.
             # That way we only update once everything is actually cleared.
             # TODO: Modify code so a flag is set once we know this memory is good.
-            self.lastLocationsCheckedBitflags = bin(hex_to_int(self.get_data("F6FFD0", 32)))[2:].zfill(256)
-            self.pollLocationChecksThread = threading.Thread(target=self.__poll_game_for_checks)
-            self.pollLocationChecksThread.daemon = True
-            self.pollLocationChecksThread.start()
+            with measure_as("Poller"):
+                self.lastLocationsCheckedBitflags, self.lastLocationJournalCount = await asyncio.gather(
+                    self.__read_location_bitflags(), self.__read_location_journal_count()
+                )
+                self.pollLocationChecksTask = asyncio.ensure_future(self.__poll_game_for_checks())
             print("Started polling for location checks...")
 
-    # Poll the game to see
-    def __poll_game_for_checks(self):
-        # TODO: I'm sure there's better syntax for doing this sort of thing.
-        timeout = 1.4
+    # Location bitflags as an integer, see location_bitflags_to_int.
+    async def __read_location_bitflags(self):
+        bitflag_data = await self.read_mirrored(
+            SuperMetroidConstants.locationBitflagsAddress, SuperMetroidConstants.locationBitflagsSize
+        )
+        return location_bitflags_to_int(bitflag_data)
+
+    # Number of locations the game has written to the location journal, ever.
+    async def __read_location_journal_count(self):
+        return read_u16le(await self.read_mirrored(SuperMetroidConstants.locationJournalCounterAddress, 2))
+
+    # Returns the pickup indices of the locations checked since the last poll, in the order they were checked.
+    # Only the new journal entries are read, unless the journal has wrapped around since the last poll,
+    # In which case the location bitflags are compared instead and the order is lost.
+    async def __read_new_location_checks(self, journal_count):
+        num_new_entries = (journal_count - self.lastLocationJournalCount) & 0xFFFF
+        if num_new_entries == 0:
+            return []
+        if num_new_entries <= SuperMetroidConstants.locationJournalCapacity:
+            entry_data = await asyncio.gather(
+                *[
+                    self.read_mirrored(address, num_bytes)
+                    for address, num_bytes in get_location_journal_ranges(self.lastLocationJournalCount, journal_count)
+                ]
+            )
+            newly_checked = [index for data in entry_data for index in data]
+            for index in newly_checked:
+                self.lastLocationsCheckedBitflags |= 1 << index
+            return newly_checked
+        bitflags = await self.__read_location_bitflags()
+        newly_checked = get_newly_set_bits(self.lastLocationsCheckedBitflags, bitflags)
+        self.lastLocationsCheckedBitflags = bitflags
+        return newly_checked
+
+    # Poll the game to see which locations have been checked since the last poll.
+    # Polls quickly right after a check or a room change, when another check is most likely,
+    # And backs off while nothing is happening.
+    async def __poll_game_for_checks(self):
+        self.locationPollInterval = LOCATION_POLL_MIN_INTERVAL
+        last_room = None
         while True:
-            bitflags = bin(hex_to_int(self.get_data("F6FFD0", 32)))[2:].zfill(256)
-            time.sleep(timeout)
-            if bitflags != self.lastLocationsCheckedBitflags:
-                # Convert to a binary string so we can easily check flags
-                for index, location_bit in enumerate(bitflags):
-                    if location_bit == "1":
-                        if self.lastLocationsCheckedBitflags is None or self.lastLocationsCheckedBitflags[index] == "0":
-                            # It is necessary to reverse the bit order per byte for calculating our index,
-                            # As the most significant bit comes first in the string and would,
-                            # Without this treatment,
-                            # Act as though it were the least significant bit.
-                            true_index = (index // 8) * 8 + -((index % 8) - 7)
-                            print(
-                                f"Samus Checked Location {SuperMetroidConstants.bitflagIndexToLocationNameDict[true_index]}"
-                            )
-                self.lastLocationsCheckedBitflags = bitflags
-
-    # Run on its own thread.
-    # Polls the game to see when it's ready,
-    # Then executes events in-game.
-    def __invoke_in_game_events(self):
-        self.lock.acquire()
+            await asyncio.sleep(self.client.limiter.get_retry_delay(self.locationPollInterval))
+            # Both reads go out in the same request, or come from the RAM mirror.
+            journal_count, room = await asyncio.gather(
+                self.__read_location_journal_count(),
+                self.read_mirrored(SuperMetroidConstants.roomPointerAddress, 2),
+            )
+            newly_checked = await self.__read_new_location_checks(journal_count)
+            self.lastLocationJournalCount = journal_count
+            for index in newly_checked:
+                location = SuperMetroidConstants.locationByBitflagIndex[index]
+                location_name = location.name if location is not None else f"with unknown index {index}"
+                print(f"Samus Checked Location {location_name}")
+            if newly_checked or (last_room is not None and room != last_room):
+                self.locationPollInterval = LOCATION_POLL_MIN_INTERVAL
+            else:
+                self.locationPollInterval = min(
+                    self.locationPollInterval * LOCATION_POLL_BACKOFF, LOCATION_POLL_MAX_INTERVAL
+                )
+            last_room = room
+
+    # Reads the multiworld item ring buffer, and the event slot.
+    # Returns the entries as bytes, the head, the tail and the event slot.
+    # The frame counter is read along with them, to keep the frame clock up to date.
+    async def __read_item_ring(self):
+        ring_data, event_slot, frame_counter = await asyncio.gather(
+            self.read(SuperMetroidConstants.multiworldItemRingAddress, MULTIWORLD_ITEM_RING_SIZE),
+            self.read(SuperMetroidConstants.eventSlotAddress, 2),
+            self.__read_frame_counter(),
+        )
+        head_offset = (
+            SuperMetroidConstants.multiworldItemRingHeadAddress - SuperMetroidConstants.multiworldItemRingAddress
+        )
+        tail_offset = (
+            SuperMetroidConstants.multiworldItemRingTailAddress - SuperMetroidConstants.multiworldItemRingAddress
+        )
+        return (
+            ring_data[:head_offset],
+            read_u16le(ring_data, head_offset),
+            read_u16le(ring_data, tail_offset),
+            read_u16le(event_slot),
+        )
+
+    # Drops queued items which were cancelled, or couldn't be put in the ring buffer before their deadline.
+    def __drop_stale_item_deliveries(self):
+        now = time.monotonic()
+        for delivery in [
+            delivery for delivery in self.queuedItemDeliveries if delivery[1].cancelled or delivery[1].is_expired(now)
+        ]:
+            item_name, event = delivery
+            self.queuedItemDeliveries.remove(delivery)
+            if not event.cancelled and not event.future.done():
+                print(f"WARNING: Dropping delivery of {item_name}, as it could not be made before its deadline.")
+            event.drop()
+
+    # Item delivery can go ahead while the player is in game, and either there is room in the ring buffer
+    # For queued items, or the game has to be told to show what's in it.
+    # Also true once everything has been delivered, so the delivery event can finish.
+    # The game state is read from the device, not the RAM mirror, since a stale copy could let the trigger
+    # Be written during a door transition or in the pause menu.
+    async def __is_ready_for_item_delivery(self):
+        self.__drop_stale_item_deliveries()
+        game_state, (entries, head, tail, event_slot) = await asyncio.gather(
+            self.read(SuperMetroidConstants.gameStateAddress, 1), self.__read_item_ring()
+        )
+        pending_count = get_item_ring_pending_count(head, tail)
+        if pending_count is None:
+            pending_count = 0
+        if pending_count == 0 and not self.queuedItemDeliveries:
+            return True
+        if GAME_STATE_TABLE[game_state[0]] != GameState.IN_GAME:
+            return False
+        has_room = pending_count < SuperMetroidConstants.multiworldItemRingCapacity and self.queuedItemDeliveries
+        needs_start = pending_count > 0 and event_slot != 0xFFF0
+        return bool(has_room or needs_start)
+
+    # Writes as many queued items as fit into the ring buffer with a single write,
+    # And starts our routine in bank 83 if it isn't running already.
+    # Keeps itself scheduled until the game has shown every item, which we know once the tail reaches the head.
+    # Only called from the event scheduler, will assume that state is permissible when run.
+    async def __deliver_queued_items(self, item_count):
+        self.__drop_stale_item_deliveries()
+        entries, head, tail, event_slot = await self.__read_item_ring()
+        pending_count = get_item_ring_pending_count(head, tail)
+        if pending_count is None:
+            # The ring buffer has never been used since the game was started, so start it out empty.
+            head = tail
+            pending_count = 0
+        entries = bytearray(entries)
+        written_events = []
+        while self.queuedItemDeliveries and pending_count < SuperMetroidConstants.multiworldItemRingCapacity:
+            item_name, event = self.queuedItemDeliveries.popleft()
+            entry = build_multiworld_item_entry(item_name, self.itemRoutineDict[item_name])
+            offset = (head % SuperMetroidConstants.multiworldItemRingCapacity) * len(entry)
+            entries[offset : offset + len(entry)] = entry
+            head = (head + 1) & 0xFFFF
+            pending_count += 1
+            written_events.append(event)
         try:
-            timeout = 0.3
-            while len(self.queued_events) > 0:
-                if self.is_player_ready_for_event():
-                    print("Player is ready for event, sending now...")
-                    current_event = self.queued_events.pop(0)
-                    (current_event[0])(*current_event[1])
-                    timeout = 0.8
-                else:
-                    print(f"Player is not ready for event, waiting {timeout} seconds...")
-                    self.lock.release()
-                    time.sleep(timeout)
-                    self.lock.acquire()
-                    timeout *= 1.3
-        finally:
-            self.lock.release()
-
-    # The part that actually does the thing.
-    # Only called from event manager, will assume that state is permissible when run.
-    # Always called from within a lock.
-    def __receive_item_internal(self, item_name, sender, show_message=True):
-        # Use the in-game event system to send a player their item.
-        if show_message:
-            # Set message ID appropriately.
-            # Needs to be a valid item ID (though not necessarily the message ID of the item the player received.)
-            self.set_data("F51C1F", "1000")
-
-            # Set the function to be called.
-            # TODO: Verify this is correct
-            self.set_data("F6FF72", "65AD")
-
-            # Set the "Item Picked Up" word to 1.
-            # Tells the game that the next item it gets will be from multi.
-            self.set_data("F6FF74", "0100")
-            # Give item data needed to complete pickup.
-
-            # Header/footer.
-            # This is a standard item, so give the pointer to
-            # An empty header/footer of correct width.
-            # TODO: Import these dynamically from patcher.
-            width = "Small"
-            if item_name in SuperMetroidConstants.itemMessageWidths:
-                width = SuperMetroidConstants.itemMessageWidths[item_name]
-            if width == "Small":
-                self.set_data("F6FF76", "4080")
-            elif width == "Large":
-                self.set_data("F6FF76", "0080")
-
-            # Content.
-            # Different for each item - main message for an item pickup.
-            # TODO: Import these dynamically from patcher.
-            self.set_data("F6FF78", reverse_endianness(SuperMetroidConstants.itemMessageAddresses[item_name]))
-
-            # Message box size, in bytes.
-            # Dictates height.
-            size = "4000"
-            if item_name in SuperMetroidConstants.itemMessageNonstandardSizes:
-                size = reverse_endianness(SuperMetroidConstants.itemMessageNonstandardSizes[item_name])
-            self.set_data("F6FF7A", size)
-
-            # Message ID. Should be accurate if it can be helped.
-            # Also set to Wave Beam.
-            self.set_data("F6FF7C", reverse_endianness(SuperMetroidConstants.itemMessageIDs[item_name]))
-
-            # Get the original routine address and save it to jump to later.
-            original_jump_destination = self.get_data("F50A42", 2)
-
-            self.set_data("F6FF80", original_jump_destination)
-
-            # Item Collection Routine.
-            # What we actually call on pickup.
-            self.set_data("F6FF7E", self.itemRoutineDict[item_name])
-
-            # Overwrite an instruction pointer in the game's RAM.
-            # This is what actually causes our code to execute.
-            self.set_data("F50A42", "F0FF")
-
-        # Otherwise, directly add the item to their inventory.
-        else:
-            if item_name in SuperMetroidConstants.toggleItemList:
-                self.give_toggle_item(item_name)
-            elif item_name in SuperMetroidConstants.ammoItemList:
-                # TODO: Change this part so that this is passed as an argument actually
-                self.increment_item(item_name, self.ammoItemToQuantity[item_name])
-
-    # For displaying an arbitrary message
-    # TODO: Figure out how to do this.
-    def receive_message(message, width="Variable", size=None):
-        pass
-
-    # The part that actually does the thing.
-    # Only called from event manager, will assume that state is permissible when run.
-    # Always called from within a lock.
-    def __receive_message_internal(message, width="Variable", size=None):
-        pass
+            if written_events:
+                # Entries the game hasn't shown yet are written back unchanged, and the head comes last.
+                await self.write(SuperMetroidConstants.multiworldItemRingAddress, bytes(entries) + pack_u16le(head))
+            if pending_count > 0 and event_slot != 0xFFF0:
+                # Save the original routine to jump back to once the ring buffer is empty.
+                await self.write(
+                    SuperMetroidConstants.multiworldRecordAddress, build_multiworld_item_record(event_slot)
+                )
+                # Overwrite an instruction pointer in the game's RAM.
+                # This is what actually causes our code to execute.
+                # The game runs it in the frame after the write lands, so aim for the write to land early in a frame.
+                await asyncio.sleep(self.frameClock.get_write_delay(self.client.limiter.smoothed_rtt))
+                await self.write(SuperMetroidConstants.eventSlotAddress, pack_u16le(0xFFF0))
+        except Exception as e:
+            # The items may not have made it into the ring buffer, so let whoever is waiting on them know.
+            for event in written_events:
+                if not event.future.done():
+                    event.future.set_exception(e)
+                    event.future.exception()
+            raise
+        for event in written_events:
+            if not event.future.done():
+                event.future.set_result(None)
+        if pending_count > 0 or self.queuedItemDeliveries:
+            self.eventScheduler.schedule(
+                self.__deliver_queued_items,
+                coalesce_key="Deliver Items",
+                amount=0,
+                is_ready=self.__is_ready_for_item_delivery,
+            )
 
     # Increment (or decrement) the amount of an item that a player has.
     # NOTE: This will not work with unique items (ex. Charge Beam, Gravity Suit)
@@ -451,23 +961,19 @@ class SuperMetroidInterface:
     # If maxAmountOnly is true, this will not increment the player's current number of this item, only the capacity for this item.
     # 7E:0A12 - 7E:0A13 Mirror's Samus's health. Used to check to make hurt sound and flash.
     # TODO: Test to see if this introduces errors in HUD graphics.
-    def increment_item(self, item_name, increment_amount, max_amount_only=False):
-        self.verify_game_loaded()
+    async def increment_item(self, item_name, increment_amount, max_amount_only=False):
+        await self.verify_game_loaded()
         if self.gameLoaded:
             if item_name in SuperMetroidConstants.ammoItemList:
+                # Current ammo is directly followed by maximum ammo, so both are read and written together.
                 current_ammo_address = SuperMetroidConstants.ammoItemAddresses[item_name]
-                max_ammo_address = int_to_hex(hex_to_int(current_ammo_address) + 2)
-                current_ammo = reverse_endianness(self.get_data(current_ammo_address, 2))
-                max_ammo = reverse_endianness(self.get_data(max_ammo_address, 2))
-                if max_amount_only:
-                    new_current_ammo = reverse_endianness(current_ammo)
-                else:
-                    new_current_ammo = reverse_endianness(
-                        pad_hex(int_to_hex(hex_to_int(current_ammo) + increment_amount), 4)
-                    )
-                new_max_ammo = reverse_endianness(pad_hex(int_to_hex(hex_to_int(max_ammo) + increment_amount), 4))
-                self.set_data(current_ammo_address, new_current_ammo)
-                self.set_data(max_ammo_address, new_max_ammo)
+                ammo_data = await self.read(current_ammo_address, 4)
+                current_ammo = read_u16le(ammo_data)
+                max_ammo = read_u16le(ammo_data, 2)
+                if not max_amount_only:
+                    current_ammo += self.check_value_overflow(current_ammo, increment_amount)
+                max_ammo += self.check_value_overflow(max_ammo, increment_amount)
+                await self.write(current_ammo_address, pack_u16le(current_ammo) + pack_u16le(max_ammo))
             else:
                 if item_name in SuperMetroidConstants.toggleItemList:
                     raise TypeError(
@@ -485,22 +991,19 @@ class SuperMetroidInterface:
     # Give a player a bitflag-type item.
     # This will also equip it.
     # TODO: Make sure Plasma and Spazer can't both be equipped simultaneously
-    def give_toggle_item(self, item_name):
-        self.verify_game_loaded()
+    async def give_toggle_item(self, item_name):
+        await self.verify_game_loaded()
         if self.gameLoaded:
             if item_name in SuperMetroidConstants.toggleItemList:
                 item_offset = SuperMetroidConstants.toggleItemBitflagOffsets[item_name]
-                equipped_byte_address = int_to_hex(
-                    hex_to_int(SuperMetroidConstants.toggleItemBaseAddress) + item_offset[0]
+                equipped_byte_address = SuperMetroidConstants.toggleItemBaseAddress + item_offset[0]
+                obtained_byte_address = equipped_byte_address + 2
+                equipped_byte, obtained_byte = await self.read_many(
+                    [(equipped_byte_address, 1), (obtained_byte_address, 1)]
                 )
-                obtained_byte_address = int_to_hex(hex_to_int(equipped_byte_address) + 2)
-                equipped_byte = self.get_data(equipped_byte_address, 1)
-                obtained_byte = self.get_data(obtained_byte_address, 1)
                 bitflag = 1 << item_offset[1]
-                new_equipped_byte = pad_hex(int_to_hex(hex_to_int(equipped_byte) | bitflag), 2)
-                new_obtained_byte = pad_hex(int_to_hex(hex_to_int(obtained_byte) | bitflag), 2)
-                self.set_data(equipped_byte_address, new_equipped_byte)
-                self.set_data(obtained_byte_address, new_obtained_byte)
+                await self.write_u8(equipped_byte_address, equipped_byte[0] | bitflag)
+                await self.write_u8(obtained_byte_address, obtained_byte[0] | bitflag)
             else:
                 if item_name in SuperMetroidConstants.ammoItemList:
                     raise TypeError(
@@ -517,24 +1020,20 @@ class SuperMetroidInterface:
 
     # Take away a player's bitflag-type item if they have it.
     # This will also unequip it.
-    def take_away_toggle_item(self, item_name):
-        self.verify_game_loaded()
+    async def take_away_toggle_item(self, item_name):
+        await self.verify_game_loaded()
         if self.gameLoaded:
             if item_name in SuperMetroidConstants.toggleItemList:
                 item_offset = SuperMetroidConstants.toggleItemBitflagOffsets[item_name]
-                equipped_byte_address = pad_hex(
-                    int_to_hex(hex_to_int(SuperMetroidConstants.toggleItemBaseAddress) + item_offset[0]),
-                    2,
+                equipped_byte_address = SuperMetroidConstants.toggleItemBaseAddress + item_offset[0]
+                obtained_byte_address = equipped_byte_address + 2
+                equipped_byte, obtained_byte = await self.read_many(
+                    [(equipped_byte_address, 1), (obtained_byte_address, 1)]
                 )
-                obtained_byte_address = pad_hex(int_to_hex(hex_to_int(equipped_byte_address) + 2), 2)
-                equipped_byte = self.get_data(equipped_byte_address, 1)
-                obtained_byte = self.get_data(obtained_byte_address, 1)
                 bitflag = 1 << item_offset[1]
                 # Do bitwise and with all ones (except the bitflag we want to turn off)
-                new_equipped_byte = pad_hex(int_to_hex(hex_to_int(equipped_byte) & (255 - bitflag)), 4)
-                new_obtained_byte = pad_hex(int_to_hex(hex_to_int(obtained_byte) & (255 - bitflag)), 4)
-                self.set_data(equipped_byte_address, new_equipped_byte)
-                self.set_data(obtained_byte_address, new_obtained_byte)
+                await self.write_u8(equipped_byte_address, equipped_byte[0] & (0xFF ^ bitflag))
+                await self.write_u8(obtained_byte_address, obtained_byte[0] & (0xFF ^ bitflag))
             else:
                 if item_name in SuperMetroidConstants.ammoItemList:
                     raise TypeError(
@@ -549,43 +1048,21 @@ class SuperMetroidInterface:
                 f"ERROR: An attempt was made to take away player's {item_name}, but their game is not loaded."
             )
 
-    # Sends an info request.
-    # Returns true if it receives a result.
-    # Returns false if the request fails.
-    def verify_connected_to_device(self):
-        if self.connectionInitialized:
-            try:
-                json_get_device_info_command = {"Opcode": "Info", "Space": "SNES"}
-                self.webSocket.send(json.dumps(json_get_device_info_command))
-                result = self.webSocket.recv()
-                result = (json.loads(result))["Results"]
-                if len(result) < 1:
-                    raise ConnectionError("ERROR: No device info could be found. Device has not successfully attached.")
-                    return False
-                else:
-                    self.deviceInfo = result
-                    self.connectedToDevice = True
-                    return True
-            except Exception:
-                raise ConnectionError(
-                    "ERROR: Failed to send verification message to SNI. Marking connection as closed..."
-                )
-                self.connectionInitialized = False
-                self.connectedToDevice = False
-                self.deviceInfo = None
-                return False
+    # Makes sure we have device info, sending an info request if the cached info has gone stale.
+    # Returns true if it has device info.
+    # If forceRefresh = True, always send the request.
+    async def verify_connected_to_device(self, force_refresh=False):
+        if self.client.is_connected():
+            await self.client.info(force_refresh)
+            return True
         else:
             raise ConnectionError(
-                "ERROR: Cannot verify that device has been connected, as the connection to SNI has not been initialized. Attempting to reestablish connection..."
+                "ERROR: Cannot verify that device has been connected, as the connection to SNI has not been initialized."
             )
-            self.connect_to_device()
-            # self.deviceInfo = None
-            # self.connectedToDevice = False
-            return False
 
     # Check game to make sure it's Super Metroid.
-    def verify_correct_game(self):
-        self.verify_connected_to_device()
+    async def verify_correct_game(self):
+        await self.verify_connected_to_device()
         if self.connectedToDevice:
             game_type = self.deviceInfo[2].strip()
             if game_type == "No Info":
@@ -598,11 +1075,10 @@ class SuperMetroidInterface:
                 self.inSuperMetroid = True
                 return True
             else:
+                self.inSuperMetroid = False
                 raise ConnectionError(
                     f"ERROR: Could not verify game being played as Super Metroid. According to SNI, this device is currently running {game_type}."
                 )
-                self.inSuperMetroid = False
-                return False
         else:
             self.inSuperMetroid = False
             return False
@@ -610,140 +1086,76 @@ class SuperMetroidInterface:
     # Check game version.
     # Either NTSC or PAL
     # Note that NTSC-U and NTSC-J are identical.
-    def get_game_version(self):
+    async def get_game_version(self):
         pass
 
+    # Returns a PlayerState, reading the game state, event slot and frame counter together
+    # Unless the last one is still fresh.
+    async def get_player_state(self):
+        if self.playerState is not None and self.playerState.is_fresh():
+            return self.playerState
+        await self.verify_correct_game()
+        if not self.inSuperMetroid:
+            raise ConnectionError(
+                "ERROR: An attempt was made to query game state, but something other than the game Super Metroid seems to be loaded."
+            )
+        # All reads go out in the same request, or come from the RAM mirror.
+        game_state, event_slot, frame_counter = await asyncio.gather(
+            self.read_mirrored(SuperMetroidConstants.gameStateAddress, 1),
+            self.read_mirrored(SuperMetroidConstants.eventSlotAddress, 2),
+            self.__read_frame_counter(),
+        )
+        self.playerState = PlayerState(game_state[0], read_u16le(event_slot), frame_counter)
+        self.gameLoaded = self.playerState.is_game_loaded()
+        self.playingGame = self.playerState.is_in_gameplay()
+        return self.playerState
+
     # Check to see if player is ready to have an event inserted.
-    def is_player_ready_for_event(self):
-        self.verify_in_gameplay()
-        if self.playingGame:
-            # Query function slot to make sure it isn't currently occupied.
-            functionSlot = self.get_data("F50A42", 2)
-            # F0FF is the value used to redirect control flow to arbitrary functions.
-            # If this is the function slot's current value, we'd be writing over our own request.
-            if functionSlot != "F0FF":
-                return True
-            else:
-                return False
-        else:
-            return False
+    async def is_player_ready_for_event(self):
+        return (await self.get_player_state()).is_ready_for_event()
 
     # Query if the player is currently in a fully loaded save.
     # This ensures that we can read important values from RAM, such as item counts, without fearing garbage data.
-    def verify_game_loaded(self):
-        self.verify_correct_game()
-        if self.inSuperMetroid:
-            game_state = self.get_game_state()
-            # We could technically give players items while pausing,
-            # But this causes the pickup box to show up on a pitch black screen once
-            # The player unpauses.
-            # This may be confusing as players will not be able to see it.
-            valid_game_states = ["In Game", "In Room Transition"]
-            if game_state in valid_game_states:
-                self.gameLoaded = True
-                return True
-            else:
-                self.gameLoaded = False
-                return False
-        else:
-            self.gameLoaded = False
-            return False
+    async def verify_game_loaded(self):
+        return (await self.get_player_state()).is_game_loaded()
 
     # Query if the player is currently in normal gameplay.
     # Will not return true if player is in a cutscene, in a transition, loading, paused, in a menu, etc.
-    def verify_in_gameplay(self):
-        self.verify_game_loaded()
-        if self.gameLoaded:
-            game_state = self.get_game_state()
-            if game_state == "In Game":
-                self.playingGame = True
-                return True
-            else:
-                self.playingGame = False
-                return False
-        else:
-            self.playingGame = False
-            return False
+    async def verify_in_gameplay(self):
+        return (await self.get_player_state()).is_in_gameplay()
 
     # Get what state the player is in.
     # Returns a string.
-    # TODO: Convert to a dict
-    def get_game_state(self):
-        self.verify_correct_game()
-        if self.inSuperMetroid:
-            status = hex_to_int(self.get_data("F50998", 1))
-            if status == 1:
-                return "Title Screen"
-            elif status == 4:
-                return "In Menu"
-            elif status == 5:
-                return "Loading a Area"
-            elif status == 6:
-                return "Loading a Save Game"
-            elif status == 7:
-                return "Initializing from a Save Game"
-            elif status == 8:
-                return "In Game"
-            elif status == 9:
-                return "In Room Transition"
-            elif status == 10 or status == 11:
-                return "On Elevator"
-            elif 12 <= status <= 14:
-                return "Pausing"
-            elif status == 15:
-                return "Paused"
-            elif 16 <= status <= 20:
-                return "Unpausing"
-            elif 21 <= status <= 26:
-                return "Dead"
-            elif 30 <= status <= 36:
-                return "In Cutscene"
-            elif status == 42:
-                return "Watching Demo"
-            else:
-                return "Status Not Known"
-        else:
-            raise ConnectionError(
-                "ERROR: An attempt was made to query game state, but something other than the game Super Metroid seems to be loaded."
-            )
+    async def get_game_state(self):
+        return (await self.get_player_state()).game_state.value
 
     # Returns a pretty string saying where player is.
     # Room and region name.
     # 7E:07BD - 7E:07BF : 3 byte pointer to room tilemap.
-    def get_player_location(self):
+    async def get_player_location(self):
         pass
 
-    def get_player_inventory(self):
-        self.verify_game_loaded()
+    async def get_player_inventory(self):
+        await self.verify_game_loaded()
         if self.gameLoaded:
-            self.get_player_ammo_counts()
-            self.get_player_toggle_items()
+            await self.get_player_ammo_counts()
+            await self.get_player_toggle_items()
         else:
             raise ConnectionError(
                 "ERROR: An attempt was made to query the player's inventory, but they aren't in the game yet."
             )
 
-    def get_player_ammo_counts(self):
-        self.verify_game_loaded()
+    async def get_player_ammo_counts(self):
+        await self.verify_game_loaded()
         if self.gameLoaded:
-            ammo_item_list = []
-            ammo_item_current_count = []
-            ammo_item_maximum_count = []
             # Get player's ammo counts.
-            for item_name, address in SuperMetroidConstants.ammoItemAddresses.items():
-                ammo_item_list.append(item_name)
-                current_ammo = self.get_data(address, 2)
-                ammo_item_current_count.append(hex_to_int(reverse_endianness(current_ammo)))
-                max_ammo_address = pad_hex(int_to_hex(hex_to_int(address) + 2), 6)
-                maximum_ammo = self.get_data(max_ammo_address, 2)
-                ammo_item_maximum_count.append(hex_to_int(reverse_endianness(maximum_ammo)))
-                # Reserve energy is backwards, for some reason.
-                if item_name == "Reserve Tank":
-                    index = len(ammo_item_current_count) - 1
-                    ammo_item_current_count[index], ammo_item_maximum_count[index] = (
-                        ammo_item_maximum_count[index],
-                        ammo_item_current_count[index],
-                    )
+            inventory_data = await self.read_mirrored(
+                SuperMetroidConstants.inventoryBaseAddress, SuperMetroidConstants.inventorySize
+            )
+            ammo_counts = parse_ammo_counts(inventory_data)
+            ammo_item_list = list(ammo_counts)
+            ammo_item_current_count = [current_ammo for current_ammo, maximum_ammo in ammo_counts.values()]
+            ammo_item_maximum_count = [maximum_ammo for current_ammo, maximum_ammo in ammo_counts.values()]
             for i in range(len(ammo_item_list)):
                 print(
                     f"Samus has {str(ammo_item_current_count[i])} {SuperMetroidConstants.itemNameToQuantityName[(ammo_item_list[i])]} out of {str(ammo_item_maximum_count[i])}."
@@ -756,26 +1168,16 @@ class SuperMetroidInterface:
                 "ERROR: An attempt was made to query the player's ammo counts, but they aren't in the game yet."
             )
 
-    def get_player_toggle_items(self):
-        self.verify_game_loaded()
+    async def get_player_toggle_items(self):
+        await self.verify_game_loaded()
         if self.gameLoaded:
-            toggle_item_hex = self.get_data(SuperMetroidConstants.toggleItemBaseAddress, 8)
-            obtained_items = []
-            equipped_items = []
-            for item_name, byte_bit_offset_pair in SuperMetroidConstants.toggleItemBitflagOffsets.items():
-                obtained_byte = toggle_item_hex[
-                    ((byte_bit_offset_pair[0] * 2) + 4) : ((byte_bit_offset_pair[0] * 2) + 6)
-                ]
-                equipped_byte = toggle_item_hex[(byte_bit_offset_pair[0] * 2) : ((byte_bit_offset_pair[0] * 2) + 2)]
-                obtained_val = hex_to_int(obtained_byte)
-                equipped_val = hex_to_int(equipped_byte)
-                bit_to_check = 1 << byte_bit_offset_pair[1]
-                if (obtained_val & bit_to_check) != 0:
-                    obtained_items.append(item_name)
-                if (equipped_val & bit_to_check) != 0:
-                    equipped_items.append(item_name)
-                    if item_name not in obtained_items:
-                        print(f"WARNING: Player has equipped item '{item_name}', but they haven't obtained it yet.")
+            inventory_data = await self.read_mirrored(
+                SuperMetroidConstants.inventoryBaseAddress, SuperMetroidConstants.inventorySize
+            )
+            obtained_items, equipped_items = parse_toggle_items(inventory_data)
+            for item_name in equipped_items:
+                if item_name not in obtained_items:
+                    print(f"WARNING: Player has equipped item '{item_name}', but they haven't obtained it yet.")
             self.obtainedToggleItems = obtained_items
             self.equippedToggleItems = equipped_items
             for item_name in obtained_items:
@@ -791,29 +1193,29 @@ class SuperMetroidInterface:
             )
 
     # Check if player has debug mode on.
-    def get_player_debug_state(self):
+    async def get_player_debug_state(self):
         pass
 
     # Check if player has sounds enabled.
-    def get_sounds_enabled(self):
+    async def get_sounds_enabled(self):
         pass
 
     # Get what region player is in right now.
-    def get_region_number(self):
+    async def get_region_number(self):
         pass
 
     # Get what map coordinates player is in right now.
-    def get_map_coordinates(self):
+    async def get_map_coordinates(self):
         pass
 
     # Get what tiles in current region player has visited.
     # 7E:07F7 - 7E:08F6 : Map tiles explored for current area (1 tile = 1 bit)
     # TODO: Make more observations about data format
-    def get_map_completion(self):
+    async def get_map_completion(self):
         pass
 
     # Check if player has automap enabled.
-    def get_automap_enabled(self):
+    async def get_automap_enabled(self):
         pass
 
     # Used to take away X-Ray Scope and Grapple Beam.
@@ -822,130 +1224,174 @@ class SuperMetroidInterface:
     # def __SetStatusBarSelection(self):
     #     pass
 
+    # Record the count, bytes and latency of every request to SNI, per opcode and per caller.
+    # If dump_path is given, metrics are also written there as JSON every dump_interval seconds.
+    def enable_metrics(self, dump_path=None, dump_interval=60.0):
+        if self.client.metrics is None:
+            self.client.metrics = SNIMetrics()
+        if dump_path is not None:
+            self.client.metrics.start_dumping(dump_path, dump_interval)
+        return self.client.metrics
+
+    # Returns metrics recorded since enable_metrics was called as a dict, or None if metrics aren't enabled.
+    def get_metrics(self):
+        if self.client.metrics is None:
+            return None
+        return self.client.metrics.get_metrics()
+
+    # Stop polling and running events, and close the connection.
+    async def close_connection(self):
+        if self.client.metrics is not None:
+            self.client.metrics.stop_dumping()
+        self.ramMirror.stop()
+        self.eventScheduler.stop()
+        if self.pollLocationChecksTask is not None:
+            self.pollLocationChecksTask.cancel()
+        if self.client.is_connected():
+            await self.client.close()
+        else:
+            print("WARNING: Connection cannot be closed, as no connection was initialized. Ignoring request...")
+
+
+# Synchronous interface to the game, for callers which aren't written with asyncio.
+# Runs an AsyncSuperMetroidInterface on an event loop in a background thread,
+# And waits for the result of each call.
+class SuperMetroidInterface:
+    def __init__(self, client=None):
+        self.loop = asyncio.new_event_loop()
+        self.loopThread = threading.Thread(target=self.loop.run_forever)
+        self.loopThread.daemon = True
+        self.loopThread.start()
+        self.asyncInterface = self.__run(self.__create_async_interface(client))
+
+    async def __create_async_interface(self, client):
+        if client is None:
+            client = SNIClient()
+        return AsyncSuperMetroidInterface(client)
+
+    # Runs a coroutine on the event loop and waits for its result.
+    def __run(self, coroutine):
+        return asyncio.run_coroutine_threadsafe(coroutine, self.loop).result()
+
+    # State such as gameLoaded or itemRoutineDict is read from the asynchronous interface.
+    def __getattr__(self, name):
+        if name == "asyncInterface":
+            raise AttributeError(name)
+        return getattr(self.asyncInterface, name)
+
+    def initialize_connection(self, address=DEFAULT_SNI_ADDRESS):
+        return self.__run(self.asyncInterface.initialize_connection(address))
+
+    def connect_to_device(self, device=None, symbol_map_path=None):
+        return self.__run(self.asyncInterface.connect_to_device(device, symbol_map_path))
+
+    def get_data(self, address, num_bytes, check_rom_read=True):
+        return self.__run(self.asyncInterface.get_data(address, num_bytes, check_rom_read))
+
+    def read_many(self, ranges, check_rom_read=True):
+        return self.__run(self.asyncInterface.read_many(ranges, check_rom_read))
+
+    def read(self, address, num_bytes, check_rom_read=True):
+        return self.__run(self.asyncInterface.read(address, num_bytes, check_rom_read))
+
+    def write(self, address, data, check_rom_write=True):
+        return self.__run(self.asyncInterface.write(address, data, check_rom_write))
+
+    def snapshot(self):
+        return self.__run(self.asyncInterface.snapshot())
+
+    def set_data(self, address, data, check_rom_write=True):
+        return self.__run(self.asyncInterface.set_data(address, data, check_rom_write))
+
+    def read_rom(self, address, num_bytes):
+        return self.__run(self.asyncInterface.read_rom(address, num_bytes))
+
+    def load_rom_file(self, path):
+        return self.asyncInterface.load_rom_file(path)
+
+    def load_symbol_map(self, path):
+        return self.asyncInterface.load_symbol_map(path)
+
+    def read_u8(self, address):
+        return self.__run(self.asyncInterface.read_u8(address))
+
+    def read_u16le(self, address):
+        return self.__run(self.asyncInterface.read_u16le(address))
+
+    def write_u8(self, address, value):
+        return self.__run(self.asyncInterface.write_u8(address, value))
+
+    def write_u16le(self, address, value):
+        return self.__run(self.asyncInterface.write_u16le(address, value))
+
+    def receive_item(self, item_name, sender, show_message=True, timeout=None):
+        return self.__run(self.asyncInterface.receive_item(item_name, sender, show_message, timeout))
+
+    def start_polling_game_for_checks(self):
+        return self.__run(self.asyncInterface.start_polling_game_for_checks())
+
+    def increment_item(self, item_name, increment_amount, max_amount_only=False):
+        return self.__run(self.asyncInterface.increment_item(item_name, increment_amount, max_amount_only))
+
+    def give_toggle_item(self, item_name):
+        return self.__run(self.asyncInterface.give_toggle_item(item_name))
+
+    def take_away_toggle_item(self, item_name):
+        return self.__run(self.asyncInterface.take_away_toggle_item(item_name))
+
+    def verify_connected_to_device(self, force_refresh=False):
+        return self.__run(self.asyncInterface.verify_connected_to_device(force_refresh))
+
+    def verify_correct_game(self):
+        return self.__run(self.asyncInterface.verify_correct_game())
+
+    def is_player_ready_for_event(self):
+        return self.__run(self.asyncInterface.is_player_ready_for_event())
+
+    def verify_game_loaded(self):
+        return self.__run(self.asyncInterface.verify_game_loaded())
+
+    def verify_in_gameplay(self):
+        return self.__run(self.asyncInterface.verify_in_gameplay())
+
+    def get_game_state(self):
+        return self.__run(self.asyncInterface.get_game_state())
+
+    def get_player_inventory(self):
+        return self.__run(self.asyncInterface.get_player_inventory())
+
+    def get_player_ammo_counts(self):
+        return self.__run(self.asyncInterface.get_player_ammo_counts())
+
+    def get_player_toggle_items(self):
+        return self.__run(self.asyncInterface.get_player_toggle_items())
+
+    def start_ram_mirror(self, interval=0.1):
+        return self.__run(self.asyncInterface.start_ram_mirror(interval))
+
+    def stop_ram_mirror(self):
+        return self.__run(self.asyncInterface.stop_ram_mirror())
+
+    def enable_metrics(self, dump_path=None, dump_interval=60.0):
+        return self.__run(self.__enable_metrics(dump_path, dump_interval))
+
+    # The dump task has to be started from the event loop's thread.
+    async def __enable_metrics(self, dump_path, dump_interval):
+        return self.asyncInterface.enable_metrics(dump_path, dump_interval)
+
+    def get_metrics(self):
+        return self.__run(self.__get_metrics())
+
+    async def __get_metrics(self):
+        return self.asyncInterface.get_metrics()
+
     # Close interface, shut down any threads
     def close(self):
         self.close_connection()
         sys.exit()
 
-    # I don't know if this is strictly necessary, but it can't possibly hurt.
     def close_connection(self):
-        if self.connectionInitialized:
-            self.webSocket.close()
-        else:
-            print("WARNING: Connection cannot be closed, as no connection was initialized. Ignoring request...")
-
-    # This method handles making sure requests don't overlap, and that requests wait for one another to finish.
-    # Not all requests need to be handled this way, such as those which only read from memory.
-    def handle_request_queue(self):
-        pass
-
-
-def temp(interface):
-    interface.receive_item("Wave Beam", "Galactic Federation HQ")
-    interface.receive_item("Ice Beam", "Galactic Federation HQ")
-    interface.receive_item("Plasma Beam", "Galactic Federation HQ")
-    interface.receive_item("Charge Beam", "Galactic Federation HQ")
-    interface.receive_item("Grapple Beam", "Galactic Federation HQ")
-    interface.receive_item("X-Ray Scope", "Galactic Federation HQ")
-    interface.receive_item("Varia Suit", "Galactic Federation HQ")
-    interface.receive_item("Gravity Suit", "Galactic Federation HQ")
-    interface.receive_item("Morph Ball", "Galactic Federation HQ")
-    interface.receive_item("Spring Ball", "Galactic Federation HQ")
-    interface.receive_item("Morph Ball Bombs", "Galactic Federation HQ")
-    interface.receive_item("Speed Booster", "Galactic Federation HQ")
-    interface.receive_item("Hi-Jump Boots", "Galactic Federation HQ")
-    interface.receive_item("Space Jump", "Galactic Federation HQ")
-    interface.receive_item("Screw Attack", "Galactic Federation HQ")
-    interface.receive_item("Energy Tank", "Galactic Federation HQ")
-    interface.receive_item("Energy Tank", "Galactic Federation HQ")
-    interface.receive_item("Energy Tank", "Galactic Federation HQ")
-    interface.receive_item("Energy Tank", "Galactic Federation HQ")
-    interface.receive_item("Energy Tank", "Galactic Federation HQ")
-    interface.receive_item("Energy Tank", "Galactic Federation HQ")
-    interface.receive_item("Reserve Tank", "Galactic Federation HQ")
-    interface.receive_item("Reserve Tank", "Galactic Federation HQ")
-    interface.receive_item("Missile Expansion", "Galactic Federation HQ")
-    interface.receive_item("Missile Expansion", "Galactic Federation HQ")
-    interface.receive_item("Missile Expansion", "Galactic Federation HQ")
-    interface.receive_item("Missile Expansion", "Galactic Federation HQ")
-    interface.receive_item("Missile Expansion", "Galactic Federation HQ")
-    interface.receive_item("Missile Expansion", "Galactic Federation HQ")
-    interface.receive_item("Missile Expansion", "Galactic Federation HQ")
-    interface.receive_item("Missile Expansion", "Galactic Federation HQ")
-    interface.receive_item("Super Missile Expansion", "Galactic Federation HQ")
-    interface.receive_item("Super Missile Expansion", "Galactic Federation HQ")
-    interface.receive_item("Super Missile Expansion", "Galactic Federation HQ")
-    interface.receive_item("Super Missile Expansion", "Galactic Federation HQ")
-    interface.receive_item("Super Missile Expansion", "Galactic Federation HQ")
-    interface.receive_item("Super Missile Expansion", "Galactic Federation HQ")
-    interface.receive_item("Super Missile Expansion", "Galactic Federation HQ")
-    interface.receive_item("Super Missile Expansion", "Galactic Federation HQ")
-    interface.receive_item("Power Bomb Expansion", "Galactic Federation HQ")
-    interface.receive_item("Power Bomb Expansion", "Galactic Federation HQ")
-    interface.receive_item("Power Bomb Expansion", "Galactic Federation HQ")
-    interface.receive_item("Power Bomb Expansion", "Galactic Federation HQ")
-    interface.receive_item("Power Bomb Expansion", "Galactic Federation HQ")
-    interface.receive_item("Power Bomb Expansion", "Galactic Federation HQ")
-
-
-if __name__ == "__main__":
-    menu = "C: Initialize Connection\n"
-    menu += "D: Attach to a Device\n"
-    menu += "I: Query Inventory\n"
-    menu += "S: Query Gamestate\n"
-    menu += "R: Query If Player is Ready for an Item\n"
-    menu += "W: Send Wave Beam\n"
-    menu += "G: Force Give Screw Attack\n"
-    menu += "T: Force Take Screw Attack\n"
-    menu += "M: Force Give 5 Missiles\n"
-    menu += "P: Start Polling for Location Checks\n"
-    menu += "Q: Quit"
-    last_input = None
-    while last_input != "Q":
-        print(menu)
-        last_input = input()[0]
-        if last_input == "C":
-            print("\nAttempting to connect...")
-            interface.initialize_connection()
-        elif last_input == "D":
-            print("\nAttempting to attach to a device...")
-            interface.connect_to_device()
-        elif last_input == "I":
-            print("\nAttempting to query inventory...")
-            interface.get_player_inventory()
-        elif last_input == "S":
-            print("\nAttemtping to query game state...")
-            state = interface.get_game_state()
-            if state is not None:
-                print(f"Current State: {state}")
-        elif last_input == "R":
-            if interface.is_player_ready_for_event():
-                print("Samus is ready to receive an item.")
-            else:
-                print("Samus isn't ready to receive an item.")
-        elif last_input == "W":
-            print("\nTrying to send Wave Beam...")
-            interface.receive_item("Wave Beam", "Galactic Federation HQ")
-        elif last_input == "G":
-            print("\nManually Giving Screw Attack...")
-            interface.give_toggle_item("Screw Attack")
-        elif last_input == "T":
-            print("\nManually Taking Screw Attack...")
-            interface.take_away_toggle_item("Screw Attack")
-        elif last_input == "M":
-            print("\nManually Giving 5 Missiles...")
-            interface.increment_item("Missile Expansion", 5)
-        elif last_input == "P":
-            print("\nManually starting polling thread...")
-            interface.start_polling_game_for_checks()
-        elif last_input == "F":
-            print("\nChecking and printing location bitflags...")
-            print(interface.get_data("F6FFD0", 96))
-        elif last_input == "H":
-            print("\nTEMP COMMAND")
-            temp(interface)
-        elif last_input == "Q":
-            print("\nQuitting...")
-            interface.close()
-        else:
-            raise ValueError(f"\nERROR: Input '{str(last_input)}' not recognized")
+        self.__run(self.asyncInterface.close_connection())
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.loopThread.join()
+        self.loop.close()
@@ -0,0 +1,341 @@
+# SNI Client
+#
+# Asyncio client for SNI's websocket protocol, which is compatible with the usb2snes protocol.
+# Requests are JSON text messages. Replies to DeviceList and Info are JSON as well,
+# Replies to GetAddress are binary, and PutAddress and Attach have no reply at all.
+#
+# SNI answers requests in the order it receives them, so several requests can be in flight at once.
+# Requests which expect a reply are queued in the order they were sent, and a single reader task
+# Hands each reply to the oldest request still waiting for one.
+# How many requests may be in flight, or sent each second, is decided by an AdaptiveLimiter, see SNI_Limiter.
+
+import asyncio
+import bisect
+import collections
+import json
+import time
+
+import websockets
+
+from SuperDuperMetroid.Binary_Utils import hex_to_int
+from SuperDuperMetroid.SNI_Limiter import AdaptiveLimiter
+
+DEFAULT_SNI_ADDRESS = "ws://localhost:8080"
+
+# Addresses below this are in ROM, from SNI's perspective.
+ROM_END_ADDRESS = 0xF50000
+
+# Most address/length pairs we send in a single GetAddress request.
+# The SD2SNES can read at most 8 ranges with one VGET command, so larger batches gain nothing.
+MAX_READ_RANGES_PER_REQUEST = 8
+
+# Reads separated by at most this many bytes are merged into one range, reading the bytes in between.
+# Reading a few extra bytes is cheaper than using up another range, or another request.
+READ_MERGE_GAP = 32
+
+
+# Merges overlapping, adjacent and nearby (address, number of bytes) ranges.
+# Returns the merged ranges, sorted by address.
+def merge_read_ranges(ranges, merge_gap=READ_MERGE_GAP):
+    merged_ranges = []
+    for address, num_bytes in sorted(ranges):
+        if merged_ranges and address <= merged_ranges[-1][0] + merged_ranges[-1][1] + merge_gap:
+            merged_address, merged_num_bytes = merged_ranges[-1]
+            merged_ranges[-1] = (merged_address, max(merged_num_bytes, address + num_bytes - merged_address))
+        else:
+            merged_ranges.append((address, num_bytes))
+    return merged_ranges
+
+
+# A request which is waiting for its reply.
+# A reply_size of 0 means a JSON reply, anything else is the number of bytes of binary data expected.
+class PendingRequest:
+    __slots__ = ("opcode", "reply_size", "future", "reply")
+
+    def __init__(self, opcode, reply_size, future):
+        self.opcode = opcode
+        self.reply_size = reply_size
+        self.future = future
+        self.reply = bytearray()
+
+
+class SNIClient:
+    def __init__(self, web_socket=None):
+        self.web_socket = web_socket
+        # List of things about the device, such as device type, last known game, and system capabilities.
+        self.device_info = None
+        # Device info is cached for the session, so reads and writes don't each cost an extra Info round trip.
+        # It is requested again after a socket error, or once it is older than this many seconds.
+        # Set to None to never refresh it on a timer.
+        self.device_info_ttl = 30.0
+        # Time (from time.monotonic) at which device_info was last received.
+        self.device_info_timestamp = None
+        self.info_task = None
+        # Held while sending a request, so the data sent with a PutAddress directly follows its command.
+        self.send_lock = asyncio.Lock()
+        # Requests waiting for a reply, oldest first.
+        self.pending_requests = collections.deque()
+        self.reader_task = None
+        # Reads are collected for this many seconds, or until the end of the current event loop tick if 0,
+        # And then sent together with overlapping and nearby ranges merged.
+        self.read_coalesce_window = 0.0
+        # (address, number of bytes, future) for each read waiting to be sent.
+        self.queued_reads = []
+        self.read_flush_handle = None
+        # Futures for reads which were flushed, each done once every request for them has been sent.
+        # Writes wait on these, so a read issued before a write reaches the device before the write does.
+        self.read_sends = set()
+        # An SNIMetrics, which every request is recorded in if set.
+        self.metrics = None
+        # Caps requests in flight and per second, by device type and by how the device is responding.
+        self.limiter = AdaptiveLimiter()
+
+    async def connect(self, address=DEFAULT_SNI_ADDRESS):
+        self.web_socket = await websockets.connect(address, max_size=None)
+
+    async def close(self):
+        if self.web_socket is not None:
+            await self.web_socket.close()
+        self.web_socket = None
+        self.invalidate_device_info()
+        self.__fail_pending_requests(ConnectionError("ERROR: The connection to SNI was closed."))
+
+    def is_connected(self):
+        return self.web_socket is not None
+
+    # Sends a request, and waits for its reply if reply_size is not None.
+    # A reply_size of 0 means a JSON reply, anything else is the number of bytes of binary data expected.
+    # Other requests may be sent while this one waits for its reply.
+    # Waits first if the limiter has no room for another request.
+    # If given, on_sent is called once the request has been sent.
+    async def request(self, opcode, operands=None, reply_size=None, data=None, on_sent=None):
+        await self.limiter.acquire()
+        start = time.perf_counter()
+        try:
+            result = await self.__request(opcode, operands, reply_size, data, on_sent)
+        except Exception:
+            self.limiter.release(failed=True)
+            self.__record_metrics(opcode, start, reply_size, data, failed=True)
+            raise
+        # Requests without a reply finish once sent, which says nothing about the device's round trip time.
+        self.limiter.release(time.perf_counter() - start if reply_size is not None else None)
+        self.__record_metrics(opcode, start, reply_size, data)
+        return result
+
+    def __record_metrics(self, opcode, start, reply_size, data, failed=False):
+        if self.metrics is not None:
+            num_bytes = len(data) if data is not None else (reply_size or 0)
+            self.metrics.record(opcode, time.perf_counter() - start, num_bytes, failed)
+
+    async def __request(self, opcode, operands, reply_size, data, on_sent):
+        if self.web_socket is None:
+            raise ConnectionError("ERROR: Cannot send a request, as the connection to SNI has not been initialized.")
+        command = {"Opcode": opcode, "Space": "SNES"}
+        if operands is not None:
+            command["Operands"] = operands
+        pending_request = None
+        async with self.send_lock:
+            # Queue the request before sending it, so the queue is always in the order requests were sent.
+            if reply_size is not None:
+                pending_request = PendingRequest(opcode, reply_size, asyncio.get_running_loop().create_future())
+                self.pending_requests.append(pending_request)
+            try:
+                await self.web_socket.send(json.dumps(command))
+                if data is not None:
+                    await self.web_socket.send(data)
+            except Exception as e:
+                if pending_request is not None:
+                    self.pending_requests.remove(pending_request)
+                self.__connection_lost(e)
+                raise ConnectionError(f"ERROR: {opcode} request to SNI failed. Device info will be refreshed.") from e
+            if on_sent is not None:
+                on_sent()
+            if pending_request is not None and (self.reader_task is None or self.reader_task.done()):
+                self.reader_task = asyncio.ensure_future(self.__read_replies())
+        if pending_request is None:
+            return None
+        return await pending_request.future
+
+    # Receives replies for as long as requests are waiting for them.
+    async def __read_replies(self):
+        try:
+            while self.pending_requests:
+                message = await self.web_socket.recv()
+                pending_request = self.pending_requests[0]
+                if pending_request.reply_size == 0:
+                    result = json.loads(message)["Results"]
+                else:
+                    # SNI may split a reply over several binary messages, so keep receiving until we have everything.
+                    pending_request.reply += message
+                    if len(pending_request.reply) < pending_request.reply_size:
+                        continue
+                    result = bytes(pending_request.reply)
+                self.pending_requests.popleft()
+                # The caller may have stopped waiting, but its reply still had to be consumed.
+                if not pending_request.future.done():
+                    pending_request.future.set_result(result)
+        except Exception as e:
+            self.__connection_lost(e)
+
+    # Called when sending or receiving fails. Every request waiting for a reply fails with it.
+    def __connection_lost(self, cause):
+        self.invalidate_device_info()
+        error = ConnectionError(
+            "ERROR: Lost connection to SNI while waiting for a reply. Device info will be refreshed."
+        )
+        error.__cause__ = cause
+        self.__fail_pending_requests(error)
+
+    def __fail_pending_requests(self, error):
+        while self.pending_requests:
+            pending_request = self.pending_requests.popleft()
+            if not pending_request.future.done():
+                pending_request.future.set_exception(error)
+
+    async def device_list(self):
+        return await self.request("DeviceList", reply_size=0)
+
+    async def attach(self, device):
+        await self.request("Attach", [device])
+        return await self.info(force_refresh=True)
+
+    # Returns true if device info was received recently enough to still be trusted.
+    def is_device_info_fresh(self):
+        if self.device_info is None or self.device_info_timestamp is None:
+            return False
+        if self.device_info_ttl is None:
+            return True
+        return time.monotonic() - self.device_info_timestamp < self.device_info_ttl
+
+    # Forget cached device info, so that the next request checks the device again.
+    def invalidate_device_info(self):
+        self.device_info = None
+        self.device_info_timestamp = None
+
+    # Returns device info, sending an Info request unless cached device info is still fresh.
+    # Callers which need device info while a request for it is already on its way share that request.
+    # If force_refresh = True, always send the request.
+    async def info(self, force_refresh=False):
+        if not force_refresh and self.is_device_info_fresh():
+            return self.device_info
+        if force_refresh or self.info_task is None or self.info_task.done():
+            self.info_task = asyncio.ensure_future(self.__request_info())
+        return await asyncio.shield(self.info_task)
+
+    async def __request_info(self):
+        result = await self.request("Info", reply_size=0)
+        if len(result) < 1:
+            raise ConnectionError("ERROR: No device info could be found. Device has not successfully attached.")
+        self.device_info = result
+        self.device_info_timestamp = time.monotonic()
+        self.limiter.configure(result)
+        return result
+
+    # Get data at several addresses at once.
+    # Takes a list of (address, number of bytes) pairs, and returns a list with the bytes read from each.
+    # Reads from every caller are collected for read_coalesce_window seconds and merged,
+    # So this usually costs a single round trip no matter how many callers are reading.
+    # If check_rom_read = True, refuse to read from ROM on devices which don't support it.
+    async def read_many(self, ranges, check_rom_read=True):
+        ranges = [
+            (hex_to_int(address) if isinstance(address, str) else address, num_bytes) for address, num_bytes in ranges
+        ]
+        device_info = await self.info()
+        if check_rom_read and any(address < ROM_END_ADDRESS for address, num_bytes in ranges):
+            if "NO_ROM_READ" in device_info:
+                raise PermissionError(
+                    f"ERROR: An attempt was made to read from ROM, but this operation is not supported for device of type '{device_info[0]}'."
+                )
+        loop = asyncio.get_running_loop()
+        futures = []
+        for address, num_bytes in ranges:
+            future = loop.create_future()
+            self.queued_reads.append((address, num_bytes, future))
+            futures.append(future)
+        if self.read_flush_handle is None:
+            if self.read_coalesce_window > 0:
+                self.read_flush_handle = loop.call_later(self.read_coalesce_window, self.__flush_reads)
+            else:
+                self.read_flush_handle = loop.call_soon(self.__flush_reads)
+        return list(await asyncio.gather(*futures))
+
+    def __flush_reads(self):
+        self.read_flush_handle = None
+        queued_reads, self.queued_reads = self.queued_reads, []
+        sent = asyncio.get_running_loop().create_future()
+        self.read_sends.add(sent)
+        sent.add_done_callback(self.read_sends.discard)
+        asyncio.ensure_future(self.__send_reads(queued_reads, sent))
+
+    # Sends the queued reads as merged ranges, and slices each caller's data back out of them.
+    # sent is set once every request for them has been sent, or one of them failed.
+    async def __send_reads(self, queued_reads, sent):
+        merged_ranges = merge_read_ranges([(address, num_bytes) for address, num_bytes, future in queued_reads])
+        batches = []
+        for i in range(0, len(merged_ranges), MAX_READ_RANGES_PER_REQUEST):
+            batches.append(merged_ranges[i : i + MAX_READ_RANGES_PER_REQUEST])
+        unsent_batches = len(batches)
+
+        def on_sent():
+            nonlocal unsent_batches
+            unsent_batches -= 1
+            if unsent_batches == 0 and not sent.done():
+                sent.set_result(None)
+
+        if unsent_batches == 0:
+            sent.set_result(None)
+        try:
+            replies = await asyncio.gather(*[self.__send_read_batch(batch, on_sent) for batch in batches])
+        except Exception as e:
+            if not sent.done():
+                sent.set_result(None)
+            for address, num_bytes, future in queued_reads:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        merged_data = [data for reply in replies for data in reply]
+        merged_addresses = [address for address, num_bytes in merged_ranges]
+        for address, num_bytes, future in queued_reads:
+            index = bisect.bisect_right(merged_addresses, address) - 1
+            offset = address - merged_addresses[index]
+            if not future.done():
+                future.set_result(merged_data[index][offset : offset + num_bytes])
+
+    # Reads up to MAX_READ_RANGES_PER_REQUEST ranges with one GetAddress request.
+    async def __send_read_batch(self, batch, on_sent):
+        operands = []
+        for address, num_bytes in batch:
+            operands += [f"{address:X}", f"{num_bytes:X}"]
+        reply = await self.request(
+            "GetAddress", operands, sum(num_bytes for address, num_bytes in batch), on_sent=on_sent
+        )
+        # Data for all ranges comes back concatenated, in the order they were requested.
+        results = []
+        offset = 0
+        for address, num_bytes in batch:
+            results.append(reply[offset : offset + num_bytes])
+            offset += num_bytes
+        return results
+
+    async def read(self, address, num_bytes, check_rom_read=True):
+        return (await self.read_many([(address, num_bytes)], check_rom_read))[0]
+
+    # Write binary data to the specified address.
+    # If check_rom_write = True, refuse to write to ROM on devices which don't support it.
+    async def write(self, address, data, check_rom_write=True):
+        if isinstance(address, str):
+            address = hex_to_int(address)
+        device_info = await self.info()
+        if address < ROM_END_ADDRESS and check_rom_write:
+            if "NO_ROM_WRITE" in device_info:
+                raise PermissionError(
+                    f"ERROR: An attempt was made to write to ROM, but this operation is not supported for device of type '{device_info[0]}'."
+                )
+        # Reads issued before this write are sent first, rather than waiting out read_coalesce_window,
+        # So they see the device as it was when they were issued.
+        if self.read_flush_handle is not None:
+            self.read_flush_handle.cancel()
+            self.__flush_reads()
+        if self.read_sends:
+            await asyncio.wait(list(self.read_sends))
+        await self.request("PutAddress", [f"{address:X}", f"{len(data):X}"], data=bytes(data))
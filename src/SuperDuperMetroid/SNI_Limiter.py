@@ -0,0 +1,150 @@
+# SNI Limiter
+#
+# Keeps requests to SNI within what the device can handle.
+# Real hardware, such as an SD2SNES or FXPak over USB, answers far fewer requests per second than an emulator,
+# So the number of requests in flight and sent per second is capped depending on the device type.
+#
+# The cap on requests in flight adapts to how the device is responding:
+# It grows by one request per round trip while replies come back quickly,
+# Shrinks by one when the round trip time climbs well above the fastest seen, which means requests are queueing up,
+# And is halved when a request fails.
+# Requests over either cap wait for room, so producers which send too much are slowed down to the device's pace.
+#
+# get_retry_delay tells producers which poll on a timer, like the location poller or the event scheduler,
+# How long to wait before asking again, given how long a round trip takes and how many have failed.
+
+import asyncio
+import collections
+import time
+
+
+# Most requests in flight, and most requests sent per second.
+class DeviceLimits:
+    __slots__ = ("max_in_flight", "max_per_second")
+
+    def __init__(self, max_in_flight, max_per_second):
+        self.max_in_flight = max_in_flight
+        self.max_per_second = max_per_second
+
+
+# Limits by device type, as SNI reports it in the device info. Matched as a substring of the lowercased type.
+DEVICE_LIMITS = {
+    "fxpak": DeviceLimits(2, 40),
+    "sd2snes": DeviceLimits(2, 40),
+    # Lua scripts only answer once per frame.
+    "luabridge": DeviceLimits(2, 30),
+    "snesclassic": DeviceLimits(2, 30),
+    "retroarch": DeviceLimits(4, 120),
+    "emunw": DeviceLimits(8, 500),
+}
+
+# Used until device info is known, and for device types not listed above.
+DEFAULT_DEVICE_LIMITS = DeviceLimits(4, 60)
+
+# Weight of each new round trip time in the smoothed round trip time.
+RTT_SMOOTHING = 0.125
+
+# A round trip this many times slower than the fastest seen, and at least RTT_SATURATION_MARGIN seconds slower,
+# Means requests are queueing up in front of the device.
+RTT_SATURATION_FACTOR = 3.0
+RTT_SATURATION_MARGIN = 0.005
+
+# Producers wait at least this many round trips between polls.
+RTT_RETRY_MULTIPLE = 4
+
+# Each failure in a row doubles the retry delay, up to this many times.
+MAX_FAILURE_DOUBLINGS = 4
+
+
+# Returns the limits for a device, given its device info.
+def get_device_limits(device_info):
+    if device_info is None or len(device_info) < 2:
+        return DEFAULT_DEVICE_LIMITS
+    device_type = device_info[1].lower().replace(" ", "")
+    for name, limits in DEVICE_LIMITS.items():
+        if name in device_type:
+            return limits
+    return DEFAULT_DEVICE_LIMITS
+
+
+class AdaptiveLimiter:
+    def __init__(self, limits=DEFAULT_DEVICE_LIMITS):
+        self.limits = limits
+        # Current cap on requests in flight, between 1 and limits.max_in_flight.
+        # Kept as a float so it can grow by a fraction of a request for each reply.
+        self.in_flight_limit = float(limits.max_in_flight)
+        self.in_flight = 0
+        # time.monotonic times at which requests were sent, over the last second.
+        self.send_times = collections.deque()
+        self.smoothed_rtt = None
+        self.min_rtt = None
+        self.consecutive_failures = 0
+        # Set whenever a request finishes, so waiting requests can check for room again.
+        self.room_event = asyncio.Event()
+
+    # Use the limits for the device with this device info.
+    # What was learned about the device so far is kept, unless it turns out to be a different type of device.
+    def configure(self, device_info):
+        limits = get_device_limits(device_info)
+        if limits is not self.limits:
+            self.limits = limits
+            self.in_flight_limit = float(limits.max_in_flight)
+
+    # True if another request would have to wait for room.
+    def is_saturated(self):
+        self.__forget_old_send_times(time.monotonic())
+        return self.in_flight >= int(self.in_flight_limit) or len(self.send_times) >= self.limits.max_per_second
+
+    # Waits until there is room for another request, and reserves it.
+    # Every call has to be followed by a call to release.
+    async def acquire(self):
+        while True:
+            now = time.monotonic()
+            self.__forget_old_send_times(now)
+            if len(self.send_times) >= self.limits.max_per_second:
+                await asyncio.sleep(self.send_times[0] + 1.0 - now)
+                continue
+            if self.in_flight >= int(self.in_flight_limit):
+                self.room_event.clear()
+                await self.room_event.wait()
+                continue
+            self.in_flight += 1
+            self.send_times.append(now)
+            return
+
+    # Called when a request has finished. rtt is the round trip time in seconds, or None if it had no reply.
+    def release(self, rtt=None, failed=False):
+        self.in_flight -= 1
+        if failed:
+            self.consecutive_failures += 1
+            self.in_flight_limit = max(1.0, self.in_flight_limit / 2)
+        else:
+            self.consecutive_failures = 0
+            if rtt is not None:
+                self.__record_rtt(rtt)
+        self.room_event.set()
+
+    def __record_rtt(self, rtt):
+        self.min_rtt = rtt if self.min_rtt is None else min(self.min_rtt, rtt)
+        if self.smoothed_rtt is None:
+            self.smoothed_rtt = rtt
+        else:
+            self.smoothed_rtt += RTT_SMOOTHING * (rtt - self.smoothed_rtt)
+        if rtt > self.min_rtt * RTT_SATURATION_FACTOR and rtt > self.min_rtt + RTT_SATURATION_MARGIN:
+            self.in_flight_limit = max(1.0, self.in_flight_limit - 1)
+        else:
+            self.in_flight_limit = min(
+                float(self.limits.max_in_flight), self.in_flight_limit + 1 / max(self.in_flight_limit, 1.0)
+            )
+
+    # Returns how long a producer should wait before polling again, at least base_delay seconds.
+    # Slow devices and failing requests stretch the delay.
+    def get_retry_delay(self, base_delay):
+        delay = base_delay
+        if self.smoothed_rtt is not None:
+            delay = max(delay, self.smoothed_rtt * RTT_RETRY_MULTIPLE)
+        return delay * 2 ** min(self.consecutive_failures, MAX_FAILURE_DOUBLINGS)
+
+    def __forget_old_send_times(self, now):
+        while self.send_times and self.send_times[0] <= now - 1.0:
+            self.send_times.popleft()
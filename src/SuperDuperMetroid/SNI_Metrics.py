@@ -0,0 +1,130 @@
+# SNI Metrics
+#
+# Counts requests, bytes and latency for every exchange with SNI, per opcode and per caller.
+# The caller is whatever name is set with measure_as when the request is sent. The poller, item delivery and
+# RAM mirror set their own; anything else, such as tracker queries, is counted under DEFAULT_CALLER.
+#
+# Reads from several callers may be merged into one request, which is then counted for the caller that sent it.
+
+import asyncio
+import bisect
+import contextlib
+import contextvars
+import json
+import time
+
+DEFAULT_CALLER = "Tracker"
+
+# Upper bounds of the latency histogram buckets, in milliseconds. The last bucket holds everything slower.
+LATENCY_BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000)
+
+current_caller = contextvars.ContextVar("current_caller", default=DEFAULT_CALLER)
+
+
+# Counts requests sent while in this block under the given caller name.
+@contextlib.contextmanager
+def measure_as(caller):
+    token = current_caller.set(caller)
+    try:
+        yield
+    finally:
+        current_caller.reset(token)
+
+
+class OpcodeMetrics:
+    def __init__(self):
+        self.count = 0
+        self.failures = 0
+        # Bytes read by GetAddress, or written by PutAddress.
+        self.bytes = 0
+        self.total_latency = 0.0
+        self.max_latency = 0.0
+        self.latency_histogram = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+
+    def record(self, latency, num_bytes, failed):
+        self.count += 1
+        if failed:
+            self.failures += 1
+        self.bytes += num_bytes
+        self.total_latency += latency
+        self.max_latency = max(self.max_latency, latency)
+        self.latency_histogram[bisect.bisect_left(LATENCY_BUCKETS_MS, latency * 1000)] += 1
+
+    def to_dict(self):
+        return {
+            "count": self.count,
+            "failures": self.failures,
+            "bytes": self.bytes,
+            "mean_latency_ms": self.total_latency / self.count * 1000 if self.count else 0.0,
+            "max_latency_ms": self.max_latency * 1000,
+            "latency_histogram_ms": {
+                **{f"<={bound}": count for bound, count in zip(LATENCY_BUCKETS_MS, self.latency_histogram)},
+                f">{LATENCY_BUCKETS_MS[-1]}": self.latency_histogram[-1],
+            },
+        }
+
+
+class SNIMetrics:
+    def __init__(self):
+        # Caller name to opcode to OpcodeMetrics.
+        self.callers = {}
+        self.start_time = time.monotonic()
+        self.dump_task = None
+
+    # Called by SNIClient once a request has its reply, or has been sent if it expects none.
+    def record(self, opcode, latency, num_bytes=0, failed=False):
+        opcodes = self.callers.setdefault(current_caller.get(), {})
+        if opcode not in opcodes:
+            opcodes[opcode] = OpcodeMetrics()
+        opcodes[opcode].record(latency, num_bytes, failed)
+
+    # Returns everything recorded so far as a dict, with totals per opcode and a breakdown per caller.
+    def get_metrics(self):
+        elapsed = time.monotonic() - self.start_time
+        totals = {}
+        for opcodes in self.callers.values():
+            for opcode, opcode_metrics in opcodes.items():
+                total = totals.setdefault(opcode, OpcodeMetrics())
+                total.count += opcode_metrics.count
+                total.failures += opcode_metrics.failures
+                total.bytes += opcode_metrics.bytes
+                total.total_latency += opcode_metrics.total_latency
+                total.max_latency = max(total.max_latency, opcode_metrics.max_latency)
+                total.latency_histogram = [
+                    a + b for a, b in zip(total.latency_histogram, opcode_metrics.latency_histogram)
+                ]
+        return {
+            "elapsed_seconds": elapsed,
+            "requests_per_second": sum(total.count for total in totals.values()) / elapsed if elapsed > 0 else 0.0,
+            "opcodes": {opcode: total.to_dict() for opcode, total in totals.items()},
+            "callers": {
+                caller: {opcode: opcode_metrics.to_dict() for opcode, opcode_metrics in opcodes.items()}
+                for caller, opcodes in self.callers.items()
+            },
+        }
+
+    def reset(self):
+        self.callers = {}
+        self.start_time = time.monotonic()
+
+    # Writes get_metrics() to path as JSON every interval seconds, until stop_dumping is called.
+    def start_dumping(self, path, interval=60.0):
+        self.stop_dumping()
+        self.dump_task = asyncio.ensure_future(self.__dump_periodically(path, interval))
+
+    def stop_dumping(self):
+        if self.dump_task is not None:
+            self.dump_task.cancel()
+        self.dump_task = None
+
+    def dump(self, path):
+        with open(path, "w") as metrics_file:
+            json.dump(self.get_metrics(), metrics_file, indent=4)
+
+    async def __dump_periodically(self, path, interval):
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                self.dump(path)
+            except OSError as e:
+                print(f"WARNING: Could not write SNI metrics to '{path}': {e}")
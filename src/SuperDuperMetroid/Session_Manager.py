@@ -0,0 +1,106 @@
+# Session Manager
+#
+# Watches several devices from a single process, for example every player in a multiworld, or on a restream.
+# Each device gets its own session, an AsyncSuperMetroidInterface with its own state, event scheduler and poller,
+# So nothing one session does can leak into another.
+#
+# SNI attaches each websocket connection to a single device, so every session has its own connection to SNI.
+# Listing devices is done on one extra connection, which is kept for the life of the manager.
+# Sessions are opened a few at a time, so connecting to many devices at once doesn't flood SNI.
+
+import asyncio
+
+from SuperDuperMetroid.SM_Interface import AsyncSuperMetroidInterface
+from SuperDuperMetroid.SNI_Client import DEFAULT_SNI_ADDRESS, SNIClient
+
+# Most sessions which are connecting to SNI at the same time.
+MAX_CONCURRENT_CONNECTS = 4
+
+
+class SessionManager:
+    def __init__(self, address=DEFAULT_SNI_ADDRESS, max_concurrent_connects=MAX_CONCURRENT_CONNECTS):
+        self.address = address
+        # Device name to its AsyncSuperMetroidInterface.
+        self.sessions = {}
+        # Connection used only to list devices.
+        self.control_client = SNIClient()
+        self.connect_semaphore = asyncio.Semaphore(max_concurrent_connects)
+
+    def __len__(self):
+        return len(self.sessions)
+
+    def __contains__(self, device):
+        return device in self.sessions
+
+    def __iter__(self):
+        return iter(self.sessions)
+
+    # Returns the names of the devices SNI can see.
+    async def list_devices(self):
+        if not self.control_client.is_connected():
+            await self.control_client.connect(self.address)
+        return await self.control_client.device_list()
+
+    # Returns the session for a device, or None if no session is open for it.
+    def get_session(self, device):
+        return self.sessions.get(device)
+
+    # Opens a session attached to the named device, or returns the one already open.
+    async def open_session(self, device):
+        if device in self.sessions:
+            return self.sessions[device]
+        async with self.connect_semaphore:
+            client = SNIClient()
+            await client.connect(self.address)
+            interface = AsyncSuperMetroidInterface(client)
+            try:
+                await interface.connect_to_device(device)
+            except Exception:
+                await client.close()
+                raise
+        # Another caller may have opened the same session while we were connecting.
+        if device in self.sessions:
+            await interface.close_connection()
+            return self.sessions[device]
+        self.sessions[device] = interface
+        return interface
+
+    # Opens a session for every device SNI can see which doesn't have one yet.
+    # Devices which can't be connected to are skipped with a warning.
+    # Returns the sessions opened.
+    async def open_all_sessions(self):
+        devices = [device for device in await self.list_devices() if device not in self.sessions]
+        results = await asyncio.gather(*[self.open_session(device) for device in devices], return_exceptions=True)
+        opened = {}
+        for device, result in zip(devices, results):
+            if isinstance(result, Exception):
+                print(f"WARNING: Could not open a session for device '{device}': {result}")
+            else:
+                opened[device] = result
+        return opened
+
+    async def close_session(self, device):
+        interface = self.sessions.pop(device, None)
+        if interface is not None:
+            await interface.close_connection()
+
+    # Takes a snapshot of every session at once.
+    # Returns a dict of device name to GameSnapshot. Sessions which couldn't be read are left out with a warning.
+    async def snapshot_all(self):
+        devices = list(self.sessions)
+        results = await asyncio.gather(
+            *[self.sessions[device].snapshot() for device in devices], return_exceptions=True
+        )
+        snapshots = {}
+        for device, result in zip(devices, results):
+            if isinstance(result, Exception):
+                print(f"WARNING: Could not take a snapshot of device '{device}': {result}")
+            else:
+                snapshots[device] = result
+        return snapshots
+
+    # Closes every session, and the connection used to list devices.
+    async def close(self):
+        await asyncio.gather(*[self.close_session(device) for device in list(self.sessions)])
+        if self.control_client.is_connected():
+            await self.control_client.close()
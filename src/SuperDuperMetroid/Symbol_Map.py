@@ -0,0 +1,161 @@
+# Symbol Map
+#
+# Sidecar file written by the patcher next to each patched ROM, telling the interface where things ended up in it:
+# -Addresses of the item get routines in bank 85, which differ from seed to seed
+# -Item PLM IDs, including those of non-vanilla items
+# -Addresses of the item message tables, and of each item's message
+# -What was placed at each location
+#
+# The interface loads this instead of probing the ROM, so setting up costs no reads from the device.
+# Devices which can't read ROM have reads of the item tables the patcher fills in answered from it, see read_rom.
+# The file is versioned JSON, and records the title and checksum from the ROM's internal header,
+# So a symbol map can be matched to the ROM it was written for.
+
+import json
+from pathlib import Path
+
+from SuperDuperMetroid.Binary_Utils import pack_u16le, read_u16le
+from SuperDuperMetroid.SM_Constants import SuperMetroidConstants
+
+SYMBOL_MAP_VERSION = 1
+SYMBOL_MAP_SUFFIX = ".symbols.json"
+
+# Each item table holds a word for every pickup index.
+ITEM_TABLE_SIZE = 0x200
+# Item tables whose entries are recorded in the symbol map, see get_item_table_entry.
+ROM_READABLE_ITEM_TABLES = ("Message Content", "Item Routine")
+
+
+# Returns (title, checksum) from the internal ROM header, which tells ROMs apart.
+def get_rom_identity(header_data):
+    title = bytes(header_data[: SuperMetroidConstants.romTitleSize]).decode("ascii", "replace").rstrip(" \x00")
+    return title, read_u16le(header_data, SuperMetroidConstants.romChecksumOffset)
+
+
+# Converts a LoROM SNES address to an offset into a headerless ROM, which is also how SNI addresses ROM.
+def lorom_to_rom_offset(snes_address):
+    return ((snes_address >> 16) & 0x7F) * 0x8000 + (snes_address & 0x7FFF)
+
+
+# Returns where the symbol map for the ROM at rom_path is written.
+def get_symbol_map_path(rom_path):
+    return Path(rom_path).with_suffix(SYMBOL_MAP_SUFFIX)
+
+
+class SymbolMap:
+    def __init__(
+        self,
+        rom_title,
+        rom_checksum,
+        item_get_routine_addresses,
+        item_plm_ids,
+        message_table_addresses,
+        item_message_addresses,
+        locations,
+        non_vanilla_items=(),
+        item_table_entries=None,
+    ):
+        self.rom_title = rom_title
+        self.rom_checksum = rom_checksum
+        # Routine name, such as "Get Wave Beam" or "Get Missile Expansion 5", to its address in bank 85.
+        self.item_get_routine_addresses = dict(item_get_routine_addresses)
+        # Item name to its PLM ID.
+        self.item_plm_ids = dict(item_plm_ids)
+        # Table name to the SNES address of the table, see place_items.
+        self.message_table_addresses = dict(message_table_addresses)
+        # Item name to the address of its message in bank 85.
+        self.item_message_addresses = dict(item_message_addresses)
+        # Pickup index to a dict with the item_name, owner_name and quantity_given of what was placed there.
+        self.locations = {int(pickup_index): dict(location) for pickup_index, location in locations.items()}
+        self.non_vanilla_items = list(non_vanilla_items)
+        # Table name, one of ROM_READABLE_ITEM_TABLES, to a dict of pickup index to the word written for it.
+        self.item_table_entries = {
+            table_name: {int(pickup_index): entry for pickup_index, entry in entries.items()}
+            for table_name, entries in ({} if item_table_entries is None else item_table_entries).items()
+        }
+
+    # (title, checksum) of the ROM this symbol map was written for, as get_rom_identity returns it.
+    @property
+    def rom_identity(self):
+        return self.rom_title, self.rom_checksum
+
+    # Returns the address of the routine which gives the player an item, or None if this ROM has no such routine.
+    # Ammo items give the default quantity unless another is asked for.
+    def get_item_routine_address(self, item_name, quantity=None):
+        if item_name == "No Item":
+            return self.item_get_routine_addresses.get("No Effect")
+        if item_name in SuperMetroidConstants.ammoItemList:
+            if quantity is None:
+                quantity = SuperMetroidConstants.defaultAmmoItemToQuantity[item_name]
+            return self.item_get_routine_addresses.get(f"Get {item_name} {quantity}")
+        return self.item_get_routine_addresses.get(f"Get {item_name}")
+
+    # Returns the word the patcher wrote for a pickup in one of ROM_READABLE_ITEM_TABLES,
+    # Or None if the symbol map doesn't record one.
+    def get_item_table_entry(self, table_name, pickup_index):
+        return self.item_table_entries.get(table_name, {}).get(pickup_index)
+
+    # Answers a read of ROM from the item tables, for devices which can't read ROM.
+    # address is an offset into the ROM, like SNI uses.
+    # Returns the bytes, or None unless every one of them could be worked out.
+    def read_rom(self, address, num_bytes):
+        for table_name in ROM_READABLE_ITEM_TABLES:
+            table_address = self.message_table_addresses.get(table_name)
+            if table_address is None:
+                continue
+            start = address - lorom_to_rom_offset(table_address)
+            if start < 0 or start + num_bytes > ITEM_TABLE_SIZE:
+                continue
+            table_data = bytearray()
+            for pickup_index in range(start // 2, (start + num_bytes + 1) // 2):
+                entry = self.get_item_table_entry(table_name, pickup_index)
+                if entry is None:
+                    return None
+                table_data += pack_u16le(entry)
+            return bytes(table_data[start % 2 : start % 2 + num_bytes])
+        return None
+
+    def to_dict(self):
+        return {
+            "version": SYMBOL_MAP_VERSION,
+            "rom_title": self.rom_title,
+            "rom_checksum": self.rom_checksum,
+            "item_get_routine_addresses": self.item_get_routine_addresses,
+            "item_plm_ids": self.item_plm_ids,
+            "message_table_addresses": self.message_table_addresses,
+            "item_message_addresses": self.item_message_addresses,
+            "locations": {str(pickup_index): location for pickup_index, location in self.locations.items()},
+            "non_vanilla_items": self.non_vanilla_items,
+            "item_table_entries": {
+                table_name: {str(pickup_index): entry for pickup_index, entry in entries.items()}
+                for table_name, entries in self.item_table_entries.items()
+            },
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        if data.get("version") != SYMBOL_MAP_VERSION:
+            raise ValueError(
+                f"ERROR: Symbol map has version {data.get('version')}, but only version {SYMBOL_MAP_VERSION} is supported. Patch the ROM again to get a new one."
+            )
+        return cls(
+            data["rom_title"],
+            data["rom_checksum"],
+            data["item_get_routine_addresses"],
+            data["item_plm_ids"],
+            data["message_table_addresses"],
+            data["item_message_addresses"],
+            data["locations"],
+            data["non_vanilla_items"],
+            # Not in symbol maps written before it was added.
+            data.get("item_table_entries"),
+        )
+
+    def save(self, path):
+        with open(path, "w") as symbol_map_file:
+            json.dump(self.to_dict(), symbol_map_file, separators=(",", ":"))
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "r") as symbol_map_file:
+            return cls.from_dict(json.load(symbol_map_file))
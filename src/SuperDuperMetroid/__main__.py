@@ -10,6 +10,8 @@ def main():
     parser.add_argument("--input-rom-path", type=Path, required=True)
     parser.add_argument("--output-rom-path", type=Path, required=True)
     parser.add_argument("--json-path", type=Path, required=True)
+    # Keeps the room headers and doors read from the input ROM on disk, so patching the same ROM again is faster.
+    parser.add_argument("--room-index-cache-dir", type=Path)
     args = parser.parse_args()
 
     rom_file = BytesIO(args.input_rom_path.read_bytes())
@@ -17,7 +19,7 @@ def main():
     with args.json_path.open() as json_contents:
         patch_data = json.load(json_contents)
 
-    patch_rom_json(rom_file, args.output_rom_path, patch_data)
+    patch_rom_json(rom_file, args.output_rom_path, patch_data, args.room_index_cache_dir)
 
 
 if __name__ == "__main__":
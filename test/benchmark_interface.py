@@ -0,0 +1,109 @@
+# Interface benchmarks, run against the SNI stand-in server.
+#
+# Usage, from the test directory:
+#   python benchmark_interface.py [--latency SECONDS] [--jitter SECONDS] [--items N] [--duration SECONDS]
+#
+# Measures:
+# -Item delivery latency: time from receive_item until the game has shown every item.
+# -Poll cost: requests, bytes and time taken by one snapshot, and by one player state check.
+# -Requests per second: single reads sent back to back, and pipelined.
+
+import argparse
+import asyncio
+import time
+
+from sni_stand_in import SNIStandInServer, make_item_ring_consumer, set_game_state
+
+from SuperDuperMetroid.SM_Interface import AsyncSuperMetroidInterface
+
+
+async def connect(server):
+    interface = AsyncSuperMetroidInterface()
+    await interface.initialize_connection(server.address)
+    await interface.connect_to_device()
+    return interface
+
+
+def count_requests(server, since):
+    requests = server.device.requests[since:]
+    num_bytes = 0
+    for request in requests:
+        if request["Opcode"] == "GetAddress":
+            num_bytes += sum(int(operand, 16) for operand in request["Operands"][1::2])
+    return len(requests), num_bytes
+
+
+async def benchmark_item_delivery(server, interface, num_items):
+    interface.eventScheduler.retry_interval = 0.01
+    interface.itemRoutineDict["Wave Beam"] = 0x9ABC
+    consumer = make_item_ring_consumer()
+    server.frame_hooks.append(consumer)
+    set_game_state(server.device, 0x08)
+    since = len(server.device.requests)
+    start = time.perf_counter()
+    for i in range(num_items):
+        await interface.receive_item("Wave Beam", "Galactic Federation HQ")
+    while len(interface.eventScheduler) > 0 or interface.queuedItemDeliveries:
+        await asyncio.sleep(0.001)
+    elapsed = time.perf_counter() - start
+    server.frame_hooks.remove(consumer)
+    num_requests, num_bytes = count_requests(server, since)
+    print(
+        f"Item delivery: {num_items} items shown in {elapsed * 1000:.1f} ms, "
+        f"{num_requests} requests, {num_bytes} bytes read."
+    )
+
+
+async def benchmark_poll_cost(server, interface, repeats=50):
+    for name, poll in (("Snapshot", interface.snapshot), ("Player state", interface.get_player_state)):
+        since = len(server.device.requests)
+        start = time.perf_counter()
+        for i in range(repeats):
+            interface.playerState = None
+            await poll()
+        elapsed = time.perf_counter() - start
+        num_requests, num_bytes = count_requests(server, since)
+        print(
+            f"{name}: {elapsed / repeats * 1000:.2f} ms, {num_requests / repeats:.1f} requests, "
+            f"{num_bytes / repeats:.0f} bytes read per poll."
+        )
+
+
+async def benchmark_requests_per_second(interface, duration):
+    client = interface.client
+
+    async def read_back_to_back():
+        count = 0
+        end = time.perf_counter() + duration
+        while time.perf_counter() < end:
+            await client.request("GetAddress", ["F50998", "1"], 1)
+            count += 1
+        return count
+
+    count = await read_back_to_back()
+    print(f"Back to back: {count / duration:.0f} requests per second.")
+    counts = await asyncio.gather(*[read_back_to_back() for i in range(8)])
+    print(f"Pipelined, 8 in flight: {sum(counts) / duration:.0f} requests per second.")
+
+
+async def main(arguments):
+    server = SNIStandInServer(latency=arguments.latency, jitter=arguments.jitter)
+    await server.start()
+    interface = await connect(server)
+    try:
+        print(f"Latency {arguments.latency * 1000:.1f} ms, jitter {arguments.jitter * 1000:.1f} ms.")
+        await benchmark_item_delivery(server, interface, arguments.items)
+        await benchmark_poll_cost(server, interface)
+        await benchmark_requests_per_second(interface, arguments.duration)
+    finally:
+        await interface.close_connection()
+        await server.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the Super Metroid interface against a local SNI stand-in.")
+    parser.add_argument("--latency", type=float, default=0.002, help="Seconds added to every reply.")
+    parser.add_argument("--jitter", type=float, default=0.001, help="Up to this many more seconds added at random.")
+    parser.add_argument("--items", type=int, default=20, help="Number of items to deliver.")
+    parser.add_argument("--duration", type=float, default=1.0, help="Seconds to send requests for.")
+    asyncio.run(main(parser.parse_args()))
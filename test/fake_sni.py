@@ -0,0 +1,63 @@
+import asyncio
+import json
+
+
+# Stands in for a device attached to SNI.
+# Answers DeviceList, Info and GetAddress requests from its own memory, applies PutAddress writes to it,
+# And records every opcode sent.
+class FakeSNIDevice:
+    def __init__(self):
+        self.opcodes = []
+        self.requests = []
+        # The whole 16 MB SNES address space, as SNI addresses it.
+        self.memory = bytearray(0x1000000)
+        self.device_info = ["1.0", "emunw", "Super Metroid", "NO_ROM_WRITE"]
+        self.pending_write_address = None
+
+    # Handles one message from the client, and returns the messages to reply with.
+    def handle(self, message):
+        if isinstance(message, bytes):
+            self.memory[self.pending_write_address : self.pending_write_address + len(message)] = message
+            return []
+        request = json.loads(message)
+        self.opcodes.append(request["Opcode"])
+        self.requests.append(request)
+        if request["Opcode"] == "DeviceList":
+            return [json.dumps({"Results": ["Fake SNES"]})]
+        if request["Opcode"] == "Info":
+            return [json.dumps({"Results": self.device_info})]
+        if request["Opcode"] == "GetAddress":
+            operands = [int(operand, 16) for operand in request["Operands"]]
+            reply = bytearray()
+            for address, num_bytes in zip(operands[::2], operands[1::2]):
+                reply += self.memory[address : address + num_bytes]
+            # Split the reply in two, like SNI may do with large reads.
+            return [bytes(reply[: len(reply) // 2]), bytes(reply[len(reply) // 2 :])]
+        if request["Opcode"] == "PutAddress":
+            self.pending_write_address = int(request["Operands"][0], 16)
+        return []
+
+
+# Stands in for the websocket connection to SNI, answering from a FakeSNIDevice in the same process.
+class FakeSNISocket(FakeSNIDevice):
+    def __init__(self):
+        super().__init__()
+        self.replies = asyncio.Queue()
+        # While set, replies are only sent once it is cleared.
+        self.hold_replies = asyncio.Event()
+        self.fail = False
+
+    async def send(self, message):
+        if self.fail:
+            raise OSError("Socket closed")
+        for reply in self.handle(message):
+            self.replies.put_nowait(reply)
+
+    async def recv(self):
+        reply = await self.replies.get()
+        while self.hold_replies.is_set():
+            await asyncio.sleep(0.01)
+        return reply
+
+    async def close(self):
+        pass
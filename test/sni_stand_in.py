@@ -0,0 +1,146 @@
+# SNI Stand-In
+#
+# A local websocket server which speaks the parts of SNI's protocol the interface uses,
+# Backed by a FakeSNIDevice, so the interface can be exercised and measured without SNI or a console.
+# Several named devices can be served at once. Each connection talks to the device it attached to, like with SNI.
+#
+# Replies are delayed by latency seconds, plus up to jitter seconds more, as if they had to travel to a device and back.
+# Replies never overtake each other, so several requests can be in flight at once, like with SNI.
+#
+# Frame hooks run once per frame while the server runs, and can change the device's memory
+# The way the game would, for example to show items waiting in the multiworld item ring buffer.
+
+import asyncio
+import json
+import random
+import time
+
+import websockets
+
+from fake_sni import FakeSNIDevice
+
+FRAMES_PER_SECOND = 60
+
+# Addresses used by the frame hooks below, as SNI addresses them.
+FRAME_COUNTER_ADDRESS = 0xF505B6
+GAME_STATE_ADDRESS = 0xF50998
+EVENT_SLOT_ADDRESS = 0xF50A42
+ITEM_RING_HEAD_ADDRESS = 0xF6FF50
+ITEM_RING_TAIL_ADDRESS = 0xF6FF52
+ORIGINAL_EVENT_SLOT_ADDRESS = 0xF6FF80
+
+
+def read_word(memory, address):
+    return int.from_bytes(memory[address : address + 2], "little")
+
+
+def write_word(memory, address, value):
+    memory[address : address + 2] = (value & 0xFFFF).to_bytes(2, "little")
+
+
+class SNIStandInServer:
+    # devices maps device names, as listed by DeviceList, to FakeSNIDevices.
+    # If not given, a single device is served, which is device if given.
+    def __init__(self, device=None, latency=0.0, jitter=0.0, devices=None):
+        if devices is None:
+            devices = {"Fake SNES": FakeSNIDevice() if device is None else device}
+        self.devices = devices
+        # Connections talk to the first device until they attach to another.
+        self.device = next(iter(devices.values()))
+        self.latency = latency
+        self.jitter = jitter
+        # Callables taking the device, run once per frame.
+        self.frame_hooks = [advance_frame_counter]
+        self.frame = 0
+        self.server = None
+        self.frame_task = None
+
+    @property
+    def address(self):
+        host, port = self.server.sockets[0].getsockname()[:2]
+        return f"ws://{host}:{port}"
+
+    # Starts serving. A port of 0 picks any free port, see address.
+    async def start(self, host="127.0.0.1", port=0):
+        self.server = await websockets.serve(self.__handle_connection, host, port, max_size=None)
+        self.frame_task = asyncio.ensure_future(self.__run_frames())
+
+    async def close(self):
+        if self.frame_task is not None:
+            self.frame_task.cancel()
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+
+    async def __run_frames(self):
+        while True:
+            await asyncio.sleep(1 / FRAMES_PER_SECOND)
+            self.frame += 1
+            for frame_hook in list(self.frame_hooks):
+                for device in self.devices.values():
+                    frame_hook(device)
+
+    async def __handle_connection(self, connection):
+        # (time due, reply) for each reply waiting to be sent, in order.
+        replies = asyncio.Queue()
+        sender_task = asyncio.ensure_future(self.__send_replies(connection, replies))
+        last_due = 0.0
+        device = self.device
+        try:
+            async for message in connection:
+                opcode = None if isinstance(message, bytes) else json.loads(message)["Opcode"]
+                if opcode == "Attach":
+                    device = self.devices[json.loads(message)["Operands"][0]]
+                device_replies = device.handle(message)
+                if opcode == "DeviceList":
+                    device_replies = [json.dumps({"Results": list(self.devices)})]
+                for reply in device_replies:
+                    due = max(last_due, time.monotonic() + self.latency + random.uniform(0, self.jitter))
+                    replies.put_nowait((due, reply))
+                    last_due = due
+        except websockets.ConnectionClosed:
+            pass
+        finally:
+            sender_task.cancel()
+
+    async def __send_replies(self, connection, replies):
+        while True:
+            due, reply = await replies.get()
+            delay = due - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            await connection.send(reply)
+
+
+# Counts frames, like the game does at $7E:05B6.
+def advance_frame_counter(device):
+    write_word(device.memory, FRAME_COUNTER_ADDRESS, read_word(device.memory, FRAME_COUNTER_ADDRESS) + 1)
+
+
+# Returns a frame hook which does what our routine in bank 83 does with the multiworld item ring buffer,
+# Taking frames_per_item frames to show each item, as if the player dismissed each message box at once.
+def make_item_ring_consumer(frames_per_item=1):
+    # Frames waited so far, per device.
+    frames_waited = {}
+
+    def consume_item_ring(device):
+        memory = device.memory
+        if read_word(memory, EVENT_SLOT_ADDRESS) != 0xFFF0:
+            return
+        frames_waited[device] = frames_waited.get(device, 0) + 1
+        if frames_waited[device] < frames_per_item:
+            return
+        frames_waited[device] = 0
+        tail = read_word(memory, ITEM_RING_TAIL_ADDRESS)
+        if tail != read_word(memory, ITEM_RING_HEAD_ADDRESS):
+            tail = (tail + 1) & 0xFFFF
+            write_word(memory, ITEM_RING_TAIL_ADDRESS, tail)
+        if tail == read_word(memory, ITEM_RING_HEAD_ADDRESS):
+            write_word(memory, EVENT_SLOT_ADDRESS, read_word(memory, ORIGINAL_EVENT_SLOT_ADDRESS))
+
+    return consume_item_ring
+
+
+# Puts the fake game into the given state, for example 0x08 for in game or 0x0F for paused.
+def set_game_state(device, game_state_value):
+    device.memory[GAME_STATE_ADDRESS] = game_state_value
@@ -0,0 +1,21 @@
+from SuperDuperMetroid import Binary_Utils
+
+
+def test_little_endian_round_trip():
+    data = Binary_Utils.int_to_le_bytes(0xF509C6, 3)
+    assert data == bytes([0xC6, 0x09, 0xF5])
+    assert Binary_Utils.le_bytes_to_int(data) == 0xF509C6
+    assert Binary_Utils.read_u24le(data) == 0xF509C6
+    assert Binary_Utils.read_u16le(data, 1) == 0xF509
+    assert Binary_Utils.read_u8(data, 2) == 0xF5
+    assert Binary_Utils.pack_u16le(0x65AD) == bytes([0xAD, 0x65])
+    assert Binary_Utils.read_u32le(bytes([0x78, 0x56, 0x34, 0x12])) == 0x12345678
+
+
+def test_hex_helpers():
+    assert Binary_Utils.int_to_le_hex(0x1234) == "3412"
+    assert Binary_Utils.int_to_le_hex(0x06, 2) == "06"
+    assert Binary_Utils.reverse_endianness("F0FF") == "FFF0"
+    assert Binary_Utils.pad_hex("95", 4) == "0095"
+    assert Binary_Utils.data_to_hex(b"\x0a\xff") == "0AFF"
+    assert Binary_Utils.int_to_hex(0xF50000) == "F50000"
@@ -0,0 +1,138 @@
+import asyncio
+import time
+
+import pytest
+
+from SuperDuperMetroid.Event_Scheduler import EventScheduler
+from SuperDuperMetroid.Frame_Clock import FRAME_DURATION, FrameClock
+from SuperDuperMetroid.SNI_Limiter import AdaptiveLimiter
+
+
+# Runs test_function with a scheduler whose readiness is controlled by the test.
+def run_with_scheduler(test_function, **kwargs):
+    async def run():
+        ready = {"value": True, "checks": 0}
+
+        async def is_ready():
+            ready["checks"] += 1
+            return ready["value"]
+
+        scheduler = EventScheduler(is_ready, retry_interval=0.01, **kwargs)
+        try:
+            await test_function(scheduler, ready)
+        finally:
+            scheduler.stop()
+
+    asyncio.run(run())
+
+
+def test_events_run_in_order_on_one_worker():
+    async def test(scheduler, ready):
+        results = []
+
+        async def event(value):
+            results.append(value)
+            return value
+
+        events = [scheduler.schedule(event, [i]) for i in range(5)]
+        worker_task = scheduler.worker_task
+        assert await asyncio.gather(*[event.future for event in events]) == list(range(5))
+        assert results == list(range(5))
+        # The worker stays around for the next event.
+        await asyncio.sleep(0.05)
+        assert scheduler.worker_task is worker_task and scheduler.is_running()
+        assert await asyncio.wait_for(scheduler.schedule(event, [5]).future, 1) == 5
+
+    run_with_scheduler(test)
+
+
+def test_retry_delay_does_not_grow():
+    async def test(scheduler, ready):
+        ready["value"] = False
+
+        async def event():
+            return "done"
+
+        scheduled_event = scheduler.schedule(event)
+        await asyncio.sleep(0.5)
+        # Growing backoff would have checked only a handful of times.
+        assert ready["checks"] >= 10
+        ready["value"] = True
+        assert await asyncio.wait_for(scheduled_event.future, 0.2) == "done"
+
+    run_with_scheduler(test)
+
+
+def test_coalescing_sums_amounts():
+    async def test(scheduler, ready):
+        ready["value"] = False
+        granted = []
+
+        async def grant(item_name, amount):
+            granted.append((item_name, amount))
+
+        for i in range(8):
+            scheduler.schedule(grant, ["Missile Expansion"], coalesce_key="Missile Expansion", amount=5)
+        scheduler.schedule(grant, ["Power Bomb Expansion"], coalesce_key="Power Bomb Expansion", amount=5)
+        assert len(scheduler) == 2
+        ready["value"] = True
+        await asyncio.sleep(0.1)
+        assert granted == [("Missile Expansion", 40), ("Power Bomb Expansion", 5)]
+        # Once the merged event has run, new grants start a new event.
+        scheduler.schedule(grant, ["Missile Expansion"], coalesce_key="Missile Expansion", amount=5)
+        await asyncio.sleep(0.05)
+        assert granted[-1] == ("Missile Expansion", 5)
+
+    run_with_scheduler(test)
+
+
+def test_cancelled_and_expired_events_are_dropped():
+    async def test(scheduler, ready):
+        ready["value"] = False
+        results = []
+
+        async def event(value):
+            results.append(value)
+
+        cancelled_event = scheduler.schedule(event, ["cancelled"])
+        expired_event = scheduler.schedule(event, ["expired"], timeout=0.01)
+        kept_event = scheduler.schedule(event, ["kept"])
+        cancelled_event.cancel()
+        await asyncio.sleep(0.1)
+        ready["value"] = True
+        await asyncio.wait_for(kept_event.future, 1)
+        assert results == ["kept"]
+        assert cancelled_event.future.cancelled()
+        with pytest.raises(TimeoutError):
+            expired_event.future.result()
+
+    run_with_scheduler(test)
+
+
+def test_retry_delay_follows_the_limiter():
+    async def test(scheduler, ready):
+        assert scheduler.get_retry_delay() == 0.01
+        scheduler.limiter = AdaptiveLimiter()
+        scheduler.limiter.release(0.05)
+        # Four round trips to a slow device.
+        assert scheduler.get_retry_delay() == 0.2
+        scheduler.limiter.release(failed=True)
+        assert scheduler.get_retry_delay() == 0.4
+
+    run_with_scheduler(test)
+
+
+def test_retry_delay_is_counted_in_frames():
+    async def test(scheduler, ready):
+        frame_clock = FrameClock()
+        scheduler.frame_clock = frame_clock
+        scheduler.retry_frames = 6
+        frame_clock.observe(100, time.monotonic())
+        # The next check is aimed at six frames after the one last seen.
+        assert 5 * FRAME_DURATION < scheduler.get_retry_delay() <= 6 * FRAME_DURATION + FRAME_DURATION / 8
+        # The game stopped running frames, so back off from the retry interval.
+        frame_clock.observe(100, time.monotonic() + 1.0)
+        frame_clock.observe(100, time.monotonic() + 2.0)
+        assert scheduler.get_retry_delay() == 0.04
+
+    run_with_scheduler(test)
@@ -0,0 +1,52 @@
+import pytest
+
+from SuperDuperMetroid.Frame_Clock import FRAME_DURATION, WRITE_MARGIN, FrameClock
+
+
+def test_reads_narrow_down_frame_starts():
+    frame_clock = FrameClock()
+    assert not frame_clock.is_synced()
+    assert frame_clock.get_write_delay(0.01, now=100.0) == 0.0
+    # Frame 10 started at 100.0, and each read is answered 5 ms after it was sent.
+    frame_clock.observe(10, 100.0 + 0.3 * FRAME_DURATION + 0.005, rtt=0.01)
+    frame_clock.observe(13, 100.0 + 3.9 * FRAME_DURATION + 0.005, rtt=0.01)
+    frame_clock.observe(15, 100.0 + 5.1 * FRAME_DURATION + 0.005, rtt=0.01)
+    assert frame_clock.frames_elapsed == 2 and frame_clock.frame_count == 15
+    assert frame_clock.get_frame_start(10) == pytest.approx(100.0 + 0.1 * FRAME_DURATION)
+    assert frame_clock.get_frame_start(10) - frame_clock.earliest_frame_origin - 10 * FRAME_DURATION < FRAME_DURATION
+    # A write sent halfway through frame 16 lands early in frame 17.
+    now = 100.0 + 6.5 * FRAME_DURATION
+    delay = frame_clock.get_write_delay(0.01, now=now)
+    assert now + delay + 0.005 == pytest.approx(frame_clock.get_frame_start(17) + WRITE_MARGIN)
+    assert 0.0 <= delay < FRAME_DURATION
+
+
+def test_frame_counter_wraps_and_resets():
+    frame_clock = FrameClock()
+    frame_clock.observe(0xFFFF, 100.0)
+    frame_clock.observe(0x0001, 100.0 + 2 * FRAME_DURATION)
+    assert frame_clock.frames_elapsed == 2 and frame_clock.frame_count == 0x10001
+    # The game was reset, so what was known about frame starts no longer fits.
+    frame_clock.observe(0x0005, 100.0 + 2.5 * FRAME_DURATION)
+    assert frame_clock.latest_frame_origin == pytest.approx(100.0 + 2.5 * FRAME_DURATION - 0x10005 * FRAME_DURATION)
+    # Replies older than the last one tell us nothing new.
+    frame_clock.observe(0x0009, 100.0)
+    assert frame_clock.frame_counter == 0x0005
+    frame_clock.clear()
+    assert not frame_clock.is_synced()
+
+
+def test_stalled_frame_counter_backs_off():
+    frame_clock = FrameClock()
+    frame_clock.observe(20, 100.0)
+    # Reads within a frame of each other can see the same frame.
+    frame_clock.observe(20, 100.0 + 0.5 * FRAME_DURATION)
+    assert frame_clock.stalled_reads == 0 and frame_clock.get_stall_backoff() == 1
+    for i in range(5):
+        frame_clock.observe(20, 101.0 + i)
+    assert frame_clock.stalled_reads == 5 and frame_clock.get_stall_backoff() == 8
+    frame_clock.observe(21, 107.0)
+    assert frame_clock.stalled_reads == 0
+    # Waits are counted from the frame last seen, but are never shorter than a frame.
+    assert frame_clock.get_delay_until_frame(6, now=107.0) == pytest.approx(6 * FRAME_DURATION + WRITE_MARGIN)
+    assert frame_clock.get_delay_until_frame(6, now=108.0) == FRAME_DURATION
@@ -0,0 +1,18 @@
+from io import BytesIO
+
+from SuperDuperMetroid.IPS_Patcher import IPSPatcher
+
+
+def test_apply_ips_patch(tmp_path):
+    ips_path = tmp_path.joinpath("test.ips")
+    # One regular hunk at 0x000002 and one RLE hunk at 0x000010.
+    ips_path.write_bytes(
+        b"PATCH" + bytes.fromhex("000002" "0003" "AABBCC") + bytes.fromhex("000010" "0000" "0004" "EE") + b"EOF"
+    )
+    rom_file = BytesIO(bytes(0x20))
+    IPSPatcher.apply_ips_patch(ips_path, rom_file)
+    rom = rom_file.getvalue()
+    assert rom[0x02:0x05] == bytes([0xAA, 0xBB, 0xCC])
+    assert rom[0x10:0x14] == bytes([0xEE] * 4)
+    assert rom[0x05:0x10] == bytes(0x0B)
+    assert rom[0x14:] == bytes(0x0C)
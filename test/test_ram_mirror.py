@@ -0,0 +1,79 @@
+import asyncio
+
+from fake_sni import FakeSNISocket
+
+from SuperDuperMetroid.RAM_Mirror import RamMirror
+from SuperDuperMetroid.SNI_Client import SNIClient
+
+REGIONS = {
+    "Frame Counter": (0xF505B6, 2),
+    "Game State": (0xF50998, 1),
+    "Location Bitflags": (0xF6FFD0, 32),
+}
+
+
+def run_with_mirror(test_function):
+    async def run():
+        client = SNIClient(FakeSNISocket())
+        mirror = RamMirror(client, REGIONS, interval=0.01, frame_counter_region="Frame Counter")
+        await test_function(mirror, client.web_socket)
+
+    asyncio.run(run())
+
+
+def test_refresh_reads_all_regions_at_once():
+    async def test(mirror, socket):
+        socket.memory[0xF50998] = 0x08
+        await mirror.refresh()
+        assert socket.opcodes == ["Info", "GetAddress"]
+        assert mirror.read(0xF50998, 1) == bytes([0x08])
+        assert mirror.read(0xF6FFD4, 2) == bytes(2)
+        # Not mirrored.
+        assert mirror.read(0xF509A2, 2) is None
+
+    run_with_mirror(test)
+
+
+def test_watchers_are_told_about_changes():
+    async def test(mirror, socket):
+        changes = []
+        mirror.watch(0xF6FFD0, 2, lambda old, new: changes.append((old, new)))
+        mirror.watch(0xF50998, 1, lambda old, new: changes.append("game state"))
+        await mirror.refresh()
+        socket.memory[0xF6FFD1] = 0x04
+        await mirror.refresh()
+        # The frame counter hasn't moved, so the game hasn't run and the new copy is ignored.
+        assert changes == []
+        socket.memory[0xF505B6] = 0x01
+        await mirror.refresh()
+        assert changes == [(bytes(2), bytes([0x00, 0x04]))]
+
+    run_with_mirror(test)
+
+
+def test_own_writes_are_applied_to_the_copy():
+    async def test(mirror, socket):
+        changes = []
+        mirror.watch(0xF6FFD0, 32, lambda old, new: changes.append(new))
+        await mirror.refresh()
+        await mirror.client.write(0xF6FFCE, bytes([0xAA, 0xBB, 0xCC, 0xDD]))
+        mirror.apply_write(0xF6FFCE, bytes([0xAA, 0xBB, 0xCC, 0xDD]))
+        assert mirror.read(0xF6FFD0, 2) == bytes([0xCC, 0xDD])
+        socket.memory[0xF505B6] = 0x01
+        await mirror.refresh()
+        assert changes == []
+
+    run_with_mirror(test)
+
+
+def test_periodic_refresh():
+    async def test(mirror, socket):
+        mirror.start()
+        for frame in range(1, 4):
+            socket.memory[0xF505B6] = frame
+            await asyncio.sleep(0.05)
+        mirror.stop()
+        assert mirror.frame_counter == 3
+        assert not mirror.is_running()
+
+    run_with_mirror(test)
@@ -1,3 +1,8 @@
+import random
+from io import BytesIO
+
+import pytest
+
 from SuperDuperMetroid import ROM_Patcher
 
 romSize = 3145728
@@ -221,15 +226,20 @@ def test_write_multiworld_routines():
         ROM_Patcher.write_multiworld_routines(f)
 
         # Assert the presence of routines
-        assert is_file_byte_range_empty(f, b"\0", 0, 0x01AD66)
-        assert not is_file_byte_range_empty(f, b"\0", 0x01AD66, (0x01AD66 + 22))
-        assert is_file_byte_range_empty(f, b"\0", (0x01AD66 + 22), 0x087FF0)
+        assert is_file_byte_range_empty(f, b"\0", 0, 0x01AE00)
+        assert not is_file_byte_range_empty(f, b"\0", 0x01AE00, (0x01AE00 + 109))
+        assert is_file_byte_range_empty(f, b"\0", (0x01AE00 + 109), 0x087FF0)
         assert not is_file_byte_range_empty(f, b"\0", 0x087FF0, (0x087FF0 + 13))
         assert is_file_byte_range_empty(f, b"\0", (0x087FF0 + 13), romSize)
         # Assert the correctness of routine data
-        f.seek(0x01AD66)
-        item_get_routine = hex_to_data("AD1F1C22808085A900008F74FF7FAF80FF7F8D420A6B")
-        item_get_bytes = f.read(22)
+        f.seek(0x01AE00)
+        item_get_routine = hex_to_data(
+            "08C230AF52FF7F2907000A480A0A186301AA68"
+            "BF00FF7F8F76FF7FBF02FF7F8F78FF7FBF04FF7F8F7AFF7FBF06FF7F8F7CFF7FBF08FF7F8F7EFF7F"
+            "A901008F74FF7FA910008D1F1C22808085C230A900008F74FF7F"
+            "AF52FF7F1A8F52FF7FCF50FF7FD007AF80FF7F8D420A286B"
+        )
+        item_get_bytes = f.read(109)
         f.seek(0x087FF0)
         execute_multiworld_routine = hex_to_data("E220A98348C220AF72FF7F486B")
         multi_exec_bytes = f.read(13)
@@ -238,3 +248,119 @@ def test_write_multiworld_routines():
     except Exception:
         f.close()
         raise
+
+
+# Builds the example seed, with the items moved to other locations when shuffle_seed is given.
+def create_example_pickups(shuffle_seed=None):
+    pickups = ROM_Patcher.raw_randomized_example_item_pickup_data()
+    for pickup in pickups:
+        pickup.pickup_effect = "Get " + pickup.item_name
+        pickup.native_sprite_name = pickup.item_name
+    if shuffle_seed is not None:
+        pickup_indices = [pickup.pickup_index for pickup in pickups]
+        random.Random(shuffle_seed).shuffle(pickup_indices)
+        for pickup, pickup_index in zip(pickups, pickup_indices):
+            pickup.pickup_index = pickup_index
+    return pickups
+
+
+def test_item_planning_is_shared_between_placements():
+    vanilla_pickups = create_example_pickups()
+    shuffled_pickups = create_example_pickups(1234)
+    assert ROM_Patcher.get_pickup_key(vanilla_pickups) == ROM_Patcher.get_pickup_key(shuffled_pickups)
+
+    routines = ROM_Patcher.get_all_necessary_pickup_routines(
+        vanilla_pickups, ROM_Patcher.get_equipment_routines(), [], None
+    )
+    shuffled_routines = ROM_Patcher.get_all_necessary_pickup_routines(
+        shuffled_pickups, ROM_Patcher.get_equipment_routines(), [], None
+    )
+    assert list(routines.items()) == list(shuffled_routines.items())
+    assert routines["Get Missile Expansion 6"] == hex_to_data("ADC80918690600" + "8DC809ADC609186906008DC60922CF998060")
+    item_get_routine_addresses_dict = {routine_name: 0x9000 + i for i, routine_name in enumerate(routines)}
+
+    roms = []
+    for pickups in (vanilla_pickups, shuffled_pickups):
+        rom_file = BytesIO(bytes(romSize))
+        ROM_Patcher.place_items(rom_file, item_get_routine_addresses_dict, pickups)
+        roms.append(rom_file.getvalue())
+    assert ROM_Patcher.plan_item_layout.cache_info().hits >= 1
+
+    # Kazuto's patch, PLM headers and item graphics are identical, only the placements differ.
+    assert roms[0][0x026099:0x027000] == roms[1][0x026099:0x027000]
+    assert roms[0][0x049100:0x04A000] == roms[1][0x049100:0x04A000]
+    assert roms[0] != roms[1]
+
+
+def test_pickup_routines_without_starting_items():
+    pickups = create_example_pickups()
+    routines = ROM_Patcher.get_all_necessary_pickup_routines(pickups, ROM_Patcher.get_equipment_routines(), None, None)
+    assert routines == ROM_Patcher.get_all_necessary_pickup_routines(
+        pickups, ROM_Patcher.get_equipment_routines(), [], None
+    )
+
+
+def test_patch_rom_without_item_list(tmp_path):
+    output_path = tmp_path.joinpath("vanilla.sfc")
+    ROM_Patcher.patch_rom(BytesIO(bytes(romSize)), output_path)
+    assert output_path.stat().st_size == romSize
+
+
+def test_item_plm_ids_follow_the_order_items_first_appear_in():
+    pickups = create_example_pickups()
+    for ordered_pickups in (pickups, pickups[::-1]):
+        kazuto_hack_writes, item_plm_ids = ROM_Patcher.plan_item_layout(ROM_Patcher.get_pickup_key(ordered_pickups))
+        item_names = list(
+            dict.fromkeys(pickup.item_name for pickup in ordered_pickups if pickup.item_name != "No Item")
+        )
+        plm_ids = [item_plm_ids[item_name] for item_name in item_names]
+        assert plm_ids == list(range(plm_ids[0], plm_ids[0] + 4 * len(item_names), 4))
+
+
+def test_rom_checksum():
+    rom_file = BytesIO(bytes(romSize))
+    rom_file.seek(0x200000)
+    rom_file.write(b"\x01" * 0x10)
+    # The last megabyte is counted twice to make up four megabytes.
+    checksum = ROM_Patcher.write_rom_checksum(rom_file)
+    rom_data = rom_file.getvalue()
+    assert checksum == (0xFF * 2 + 0x10 * 2) & 0xFFFF
+    assert rom_data[0x7FDC:0x7FE0] == (checksum ^ 0xFFFF).to_bytes(2, "little") + checksum.to_bytes(2, "little")
+    # Writing the checksum doesn't change it.
+    assert ROM_Patcher.calculate_rom_checksum(rom_data) == checksum
+
+
+@pytest.mark.parametrize("player_name", [None, "Samus"])
+def test_symbol_map_is_built_from_placements(player_name):
+    pickups = create_example_pickups(1234)
+    if player_name is not None:
+        # Every third item belongs to another player, so it has no effect in this ROM.
+        for i, pickup in enumerate(pickups):
+            pickup.owner_name = "Ridley" if i % 3 == 0 else player_name
+    routines = ROM_Patcher.get_all_necessary_pickup_routines(
+        pickups, ROM_Patcher.get_equipment_routines(), [], player_name
+    )
+    item_get_routine_addresses_dict = {routine_name: 0x9000 + i for i, routine_name in enumerate(routines)}
+    rom_file = BytesIO(bytes(romSize))
+    rom_file.seek(0x7FC0)
+    rom_file.write(b"Super Metroid        ")
+    item_plm_ids = ROM_Patcher.place_items(rom_file, item_get_routine_addresses_dict, pickups, player_name)
+    ROM_Patcher.write_rom_checksum(rom_file)
+    rom_data = rom_file.getvalue()
+    symbol_map = ROM_Patcher.build_symbol_map(rom_data, item_get_routine_addresses_dict, item_plm_ids, pickups)
+    assert symbol_map.rom_identity == ("Super Metroid", int.from_bytes(rom_data[0x7FDE:0x7FE0], "little"))
+    assert symbol_map.get_item_routine_address("Wave Beam") == item_get_routine_addresses_dict["Get Wave Beam"]
+    assert symbol_map.item_plm_ids["Wave Beam"] == item_plm_ids["Wave Beam"]
+    assert symbol_map.message_table_addresses["Item Routine"] == 0x85A200
+    assert symbol_map.non_vanilla_items == []
+    for pickup in pickups:
+        assert symbol_map.locations[pickup.pickup_index]["item_name"] == pickup.item_name
+        # The item tables can be read from the symbol map, for devices which can't read ROM.
+        if pickup.item_name != "No Item":
+            for table_offset in (0x029C00, 0x02A200):
+                address = table_offset + pickup.pickup_index * 2
+                assert symbol_map.read_rom(address, 2) == rom_data[address : address + 2]
+            if pickup.owner_name not in (None, player_name):
+                assert symbol_map.get_item_table_entry("Item Routine", pickup.pickup_index) == (
+                    item_get_routine_addresses_dict["No Effect"]
+                )
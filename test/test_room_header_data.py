@@ -0,0 +1,155 @@
+import subprocess
+import sys
+import zlib
+
+from SuperDuperMetroid import SM_Room_Header_Data
+from SuperDuperMetroid.SM_Room_Header_Data import DoorData, SMRooms
+
+# Imports the patcher in a fresh interpreter and reports how long it took,
+# And whether the room tables were built as a side effect.
+IMPORT_BENCHMARK_SCRIPT = """
+import time
+start = time.perf_counter()
+import SuperDuperMetroid.ROM_Patcher
+elapsed = time.perf_counter() - start
+from SuperDuperMetroid.SM_Room_Header_Data import SMRooms
+print(elapsed)
+print("addr_to_door_data_dict" in vars(SMRooms))
+"""
+
+
+def test_import_does_not_load_room_tables():
+    result = subprocess.run([sys.executable, "-c", IMPORT_BENCHMARK_SCRIPT], capture_output=True, text=True, check=True)
+    elapsed, tables_loaded = result.stdout.split()
+    print(f"Importing ROM_Patcher took {float(elapsed) * 1000:.2f} ms")
+    assert tables_loaded == "False"
+
+
+def test_room_tables_load_on_first_access():
+    assert len(SMRooms.addr_to_door_data_dict) == 263
+    assert len(SMRooms.door_addr_to_room_dict) == 597
+    assert SMRooms.addr_to_room_name_dict[0x91F8] == "Landing Site"
+    assert SMRooms.room_name_to_addr_dict["Landing Site"] == 0x91F8
+    assert SMRooms.addr_to_region[0x91F8] == "Crateria"
+    assert SMRooms.addr_to_num_doors[0x91F8] == 4
+    for door_hex_list in SMRooms.addr_to_door_data_dict.values():
+        for door_hex in door_hex_list:
+            door_ptr = DoorData(door_hex).door_ptr
+            assert door_ptr in SMRooms.door_addr_to_room_dict
+    assert SMRooms.door_addr_to_room_dict[0x8916] == 0x91F8
+
+
+# Builds a ROM with two rooms, linked to each other by a door,
+# Plus an elevator door in the first room.
+def create_two_room_rom():
+    rom = bytearray(0x300000)
+    # Landing Site (Crateria), door list at $8F:9300
+    rom[0x0791F8 : 0x0791F8 + 11] = bytes([0x00, 0x00, 0x17, 0x00, 0x09, 0x05, 0x70, 0xA0, 0x00, 0x00, 0x93])
+    rom[0x079300:0x079304] = bytes([0x16, 0x89, 0x22, 0x89])
+    # Gauntlet Access (Brinstar, so the region comes from the header), door list at $8F:9310
+    rom[0x0792B3 : 0x0792B3 + 11] = bytes([0x01, 0x01, 0x18, 0x00, 0x05, 0x01, 0x70, 0xA0, 0x00, 0x10, 0x93])
+    rom[0x079310:0x079312] = bytes([0x46, 0x89])
+    # DDB entries in bank 83
+    rom[0x018916 : 0x018916 + 12] = bytes.fromhex("B39200054E06040000800000")
+    rom[0x018922 : 0x018922 + 12] = bytes.fromhex("000000000000000000800000")
+    rom[0x018946 : 0x018946 + 12] = bytes.fromhex("F891000401260002008097B9")
+    return rom
+
+
+def test_read_room_records_follows_doors():
+    room_records = SM_Room_Header_Data.read_room_records(create_two_room_rom(), [0x91F8])
+    room_index = SM_Room_Header_Data.RoomIndex(room_records)
+    assert room_index.addr_to_door_data_dict == {
+        0x91F8: ["1689B39200054E06040000800000", "2289000000000000000000800000"],
+        0x92B3: ["4689F891000401260002008097B9"],
+    }
+    assert room_index.addr_to_region == {0x91F8: "Crateria", 0x92B3: "Brinstar"}
+    assert room_index.addr_to_num_doors == {0x91F8: 2, 0x92B3: 1}
+    assert room_index.door_addr_to_room_dict == {0x8916: 0x91F8, 0x8922: 0x91F8, 0x8946: 0x92B3}
+    assert room_index.addr_to_room_name_dict[0x92B3] == "Gauntlet Access"
+
+
+def test_load_room_index_caches_by_crc(tmp_path, monkeypatch):
+    monkeypatch.setattr(SM_Room_Header_Data, "room_records_by_crc", {})
+    rom = create_two_room_rom()
+    first_index = SM_Room_Header_Data.load_room_index(bytes(rom), tmp_path)
+    cache_files = list(tmp_path.iterdir())
+    assert len(cache_files) == 1
+    assert f"{zlib.crc32(rom):08X}" in cache_files[0].name
+
+    second_index = SM_Room_Header_Data.load_room_index(bytes(rom), tmp_path)
+    assert second_index.addr_to_door_data_dict == first_index.addr_to_door_data_dict
+
+    # A changed ROM gets its own index.
+    rom[0x0792B4] = 0x02
+    changed_index = SM_Room_Header_Data.load_room_index(bytes(rom), tmp_path)
+    assert len(list(tmp_path.iterdir())) == 2
+    assert changed_index.addr_to_region[0x92B3] == "Norfair"
+
+
+def test_load_room_index_only_caches_in_memory_by_default(tmp_path, monkeypatch):
+    monkeypatch.setattr(SM_Room_Header_Data, "room_records_by_crc", {})
+    monkeypatch.setenv("HOME", str(tmp_path))
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+    rom = bytes(create_two_room_rom())
+    first_index = SM_Room_Header_Data.load_room_index(rom)
+    assert list(tmp_path.iterdir()) == []
+
+    def read_room_records(rom_bytes):
+        raise AssertionError("The room index should have come from memory")
+
+    monkeypatch.setattr(SM_Room_Header_Data, "read_room_records", read_room_records)
+    second_index = SM_Room_Header_Data.load_room_index(rom)
+    assert second_index.addr_to_door_data_dict == first_index.addr_to_door_data_dict
+
+
+# Builds a ROM with every vanilla room, with their door lists packed one after another like in the vanilla game.
+# extra_doors maps room addresses to doors added to the end of their lists.
+# last_room_addr's door list is placed last, and followed by trailing_words copies of its first door pointer.
+def create_vanilla_layout_rom(extra_doors=None, last_room_addr=None, trailing_words=0):
+    rom = bytearray(0x300000)
+    extra_doors = extra_doors or {}
+    door_list_ptr = 0xF000
+    room_addrs = [room_addr for room_addr in SMRooms.addr_to_door_data_dict if room_addr != last_room_addr]
+    if last_room_addr is not None:
+        room_addrs.append(last_room_addr)
+    for room_addr in room_addrs:
+        door_hex_list = SMRooms.addr_to_door_data_dict[room_addr] + extra_doors.get(room_addr, [])
+        header_offset = SM_Room_Header_Data.ROOM_HEADER_BANK_OFFSET + room_addr
+        rom[header_offset + 1] = SM_Room_Header_Data.AREA_INDEX_TO_REGION.index(SMRooms.addr_to_region[room_addr])
+        rom[header_offset + 9 : header_offset + 11] = door_list_ptr.to_bytes(2, "little")
+        door_ptrs = [DoorData(door_hex).door_ptr for door_hex in door_hex_list]
+        for door_ptr, door_hex in zip(door_ptrs, door_hex_list):
+            ddb_offset = SM_Room_Header_Data.DOOR_DATA_BANK_OFFSET + door_ptr
+            rom[ddb_offset : ddb_offset + 12] = bytes.fromhex(door_hex[4:])
+        if room_addr == last_room_addr:
+            door_ptrs += door_ptrs[:1] * trailing_words
+        for door_ptr in door_ptrs:
+            door_list_offset = SM_Room_Header_Data.ROOM_HEADER_BANK_OFFSET + door_list_ptr
+            rom[door_list_offset : door_list_offset + 2] = door_ptr.to_bytes(2, "little")
+            door_list_ptr += 2
+    return rom
+
+
+def test_packed_door_lists_end_where_the_next_one_starts():
+    room_index = SM_Room_Header_Data.RoomIndex(SM_Room_Header_Data.read_room_records(create_vanilla_layout_rom()))
+    assert room_index.addr_to_num_doors == SMRooms.addr_to_num_doors
+    assert room_index.addr_to_door_data_dict == SMRooms.addr_to_door_data_dict
+    assert room_index.door_count_changes == {}
+
+
+def test_rooms_with_added_doors_keep_them():
+    # A door from Landing Site back into itself, with its DDB entry in free space.
+    added_door_hex = "00E0F89100054E06040000800000"
+    rom = create_vanilla_layout_rom(extra_doors={0x91F8: [added_door_hex]})
+    room_index = SM_Room_Header_Data.RoomIndex(SM_Room_Header_Data.read_room_records(rom))
+    assert room_index.addr_to_door_data_dict[0x91F8] == SMRooms.addr_to_door_data_dict[0x91F8] + [added_door_hex]
+    assert room_index.door_addr_to_room_dict[0xE000] == 0x91F8
+    assert room_index.door_count_changes == {0x91F8: (5, 4)}
+
+
+def test_door_lists_without_an_end_fall_back_to_vanilla_counts():
+    rom = create_vanilla_layout_rom(last_room_addr=0x91F8, trailing_words=SM_Room_Header_Data.MAX_DOORS_PER_ROOM)
+    room_index = SM_Room_Header_Data.RoomIndex(SM_Room_Header_Data.read_room_records(rom))
+    assert room_index.addr_to_door_data_dict[0x91F8] == SMRooms.addr_to_door_data_dict[0x91F8]
+    assert room_index.door_count_changes == {}
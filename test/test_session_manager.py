@@ -0,0 +1,85 @@
+import asyncio
+
+import pytest
+from fake_sni import FakeSNIDevice
+from sni_stand_in import SNIStandInServer, make_item_ring_consumer, set_game_state
+
+from SuperDuperMetroid.SM_Interface import AsyncSuperMetroidInterface
+from SuperDuperMetroid.Session_Manager import SessionManager
+
+DEVICE_NAMES = ["Player 1 SNES", "Player 2 SNES", "Player 3 SNES"]
+
+
+# Runs test_function with a session manager and a stand-in server serving three devices.
+def run_with_manager(test_function):
+    async def run():
+        server = SNIStandInServer(devices={name: FakeSNIDevice() for name in DEVICE_NAMES})
+        await server.start()
+        manager = SessionManager(server.address, max_concurrent_connects=2)
+        try:
+            await test_function(manager, server)
+        finally:
+            await manager.close()
+            await server.close()
+
+    asyncio.run(run())
+
+
+def test_sessions_have_their_own_state():
+    async def test(manager, server):
+        assert await manager.list_devices() == DEVICE_NAMES
+        opened = await manager.open_all_sessions()
+        assert list(opened) == DEVICE_NAMES and len(manager) == 3
+        for i, name in enumerate(DEVICE_NAMES):
+            assert manager.get_session(name).deviceName == name
+            set_game_state(server.devices[name], [0x08, 0x0F, 0x01][i])
+        snapshots = await manager.snapshot_all()
+        assert [snapshots[name].game_state for name in DEVICE_NAMES] == ["In Game", "Paused", "Title Screen"]
+        # Opening a session again reuses it.
+        assert await manager.open_session(DEVICE_NAMES[0]) is opened[DEVICE_NAMES[0]]
+        assert (
+            manager.get_session(DEVICE_NAMES[0]).eventScheduler
+            is not manager.get_session(DEVICE_NAMES[1]).eventScheduler
+        )
+
+    run_with_manager(test)
+
+
+def test_items_go_to_one_device():
+    async def test(manager, server):
+        await manager.open_all_sessions()
+        server.frame_hooks.append(make_item_ring_consumer())
+        for device in server.devices.values():
+            set_game_state(device, 0x08)
+        session = manager.get_session(DEVICE_NAMES[1])
+        session.eventScheduler.retry_interval = 0.01
+        session.itemRoutineDict["Wave Beam"] = 0x9ABC
+        event = await session.receive_item("Wave Beam", "Galactic Federation HQ")
+        await asyncio.wait_for(event.future, 2)
+        # Writes have no reply, so wait for the server to have handled them.
+        for i in range(100):
+            if server.devices[DEVICE_NAMES[1]].memory[0xF6FF50] == 1:
+                break
+            await asyncio.sleep(0.01)
+        assert [device.memory[0xF6FF50] for device in server.devices.values()] == [0, 1, 0]
+        await manager.close_session(DEVICE_NAMES[1])
+        assert DEVICE_NAMES[1] not in manager and len(manager) == 2
+
+    run_with_manager(test)
+
+
+def test_connect_to_chosen_device():
+    async def test(manager, server):
+        interface = AsyncSuperMetroidInterface()
+        await interface.initialize_connection(server.address)
+        try:
+            assert await interface.connect_to_device(2) == DEVICE_NAMES[2]
+            with pytest.raises(ValueError):
+                await interface.connect_to_device("Player 4 SNES")
+            with pytest.raises(ValueError):
+                await interface.connect_to_device(3)
+            assert await interface.connect_to_device() == DEVICE_NAMES[0]
+        finally:
+            await interface.close_connection()
+
+    run_with_manager(test)
@@ -0,0 +1,33 @@
+import pytest
+
+from SuperDuperMetroid.SM_Constants import SuperMetroidConstants
+
+
+def test_location_lookups_agree():
+    assert len(SuperMetroidConstants.locationTable) == 100
+    for location in SuperMetroidConstants.locationTable:
+        assert SuperMetroidConstants.locationByPickupIndex[location.pickup_index] is location
+        assert SuperMetroidConstants.locationByName[location.name] is location
+        assert SuperMetroidConstants.locationByBitflagIndex[location.pickup_index] is location
+    assert len(SuperMetroidConstants.locationByBitflagIndex) == 256
+    assert SuperMetroidConstants.locationByBitflagIndex[0x14] is None
+
+
+def test_location_lookup_values():
+    location = SuperMetroidConstants.locationByName["Maridia Space Jump"]
+    assert location.pickup_index == 0x9A
+    assert location.plm_location == 0x7C7A7
+    assert location.plm_block_type == 1
+    assert location.vanilla_item == "Space Jump"
+
+
+def test_locations_are_read_only():
+    location = SuperMetroidConstants.locationTable[0]
+    with pytest.raises(AttributeError):
+        location.name = "Somewhere Else"
+
+
+def test_region_hex_matches_region_index():
+    assert SuperMetroidConstants.regionToHexDict["Crateria"] == "0000"
+    assert SuperMetroidConstants.regionToHexDict["Brinstar"] == "0100"
+    assert SuperMetroidConstants.regionToHexDict.keys() == SuperMetroidConstants.regionToIndexDict.keys()
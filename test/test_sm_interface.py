@@ -0,0 +1,587 @@
+import asyncio
+
+import pytest
+from fake_sni import FakeSNISocket
+
+from SuperDuperMetroid import SM_Interface
+from SuperDuperMetroid.SM_Constants import SuperMetroidConstants
+from SuperDuperMetroid.SM_Interface import (
+    AsyncSuperMetroidInterface,
+    SuperMetroidInterface,
+    GameState,
+    RomCache,
+    build_multiworld_item_entry,
+    get_game_state_name,
+    get_location_journal_ranges,
+    get_newly_set_bits,
+)
+from SuperDuperMetroid.SNI_Client import SNIClient, merge_read_ranges
+from SuperDuperMetroid.Symbol_Map import SymbolMap
+
+
+# Runs test_function with an interface connected to a FakeSNISocket.
+def run_with_interface(test_function):
+    async def run():
+        interface = AsyncSuperMetroidInterface(SNIClient(FakeSNISocket()))
+        await test_function(interface, interface.client.web_socket)
+
+    asyncio.run(run())
+
+
+def test_device_info_is_cached():
+    async def test(interface, socket):
+        for i in range(5):
+            await interface.get_data(0xF50998, 1)
+            await interface.set_data(0xF6FF74, "0100")
+        assert socket.opcodes.count("Info") == 1
+        assert socket.opcodes.count("GetAddress") == 5
+        assert socket.opcodes.count("PutAddress") == 5
+
+    run_with_interface(test)
+
+
+def test_device_info_expires():
+    async def test(interface, socket):
+        interface.client.device_info_ttl = 0
+        await interface.get_data(0xF50998, 1)
+        await interface.get_data(0xF50998, 1)
+        assert socket.opcodes.count("Info") == 2
+
+    run_with_interface(test)
+
+
+def test_socket_error_invalidates_device_info():
+    async def test(interface, socket):
+        await interface.get_data(0xF50998, 1)
+        socket.fail = True
+        with pytest.raises(ConnectionError):
+            await interface.get_data(0xF50998, 1)
+        assert interface.deviceInfo is None
+        socket.fail = False
+        await interface.get_data(0xF50998, 1)
+        assert socket.opcodes.count("Info") == 2
+
+    run_with_interface(test)
+
+
+def test_read_many_uses_one_request():
+    async def test(interface, socket):
+        socket.memory[0xF50998] = 0x08
+        socket.memory[0xF6FFD0:0xF6FFD2] = bytes([0x01, 0x80])
+        data = await interface.read_many([(0xF50998, 1), (0xF6FFD0, 2), (0xF509C2, 4)])
+        assert data == [bytes([0x08]), bytes([0x01, 0x80]), bytes(4)]
+        assert socket.opcodes.count("GetAddress") == 1
+        assert await interface.get_data(0xF6FFD0, 2) == bytes([0x01, 0x80])
+
+    run_with_interface(test)
+
+
+def test_snapshot():
+    async def test(interface, socket):
+        memory = socket.memory
+        memory[0xF50998] = 0x08
+        memory[0xF50A42:0xF50A44] = bytes([0xF0, 0xFF])
+        # Missiles: 15 out of 20.
+        memory[0xF509C6:0xF509CA] = bytes([0x0F, 0x00, 0x14, 0x00])
+        # Morph Ball obtained, not equipped.
+        memory[0xF509A4] = 0x04
+        # Pickup index 9 checked.
+        memory[0xF6FFD1] = 0x02
+        snapshot = await interface.snapshot()
+        assert socket.opcodes == ["Info", "GetAddress"]
+        assert snapshot.game_state == "In Game"
+        assert snapshot.event_slot == 0xFFF0
+        assert snapshot.ammo_counts["Missile Expansion"] == (0x0F, 0x14)
+        assert snapshot.obtained_toggle_items == ["Morph Ball"]
+        assert snapshot.equipped_toggle_items == []
+        assert snapshot.is_location_checked(9)
+        assert not snapshot.is_location_checked(8)
+
+    run_with_interface(test)
+
+
+def test_items_are_delivered_through_the_ring_buffer():
+    async def test(interface, socket):
+        interface.eventScheduler.retry_interval = 0.01
+        memory = socket.memory
+        for i, item_name in enumerate(SuperMetroidConstants.toggleItemList):
+            interface.itemRoutineDict[item_name] = 0x9A00 + i
+        memory[0xF50A42:0xF50A44] = bytes([0x34, 0x12])
+        # Paused, so the items queue up.
+        memory[0xF50998] = 0x0F
+        item_names = SuperMetroidConstants.toggleItemList[:10]
+        events = [await interface.receive_item(item_name, "Galactic Federation HQ") for item_name in item_names]
+        # Each item can be cancelled or awaited on its own, but they are delivered together.
+        assert len(set(events)) == len(events) and len(interface.eventScheduler) == 1
+        memory[0xF50998] = 0x08
+        await asyncio.wait_for(asyncio.gather(*[event.future for event in events[:8]]), 2)
+        # The first eight fill the ring buffer with one write, then the routine is started.
+        assert socket.opcodes.count("PutAddress") == 3
+        assert memory[0xF6FF00:0xF6FF0A] == build_multiworld_item_entry(item_names[0], 0x9A00)
+        assert memory[0xF6FF46:0xF6FF50] == build_multiworld_item_entry(item_names[7], 0x9A07)
+        assert memory[0xF6FF50:0xF6FF54] == bytes([8, 0, 0, 0])
+        assert memory[0xF6FF72:0xF6FF82] == bytes.fromhex("FFAD" + "0000" * 6 + "3412")
+        assert memory[0xF50A42:0xF50A44] == bytes([0xF0, 0xFF])
+        # The game shows three items, so the last two go in behind the five left.
+        memory[0xF6FF52] = 3
+        await asyncio.sleep(0.1)
+        assert memory[0xF6FF00:0xF6FF0A] == build_multiworld_item_entry(item_names[8], 0x9A08)
+        assert memory[0xF6FF50:0xF6FF54] == bytes([10, 0, 3, 0])
+        assert socket.opcodes.count("PutAddress") == 4
+        # Once the game has shown everything, delivery is finished.
+        memory[0xF6FF52] = 10
+        memory[0xF50A42:0xF50A44] = bytes([0x34, 0x12])
+        await asyncio.sleep(0.1)
+        assert len(interface.eventScheduler) == 0
+        assert socket.opcodes.count("PutAddress") == 4
+        await interface.close_connection()
+
+    run_with_interface(test)
+
+
+def test_queued_item_is_delivered_once_player_is_ready():
+    async def test(interface, socket):
+        interface.itemRoutineDict["Wave Beam"] = 0x9ABC
+        memory = socket.memory
+        # Paused, so the item has to wait.
+        memory[0xF50998] = 0x0F
+        event = await interface.receive_item("Wave Beam", "Galactic Federation HQ")
+        await asyncio.sleep(0.1)
+        assert memory[0xF50A42:0xF50A44] == bytes(2)
+        memory[0xF50998] = 0x08
+        await asyncio.wait_for(event.future, 2)
+        assert memory[0xF50A42:0xF50A44] == bytes([0xF0, 0xFF])
+
+    run_with_interface(test)
+
+
+def test_synchronous_interface():
+    interface = SuperMetroidInterface(SNIClient(FakeSNISocket()))
+    try:
+        interface.client.web_socket.memory[0xF50998] = 0x08
+        assert interface.get_game_state() == "In Game"
+        assert interface.read(0xF50998, 1) == bytes([0x08])
+        assert interface.client.web_socket.opcodes == ["Info", "GetAddress", "GetAddress"]
+    finally:
+        interface.close_connection()
+
+
+def test_requests_are_pipelined():
+    async def test(interface, socket):
+        await interface.client.info()
+        for i in range(8):
+            socket.memory[0xF6FFD0 + i] = i
+        socket.hold_replies.set()
+        reads = [
+            asyncio.ensure_future(interface.client.request("GetAddress", [f"{0xF6FFD0 + i:X}", "1"], 1))
+            for i in range(8)
+        ]
+        await asyncio.sleep(0.05)
+        # Every request has been sent before any reply came back.
+        assert socket.opcodes.count("GetAddress") == 8
+        assert len(interface.client.pending_requests) == 8
+        socket.hold_replies.clear()
+        assert await asyncio.gather(*reads) == [bytes([i]) for i in range(8)]
+        assert len(interface.client.pending_requests) == 0
+
+    run_with_interface(test)
+
+
+def test_poller_and_item_delivery_share_the_connection():
+    async def test(interface, socket):
+        interface.itemRoutineDict["Wave Beam"] = 0x9ABC
+        socket.memory[0xF50998] = 0x08
+        socket.memory[0xF6FFD0] = 0x01
+        await interface.start_polling_game_for_checks()
+        event = await interface.receive_item("Wave Beam", "Galactic Federation HQ")
+        snapshots = await asyncio.gather(*[interface.snapshot() for i in range(5)])
+        await asyncio.wait_for(event.future, 2)
+        assert all(snapshot.game_state == "In Game" for snapshot in snapshots)
+        assert socket.memory[0xF50A42:0xF50A44] == bytes([0xF0, 0xFF])
+        await interface.close_connection()
+
+    run_with_interface(test)
+
+
+def test_merge_read_ranges():
+    assert merge_read_ranges([(0x10, 2), (0x00, 4), (0x02, 1), (0x100, 1)], 12) == [(0x00, 0x12), (0x100, 1)]
+    assert merge_read_ranges([(0x00, 4), (0x04, 2)], 0) == [(0x00, 6)]
+    assert merge_read_ranges([(0x00, 4), (0x05, 2)], 0) == [(0x00, 4), (0x05, 2)]
+
+
+def test_concurrent_reads_are_coalesced():
+    async def test(interface, socket):
+        for i in range(0x40):
+            socket.memory[0xF509A0 + i] = i
+        data = await asyncio.gather(
+            interface.get_data(0xF509A2, 2),
+            interface.get_data(0xF509A4, 2),
+            interface.get_data(0xF509C2, 2),
+            interface.read(0xF509C6, 2),
+            interface.read(0xF509A3, 1),
+        )
+        assert data == [bytes([2, 3]), bytes([4, 5]), bytes([0x22, 0x23]), bytes([0x26, 0x27]), bytes([0x03])]
+        assert socket.opcodes == ["Info", "GetAddress"]
+        assert socket.requests[-1]["Operands"] == ["F509A2", "26"]
+
+    run_with_interface(test)
+
+
+def test_reads_are_sent_before_later_writes():
+    async def test(interface, socket):
+        interface.client.read_coalesce_window = 10.0
+        socket.memory[0xF509A2] = 0x01
+        read = asyncio.ensure_future(interface.read(0xF509A2, 1))
+        await asyncio.sleep(0)
+        await asyncio.wait_for(interface.write(0xF509A2, bytes([0x02])), 1.0)
+        assert await asyncio.wait_for(read, 1.0) == bytes([0x01])
+        assert socket.opcodes == ["Info", "GetAddress", "PutAddress"]
+
+    run_with_interface(test)
+
+
+def test_queries_use_the_ram_mirror():
+    async def test(interface, socket):
+        socket.memory[0xF50998] = 0x08
+        await interface.start_ram_mirror(interval=10)
+        requests_sent = len(socket.opcodes)
+        for i in range(10):
+            assert await interface.get_game_state() == "In Game"
+            assert await interface.is_player_ready_for_event()
+            await interface.get_player_inventory()
+            await interface.snapshot()
+        assert len(socket.opcodes) == requests_sent
+        await interface.set_data(0xF50A42, "F0FF")
+        assert not await interface.is_player_ready_for_event()
+        await interface.close_connection()
+
+    run_with_interface(test)
+
+
+def test_item_delivery_checks_game_state_on_the_device():
+    async def test(interface, socket):
+        interface.eventScheduler.retry_interval = 0.01
+        interface.itemRoutineDict["Wave Beam"] = 0x9A00
+        memory = socket.memory
+        memory[0xF50998] = 0x08
+        await interface.start_ram_mirror(interval=10)
+        # The game is paused, but the RAM mirror hasn't seen it yet.
+        memory[0xF50998] = 0x0F
+        event = await interface.receive_item("Wave Beam", "Galactic Federation HQ")
+        await asyncio.sleep(0.2)
+        assert not event.future.done()
+        assert memory[0xF50A42:0xF50A44] == bytes([0, 0])
+        memory[0xF50998] = 0x08
+        await asyncio.wait_for(event.future, 2)
+        assert memory[0xF50A42:0xF50A44] == bytes([0xF0, 0xFF])
+        await interface.close_connection()
+
+    run_with_interface(test)
+
+
+def test_get_newly_set_bits():
+    assert get_newly_set_bits(0, 0) == []
+    assert get_newly_set_bits(0b1010, 0b1011) == [0]
+    assert get_newly_set_bits(0b0001, 0b0000) == []
+    assert get_newly_set_bits(0, (1 << 255) | (1 << 9) | 1) == [0, 9, 255]
+
+
+# Does what our pickup routine does when the player checks a location.
+def check_location(memory, pickup_index):
+    # Pickup index 9 is the second bit of the second byte.
+    memory[0xF6FFD0 + pickup_index // 8] |= 1 << (pickup_index % 8)
+    count = int.from_bytes(memory[0xF6FF54:0xF6FF56], "little")
+    memory[0xF6FF56 + count % 16] = pickup_index
+    memory[0xF6FF54:0xF6FF56] = ((count + 1) & 0xFFFF).to_bytes(2, "little")
+
+
+def test_get_location_journal_ranges():
+    assert get_location_journal_ranges(0, 3) == [(0xF6FF56, 3)]
+    assert get_location_journal_ranges(14, 18) == [(0xF6FF64, 2), (0xF6FF56, 2)]
+    assert get_location_journal_ranges(0xFFFF, 1) == [(0xF6FF65, 1), (0xF6FF56, 1)]
+
+
+def test_location_checks_are_read_from_the_journal_in_order(monkeypatch, capsys):
+    monkeypatch.setattr(SM_Interface, "LOCATION_POLL_MIN_INTERVAL", 0.01)
+    monkeypatch.setattr(SM_Interface, "LOCATION_POLL_MAX_INTERVAL", 0.01)
+
+    async def test(interface, socket):
+        # Start just before the journal wraps around.
+        socket.memory[0xF6FF54] = 14
+        await interface.start_polling_game_for_checks()
+        capsys.readouterr()
+        for pickup_index in (0x21, 0x03, 0x09):
+            check_location(socket.memory, pickup_index)
+        requests_sent = len(socket.opcodes)
+        await asyncio.sleep(0.05)
+        lines = [line for line in capsys.readouterr().out.splitlines() if line.startswith("Samus Checked Location")]
+        assert lines == [
+            f"Samus Checked Location {SuperMetroidConstants.locationByBitflagIndex[pickup_index].name}"
+            for pickup_index in (0x21, 0x03, 0x09)
+        ]
+        assert interface.lastLocationsCheckedBitflags == (1 << 0x21) | (1 << 0x03) | (1 << 0x09)
+        # The bitflags are only read when the journal has wrapped around since the last poll.
+        assert all("F6FFD0" not in request.get("Operands", []) for request in socket.requests[requests_sent:])
+        for pickup_index in range(0x40, 0x60):
+            check_location(socket.memory, pickup_index)
+        await asyncio.sleep(0.05)
+        assert interface.lastLocationsCheckedBitflags >> 0x40 == 0xFFFFFFFF
+        await interface.close_connection()
+
+    run_with_interface(test)
+
+
+def test_location_poll_interval_adapts(monkeypatch):
+    monkeypatch.setattr(SM_Interface, "LOCATION_POLL_MIN_INTERVAL", 0.01)
+    monkeypatch.setattr(SM_Interface, "LOCATION_POLL_MAX_INTERVAL", 0.04)
+
+    async def test(interface, socket):
+        await interface.start_polling_game_for_checks()
+        await asyncio.sleep(0.2)
+        # Nothing happened, so the poller has backed off as far as it will go.
+        assert interface.locationPollInterval == 0.04
+        check_location(socket.memory, 9)
+        await asyncio.sleep(0.2)
+        assert interface.lastLocationsCheckedBitflags == 1 << 9
+        # A room change brings the interval straight back down.
+        assert interface.locationPollInterval == 0.04
+        socket.memory[0xF5079B] = 0x01
+        for i in range(100):
+            if interface.locationPollInterval == 0.01:
+                break
+            await asyncio.sleep(0.002)
+        assert interface.locationPollInterval == 0.01
+        await interface.close_connection()
+
+    run_with_interface(test)
+
+
+def test_silent_ammo_grants_are_coalesced():
+    async def test(interface, socket):
+        memory = socket.memory
+        # Paused, so the grants queue up.
+        memory[0xF50998] = 0x0F
+        events = [
+            await interface.receive_item("Missile Expansion", "Galactic Federation HQ", show_message=False)
+            for i in range(8)
+        ]
+        assert all(event is events[0] for event in events)
+        memory[0xF50998] = 0x08
+        await asyncio.wait_for(events[0].future, 2)
+        # Current and maximum missiles, 8 expansions of 5 each.
+        assert memory[0xF509C6:0xF509CA] == bytes([40, 0, 40, 0])
+        assert socket.opcodes.count("PutAddress") == 1
+        await interface.close_connection()
+
+    run_with_interface(test)
+
+
+def test_check_value_overflow():
+    assert AsyncSuperMetroidInterface.check_value_overflow(10, 5) == 5
+    assert AsyncSuperMetroidInterface.check_value_overflow(0xFFFE, 5) == 1
+    assert AsyncSuperMetroidInterface.check_value_overflow(3, -5) == -3
+    assert AsyncSuperMetroidInterface.check_value_overflow(0xF0, 0x20, num_bytes=1) == 0x0F
+
+
+def test_items_are_changed_with_typed_writes():
+    async def test(interface, socket):
+        memory = socket.memory
+        memory[0xF50998] = 0x08
+        memory[0xF509C6:0xF509CA] = bytes([0xFE, 0xFF, 0x10, 0x00])
+        await interface.increment_item("Missile Expansion", 5)
+        # Current missiles can't overflow, maximum missiles go up by five.
+        assert memory[0xF509C6:0xF509CA] == bytes([0xFF, 0xFF, 0x15, 0x00])
+        await interface.increment_item("Missile Expansion", 5, max_amount_only=True)
+        assert await interface.read_u16le(0xF509C8) == 0x1A
+        # Varia Suit is bit 0 of the equipped and obtained bytes, which are only written a byte at a time.
+        memory[0xF509A2:0xF509A6] = bytes([0x20, 0xAA, 0x20, 0xBB])
+        await interface.give_toggle_item("Varia Suit")
+        assert memory[0xF509A2:0xF509A6] == bytes([0x21, 0xAA, 0x21, 0xBB])
+        await interface.take_away_toggle_item("Varia Suit")
+        assert memory[0xF509A2:0xF509A6] == bytes([0x20, 0xAA, 0x20, 0xBB])
+        assert [request["Operands"][1] for request in socket.requests if request["Opcode"] == "PutAddress"] == [
+            "4",
+            "4",
+            "1",
+            "1",
+            "1",
+            "1",
+        ]
+        await interface.write_u8(0xF6FFD0, 0x7F)
+        assert await interface.read_u8(0xF6FFD0) == 0x7F
+
+    run_with_interface(test)
+
+
+def test_game_state_table():
+    assert get_game_state_name(0x08) == "In Game"
+    assert get_game_state_name(0x0B) == "On Elevator"
+    assert get_game_state_name(0x1A) == "Dead"
+    assert get_game_state_name(0x1B) == "Status Not Known"
+    assert get_game_state_name(0xFF) == "Status Not Known"
+
+
+def test_player_state_is_read_once_per_tick():
+    async def test(interface, socket):
+        socket.memory[0xF50998] = 0x08
+        assert await interface.is_player_ready_for_event()
+        assert await interface.verify_in_gameplay()
+        assert await interface.verify_game_loaded()
+        assert await interface.get_game_state() == "In Game"
+        assert interface.playerState.game_state == GameState.IN_GAME
+        # Game state and event slot in one request, and device info once.
+        assert socket.opcodes == ["Info", "GetAddress"]
+        # Writing the event slot ourselves makes the state stale.
+        await interface.set_data(0xF50A42, "F0FF")
+        assert not await interface.is_player_ready_for_event()
+        assert socket.opcodes.count("GetAddress") == 2
+
+    run_with_interface(test)
+
+
+def test_rom_cache_merges_ranges():
+    cache = RomCache()
+    cache.store(0x10, bytes(range(0x10, 0x20)))
+    cache.store(0x30, bytes(range(0x30, 0x40)))
+    assert cache.read(0x18, 4) == bytes(range(0x18, 0x1C))
+    assert cache.read(0x1C, 0x10) is None
+    assert cache.read(0x00, 4) is None
+    cache.store(0x20, bytes(range(0x20, 0x30)))
+    assert len(cache.blocks) == 1
+    assert cache.read(0x10, 0x30) == bytes(range(0x10, 0x40))
+
+
+def write_rom_header(memory, title, checksum):
+    memory[0x7FC0:0x7FD5] = title.ljust(21).encode("ascii")
+    memory[0x7FDE:0x7FE0] = checksum.to_bytes(2, "little")
+
+
+def test_rom_reads_are_cached_until_the_rom_changes():
+    async def test(interface, socket):
+        memory = socket.memory
+        write_rom_header(memory, "Super Metroid", 0x1234)
+        memory[0x1AE00:0x1AE10] = bytes(range(0x10))
+        assert await interface.get_data(0x1AE00, 0x10) == bytes(range(0x10))
+        assert await interface.get_data(0x1AE04, 4) == bytes(range(4, 8))
+        assert interface.romCache.identity == ("Super Metroid", 0x1234)
+        # The header, then the range itself. The second read costs nothing.
+        assert socket.opcodes.count("GetAddress") == 2
+        # A new ROM is only noticed once device info is refreshed.
+        write_rom_header(memory, "Super Metroid", 0x4321)
+        memory[0x1AE00:0x1AE10] = bytes(0x10)
+        await interface.verify_connected_to_device(force_refresh=True)
+        assert await interface.get_data(0x1AE04, 4) == bytes(4)
+        assert interface.romCache.identity == ("Super Metroid", 0x4321)
+        assert socket.opcodes.count("GetAddress") == 4
+        # Reattaching clears the cache.
+        await interface.connect_to_device()
+        assert interface.romCache.identity is None
+
+    run_with_interface(test)
+
+
+def test_rom_file_is_used_when_rom_cannot_be_read(tmp_path):
+    async def test(interface, socket):
+        socket.device_info = ["1.0", "snes classic", "No Info", "NO_ROM_READ", "NO_ROM_WRITE"]
+        with pytest.raises(PermissionError):
+            await interface.read_rom(0x1AE00, 4)
+        rom_data = bytearray(0x8000 * 4)
+        write_rom_header(rom_data, "Super Metroid", 0x1234)
+        rom_data[0x1AE00:0x1AE04] = bytes([1, 2, 3, 4])
+        rom_path = tmp_path / "patched.sfc"
+        rom_path.write_bytes(rom_data)
+        interface.load_rom_file(rom_path)
+        assert await interface.get_data(0x1AE00, 4) == bytes([1, 2, 3, 4])
+        assert socket.opcodes.count("GetAddress") == 0
+
+    run_with_interface(test)
+
+
+def test_symbol_map_is_used_when_rom_cannot_be_read(tmp_path):
+    async def test(interface, socket):
+        socket.device_info = ["1.0", "snes classic", "No Info", "NO_ROM_READ", "NO_ROM_WRITE"]
+        symbol_map_path = tmp_path / "patched.symbols.json"
+        SymbolMap(
+            "Super Metroid",
+            0x1234,
+            {"Get Wave Beam": 0x9ABC},
+            {},
+            {"Item Routine": 0x85A200},
+            {},
+            {19: {"item_name": "Wave Beam", "owner_name": None, "quantity_given": 1}},
+            item_table_entries={"Item Routine": {19: 0x9ABC}},
+        ).save(symbol_map_path)
+        interface.load_symbol_map(symbol_map_path)
+        assert await interface.get_data(0x02A200 + 19 * 2, 2) == bytes([0xBC, 0x9A])
+        # Anything else in ROM still needs the ROM file.
+        with pytest.raises(PermissionError):
+            await interface.read_rom(0x1AE00, 4)
+        assert socket.opcodes.count("GetAddress") == 0
+
+    run_with_interface(test)
+
+
+def test_symbol_map_fills_item_routines(tmp_path):
+    symbol_map_path = tmp_path / "patched.symbols.json"
+    SymbolMap(
+        "Super Metroid",
+        0x1234,
+        {"Get Wave Beam": 0x9ABC, "Get Missile Expansion 5": 0x9AC0, "No Effect": 0x9AD0},
+        {},
+        {},
+        {},
+        {},
+    ).save(symbol_map_path)
+
+    async def test(interface, socket):
+        await interface.connect_to_device(symbol_map_path=symbol_map_path)
+        # Everything comes from the file.
+        assert socket.opcodes == ["DeviceList", "Attach", "Info"]
+        assert interface.itemRoutineDict["Wave Beam"] == 0x9ABC
+        assert interface.itemRoutineDict["Missile Expansion"] == 0x9AC0
+        assert interface.itemRoutineDict["No Item"] == 0x9AD0
+        assert interface.itemRoutineDict["Ice Beam"] is None
+
+    run_with_interface(test)
+
+
+def test_timed_out_and_cancelled_items_are_not_delivered():
+    async def test(interface, socket):
+        interface.eventScheduler.retry_interval = 0.01
+        memory = socket.memory
+        interface.itemRoutineDict["Wave Beam"] = 0x9A00
+        interface.itemRoutineDict["Ice Beam"] = 0x9A01
+        interface.itemRoutineDict["Spazer Beam"] = 0x9A02
+        # Paused, so the items queue up.
+        memory[0xF50998] = 0x0F
+        expired_event = await interface.receive_item("Wave Beam", "Galactic Federation HQ", timeout=0.05)
+        cancelled_event = await interface.receive_item("Ice Beam", "Galactic Federation HQ")
+        cancelled_event.cancel()
+        await asyncio.sleep(0.3)
+        with pytest.raises(TimeoutError):
+            expired_event.future.result()
+        assert cancelled_event.future.cancelled()
+        assert not interface.queuedItemDeliveries and len(interface.eventScheduler) == 0
+        # Items received later don't bring the dropped ones back.
+        memory[0xF50998] = 0x08
+        kept_event = await interface.receive_item("Spazer Beam", "Galactic Federation HQ")
+        await asyncio.wait_for(kept_event.future, 2)
+        assert memory[0xF6FF00:0xF6FF0A] == build_multiworld_item_entry("Spazer Beam", 0x9A02)
+        assert memory[0xF6FF50:0xF6FF54] == bytes([1, 0, 0, 0])
+
+    run_with_interface(test)
+
+
+def test_player_state_reads_the_frame_counter():
+    async def test(interface, socket):
+        socket.memory[0xF50998] = 0x08
+        socket.memory[0xF505B6:0xF505B8] = bytes([0x34, 0x12])
+        player_state = await interface.get_player_state()
+        assert player_state.frame_counter == 0x1234
+        assert interface.frameClock.is_synced() and interface.frameClock.frame_counter == 0x1234
+        # The trigger write is never held back by more than a frame.
+        assert 0.0 <= interface.frameClock.get_write_delay(interface.client.limiter.smoothed_rtt) < 1 / 60
+        await interface.connect_to_device()
+        assert not interface.frameClock.is_synced()
+
+    run_with_interface(test)
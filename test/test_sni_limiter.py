@@ -0,0 +1,85 @@
+import asyncio
+
+from fake_sni import FakeSNISocket
+
+from SuperDuperMetroid.SNI_Client import SNIClient
+from SuperDuperMetroid.SNI_Limiter import (
+    DEFAULT_DEVICE_LIMITS,
+    DEVICE_LIMITS,
+    AdaptiveLimiter,
+    DeviceLimits,
+    get_device_limits,
+)
+
+
+def test_get_device_limits():
+    assert get_device_limits(["1.0", "sd2snes", "Super Metroid"]) is DEVICE_LIMITS["sd2snes"]
+    assert get_device_limits(["1.0", "FXPak Pro", "Super Metroid"]) is DEVICE_LIMITS["fxpak"]
+    assert get_device_limits(["1.0", "emunw", "Super Metroid"]) is DEVICE_LIMITS["emunw"]
+    assert get_device_limits(["1.0", "something new", "Super Metroid"]) is DEFAULT_DEVICE_LIMITS
+    assert get_device_limits(None) is DEFAULT_DEVICE_LIMITS
+
+
+def test_requests_wait_for_room_in_flight():
+    async def test():
+        limiter = AdaptiveLimiter(DeviceLimits(2, 100))
+        await limiter.acquire()
+        await limiter.acquire()
+        assert limiter.is_saturated()
+        waiting = asyncio.ensure_future(limiter.acquire())
+        await asyncio.sleep(0.02)
+        assert not waiting.done()
+        limiter.release(0.001)
+        await asyncio.wait_for(waiting, 1)
+        assert limiter.in_flight == 2
+
+    asyncio.run(test())
+
+
+def test_requests_per_second_are_capped():
+    async def test():
+        limiter = AdaptiveLimiter(DeviceLimits(10, 5))
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        for i in range(6):
+            await limiter.acquire()
+            limiter.release(0.001)
+        # The sixth request had to wait for the first to be a second old.
+        assert loop.time() - start >= 0.9
+
+    asyncio.run(test())
+
+
+def test_failures_and_slow_replies_shrink_the_limit():
+    limiter = AdaptiveLimiter(DeviceLimits(8, 100))
+    limiter.in_flight = 3
+    limiter.release(0.01)
+    assert limiter.in_flight_limit == 8.0
+    limiter.release(failed=True)
+    assert limiter.in_flight_limit == 4.0
+    assert limiter.get_retry_delay(0.1) == 0.2
+    # Requests queueing up in front of the device take far longer than the fastest round trip.
+    limiter.release(0.1)
+    assert limiter.in_flight_limit == 3.0
+    assert limiter.consecutive_failures == 0
+    assert limiter.get_retry_delay(0.0) >= 0.01 * 4
+
+
+def test_client_limits_by_device_type():
+    async def test():
+        socket = FakeSNISocket()
+        socket.device_info = ["1.0", "sd2snes", "Super Metroid", ""]
+        client = SNIClient(socket)
+        await client.info()
+        assert client.limiter.limits is DEVICE_LIMITS["sd2snes"]
+        socket.hold_replies.set()
+        reads = [asyncio.ensure_future(client.request("GetAddress", ["F50998", "1"], 1)) for i in range(4)]
+        await asyncio.sleep(0.05)
+        # Only two requests are sent to an SD2SNES before the first reply comes back.
+        assert socket.opcodes.count("GetAddress") == 2
+        socket.hold_replies.clear()
+        await asyncio.wait_for(asyncio.gather(*reads), 1)
+        assert socket.opcodes.count("GetAddress") == 4
+        assert client.limiter.in_flight == 0
+
+    asyncio.run(test())
@@ -0,0 +1,71 @@
+import asyncio
+import json
+
+from fake_sni import FakeSNISocket
+
+from SuperDuperMetroid import SM_Interface
+from SuperDuperMetroid.SM_Interface import AsyncSuperMetroidInterface
+from SuperDuperMetroid.SNI_Client import SNIClient
+from SuperDuperMetroid.SNI_Metrics import DEFAULT_CALLER, SNIMetrics, measure_as
+
+
+def test_latency_histogram():
+    metrics = SNIMetrics()
+    for latency in (0.0005, 0.001, 0.003, 0.003, 2.0):
+        metrics.record("GetAddress", latency, 4)
+    opcode_metrics = metrics.get_metrics()["opcodes"]["GetAddress"]
+    assert opcode_metrics["count"] == 5
+    assert opcode_metrics["bytes"] == 20
+    assert opcode_metrics["max_latency_ms"] == 2000.0
+    histogram = opcode_metrics["latency_histogram_ms"]
+    assert histogram["<=1"] == 2
+    assert histogram["<=5"] == 2
+    assert histogram[">1000"] == 1
+    assert sum(histogram.values()) == 5
+
+
+def test_requests_are_counted_per_caller():
+    metrics = SNIMetrics()
+    metrics.record("GetAddress", 0.01, 2)
+    with measure_as("Poller"):
+        metrics.record("GetAddress", 0.01, 4)
+        with measure_as("Delivery"):
+            metrics.record("PutAddress", 0.01, 10, failed=True)
+        metrics.record("GetAddress", 0.01, 4)
+    result = metrics.get_metrics()
+    assert result["callers"][DEFAULT_CALLER]["GetAddress"]["count"] == 1
+    assert result["callers"]["Poller"]["GetAddress"]["count"] == 2
+    assert result["callers"]["Delivery"]["PutAddress"]["failures"] == 1
+    assert result["opcodes"]["GetAddress"]["count"] == 3
+    assert result["opcodes"]["GetAddress"]["bytes"] == 10
+    # The result has to be writable as JSON.
+    json.dumps(result)
+
+
+def test_interface_metrics(monkeypatch, tmp_path):
+    monkeypatch.setattr(SM_Interface, "LOCATION_POLL_MIN_INTERVAL", 0.01)
+    dump_path = tmp_path / "metrics.json"
+
+    async def test():
+        socket = FakeSNISocket()
+        interface = AsyncSuperMetroidInterface(SNIClient(socket))
+        assert interface.get_metrics() is None
+        interface.enable_metrics(dump_path, dump_interval=0.05)
+        interface.eventScheduler.retry_interval = 0.01
+        interface.itemRoutineDict["Wave Beam"] = 0x9ABC
+        socket.memory[0xF50998] = 0x08
+        await interface.get_game_state()
+        event = await interface.receive_item("Wave Beam", "Galactic Federation HQ")
+        await asyncio.wait_for(event.future, 2)
+        await interface.start_polling_game_for_checks()
+        await asyncio.sleep(0.1)
+        await interface.close_connection()
+        return interface.get_metrics()
+
+    result = asyncio.run(test())
+    assert set(result["callers"]) == {DEFAULT_CALLER, "Delivery", "Poller"}
+    assert result["callers"]["Delivery"]["PutAddress"]["count"] == 3
+    assert result["callers"]["Poller"]["GetAddress"]["count"] >= 2
+    assert result["opcodes"]["Info"]["count"] == 1
+    dumped = json.loads(dump_path.read_text())
+    assert dumped["opcodes"]["GetAddress"]["count"] > 0
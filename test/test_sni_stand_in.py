@@ -0,0 +1,64 @@
+import asyncio
+
+from sni_stand_in import SNIStandInServer, make_item_ring_consumer, set_game_state
+
+from SuperDuperMetroid.SM_Interface import AsyncSuperMetroidInterface
+
+
+# Runs test_function with an interface connected to a stand-in server over a real websocket.
+def run_with_server(test_function, **kwargs):
+    async def run():
+        server = SNIStandInServer(**kwargs)
+        await server.start()
+        interface = AsyncSuperMetroidInterface()
+        try:
+            await interface.initialize_connection(server.address)
+            await interface.connect_to_device()
+            await test_function(interface, server)
+        finally:
+            await interface.close_connection()
+            await server.close()
+
+    asyncio.run(run())
+
+
+def test_reads_and_writes_over_websocket():
+    async def test(interface, server):
+        assert server.device.opcodes == ["DeviceList", "Attach", "Info"]
+        await interface.write(0xF6FF00, bytes(range(0x60)))
+        assert await interface.read(0xF6FF00, 0x60) == bytes(range(0x60))
+        set_game_state(server.device, 0x08)
+        assert await interface.get_game_state() == "In Game"
+
+    run_with_server(test)
+
+
+def test_latency_is_applied_in_order():
+    async def test(interface, server):
+        server.device.memory[0xF50000:0xF50004] = bytes([1, 2, 3, 4])
+        reads = [interface.client.request("GetAddress", [f"{0xF50000 + i:X}", "1"], 1) for i in range(4)]
+        start = asyncio.get_running_loop().time()
+        assert await asyncio.gather(*reads) == [bytes([i + 1]) for i in range(4)]
+        elapsed = asyncio.get_running_loop().time() - start
+        # Pipelined, so the four requests cost about one round trip, not four.
+        assert 0.05 <= elapsed < 0.15
+
+    run_with_server(test, latency=0.05)
+
+
+def test_items_are_shown_by_the_frame_hook():
+    async def test(interface, server):
+        interface.eventScheduler.retry_interval = 0.01
+        interface.itemRoutineDict["Wave Beam"] = 0x9ABC
+        server.frame_hooks.append(make_item_ring_consumer())
+        set_game_state(server.device, 0x08)
+        for i in range(10):
+            await interface.receive_item("Wave Beam", "Galactic Federation HQ")
+        for i in range(200):
+            if len(interface.eventScheduler) == 0 and not interface.queuedItemDeliveries:
+                break
+            await asyncio.sleep(0.01)
+        memory = server.device.memory
+        assert memory[0xF6FF50:0xF6FF54] == bytes([10, 0, 10, 0])
+
+    run_with_server(test)
@@ -0,0 +1,68 @@
+import pytest
+
+from SuperDuperMetroid.Symbol_Map import SYMBOL_MAP_VERSION, SymbolMap, get_rom_identity, get_symbol_map_path
+
+
+def create_symbol_map():
+    return SymbolMap(
+        "Super Metroid",
+        0x1234,
+        {"Get Wave Beam": 0x9ABC, "Get Missile Expansion 5": 0x9AC0, "No Effect": 0x9AD0},
+        {"Wave Beam": 0xEEDB, "No Item": 0xB62F},
+        {"Message Content": 0x859C00, "Item Routine": 0x85A200},
+        {"Wave Beam": 0x8ADE},
+        {
+            19: {"item_name": "Wave Beam", "owner_name": "Samus", "quantity_given": 1},
+            20: {"item_name": "Missile Expansion", "owner_name": "Samus", "quantity_given": 5},
+            21: {"item_name": "Missile Expansion", "owner_name": "Ridley", "quantity_given": 5},
+            22: {"item_name": "No Item", "owner_name": None, "quantity_given": 0},
+        },
+        item_table_entries={
+            "Message Content": {19: 0x8ADE},
+            "Item Routine": {19: 0x9ABC, 20: 0x9AC0, 21: 0x9AD0},
+        },
+    )
+
+
+def test_round_trip(tmp_path):
+    path = get_symbol_map_path(tmp_path / "patched.sfc")
+    assert path.name == "patched.symbols.json"
+    create_symbol_map().save(path)
+    symbol_map = SymbolMap.load(path)
+    assert symbol_map.to_dict() == create_symbol_map().to_dict()
+    assert symbol_map.locations[19]["item_name"] == "Wave Beam"
+    assert symbol_map.rom_identity == ("Super Metroid", 0x1234)
+
+
+def test_item_routine_addresses():
+    symbol_map = create_symbol_map()
+    assert symbol_map.get_item_routine_address("Wave Beam") == 0x9ABC
+    assert symbol_map.get_item_routine_address("Missile Expansion") == 0x9AC0
+    assert symbol_map.get_item_routine_address("Missile Expansion", 6) is None
+    assert symbol_map.get_item_routine_address("No Item") == 0x9AD0
+    assert symbol_map.get_item_routine_address("Ice Beam") is None
+
+
+def test_item_tables_are_read_from_the_symbol_map():
+    symbol_map = create_symbol_map()
+    # Wave Beam and the Missile Expansion for us, then one with no effect since it is for another player.
+    assert symbol_map.read_rom(0x02A200 + 19 * 2, 6) == bytes([0xBC, 0x9A, 0xC0, 0x9A, 0xD0, 0x9A])
+    assert symbol_map.read_rom(0x02A200 + 19 * 2 + 1, 2) == bytes([0x9A, 0xC0])
+    assert symbol_map.read_rom(0x029C00 + 19 * 2, 2) == bytes([0xDE, 0x8A])
+    # Nothing is known about empty locations, locations not in the map, or anything outside the tables.
+    assert symbol_map.read_rom(0x02A200 + 22 * 2, 2) is None
+    assert symbol_map.read_rom(0x02A200 + 18 * 2, 4) is None
+    assert symbol_map.read_rom(0x029A00 + 19 * 2, 2) is None
+    assert symbol_map.read_rom(0x7FC0, 2) is None
+
+
+def test_unsupported_version():
+    data = create_symbol_map().to_dict()
+    data["version"] = SYMBOL_MAP_VERSION + 1
+    with pytest.raises(ValueError):
+        SymbolMap.from_dict(data)
+
+
+def test_get_rom_identity():
+    header_data = b"Super Metroid        " + bytes(9) + bytes([0x34, 0x12])
+    assert get_rom_identity(header_data) == ("Super Metroid", 0x1234)